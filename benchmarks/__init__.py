@@ -0,0 +1,14 @@
+import os
+import shutil
+import tempfile
+
+
+def daten_kopie():
+    """Stellt PRAXIS_DATEN auf eine Kopie von data/ um (vor dem ersten Import aus gui/ aufrufen)"""
+    projekt = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ordner = tempfile.mkdtemp(prefix="praxis-bench-")
+    shutil.copytree(os.path.join(projekt, "data"), ordner, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("*.journal", "*.lock", "*.tmp", "*.db*"))
+    os.environ["PRAXIS_DATEN"] = ordner
+    os.environ.setdefault("PRAXIS_SPEICHER", "json")
+    return ordner
@@ -0,0 +1,80 @@
+"""Micro-Benchmark: freie Startzeiten mit Bitsets gegen die frühere Schleife über HH:MM-Listen.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.freie_startzeiten [--tage 2000]
+
+Die Termine liegen im 30-Minuten-Raster, dort liefern beide Verfahren
+dieselben Slots (wird vor der Messung geprüft).
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from components.verfuegbarkeit import freie_startzeiten
+
+ZEITFENSTER = ["08:00-12:00", "13:00-18:00"]
+
+
+def alte_freie_startzeiten(zeitfenster, tag_termine, dauer):
+    """Die Schleife aus show_time_slots vor den Bitsets (nur zum Vergleich)"""
+    blockierte_zeiten = []
+    for termin_zeit, termin_info in tag_termine.items():
+        start_zeit = datetime.strptime(termin_zeit, "%H:%M")
+        end_zeit = start_zeit + timedelta(minutes=termin_info["dauer"])
+        current_block = start_zeit
+        while current_block < end_zeit:
+            blockierte_zeiten.append(current_block.strftime("%H:%M"))
+            current_block += timedelta(minutes=30)
+
+    slots = []
+    for fenster in zeitfenster:
+        start, end = fenster.split("-")
+        current_time = datetime.strptime(start, "%H:%M")
+        end_time = datetime.strptime(end, "%H:%M")
+        while current_time <= end_time - timedelta(minutes=dauer):
+            is_available = True
+            test_time = current_time
+            while test_time < current_time + timedelta(minutes=dauer):
+                if test_time.strftime("%H:%M") in blockierte_zeiten:
+                    is_available = False
+                    break
+                test_time += timedelta(minutes=30)
+            if is_available:
+                slots.append(current_time.strftime("%H:%M"))
+            current_time += timedelta(minutes=30)
+    return slots
+
+
+def zufaellige_tage(anzahl, seed=1):
+    zufall = random.Random(seed)
+    raster = [f"{h:02d}:{m:02d}" for h in range(8, 18) for m in (0, 30) if h != 12]
+    tage = []
+    for _ in range(anzahl):
+        zeiten = zufall.sample(raster, zufall.randint(0, 8))
+        tage.append({z: {"patient": "P", "behandlung": "Krone", "dauer": zufall.choice((30, 60, 90))}
+                     for z in zeiten})
+    return tage
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tage", type=int, default=2000, help="Anzahl zufälliger Tage")
+    argumente = parser.parse_args(argumente)
+
+    tage = zufaellige_tage(argumente.tage)
+    for tag in tage:
+        for dauer in (30, 60, 90):
+            assert freie_startzeiten(ZEITFENSTER, tag, dauer) == alte_freie_startzeiten(ZEITFENSTER, tag, dauer)
+
+    def messen(funktion):
+        return min(timeit.repeat(lambda: [funktion(ZEITFENSTER, tag, 60) for tag in tage], number=1, repeat=5))
+
+    alt, neu = messen(alte_freie_startzeiten), messen(freie_startzeiten)
+    print(f"{len(tage)} Tage, Dauer 60 min")
+    print(f"Schleife (alt): {alt * 1e6 / len(tage):8.1f} µs je Tag")
+    print(f"Bitsets (neu):  {neu * 1e6 / len(tage):8.1f} µs je Tag  ({alt / neu:.1f}x schneller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: Login-Latenz (Namensindex + PBKDF2) gegen die frühere lineare Suche mit Klartextvergleich.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.login [--konten 100 1000 10000 100000] [--iterationen 200000 50000]
+
+Gemessen wird der Weg von pruefe_login ohne Fenster: finde_eintrag und
+pruefe_passwort. Die Konten existieren nur im Speicher einer Datenkopie.
+"""
+import argparse
+import timeit
+
+from benchmarks import daten_kopie
+
+daten_kopie()
+
+from gui import data_manager  # noqa: E402
+from gui.passwort_hash import hash_passwort, pruefe_passwort  # noqa: E402
+
+
+def konten_auffuellen(anzahl):
+    patienten = data_manager.patienten
+    while len(patienten) < anzahl:
+        patienten.append({"name": f"Bench {len(patienten)}", "passwort": "", "passwort_geaendert": True,
+                          "probleme": []})
+    # Index wie nach einem Abgleich neu aufbauen
+    data_manager._nach_name["patienten"] = {p["name"]: p for p in patienten}
+    return patienten[-1]["name"]
+
+
+def passwoerter_setzen(gespeichert):
+    for konto in data_manager.patienten:
+        if konto["name"].startswith("Bench "):
+            konto["passwort"] = gespeichert
+
+
+def login(name, passwort):
+    konto = data_manager.finde_eintrag("patienten", data_manager.patienten, name)
+    return konto is not None and pruefe_passwort(passwort, konto["passwort"])
+
+
+def alter_login(name, passwort):
+    return any(p["name"] == name and p["passwort"] == passwort for p in data_manager.patienten)
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--konten", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--iterationen", type=int, nargs="+", default=[200000, 50000])
+    argumente = parser.parse_args(argumente)
+
+    hashes = {n: hash_passwort("geheim", n) for n in argumente.iterationen}
+    kopf = "".join(f"  Login @{n // 1000}k it" for n in argumente.iterationen)
+    print(f"{'Konten':>8}{kopf}  alte Suche (Klartext)")
+    for anzahl in argumente.konten:
+        ziel = konten_auffuellen(anzahl)
+        zeile = f"{anzahl:>8}"
+        for gespeichert in hashes.values():
+            passwoerter_setzen(gespeichert)
+            assert login(ziel, "geheim") and not login(ziel, "falsch")
+            dauer = min(timeit.repeat(lambda: login(ziel, "geheim"), number=1, repeat=5))
+            zeile += f"  {dauer * 1000:10.1f} ms"
+        passwoerter_setzen("geheim")
+        dauer = min(timeit.repeat(lambda: alter_login(ziel, "geheim"), number=1, repeat=5))
+        print(f"{zeile}  {dauer * 1000:12.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
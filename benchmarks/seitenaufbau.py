@@ -0,0 +1,138 @@
+"""Benchmark: Aufbau der Seiten im Hauptfenster (offscreen), optional im Vergleich zu einem älteren Stand.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.seitenaufbau [--vorher <commit>] [--nachher <commit>] [--runden 20]
+
+Ohne Angaben wird nur der Arbeitsstand gemessen. Angegebene Commits werden
+per git archive in einen temporären Ordner ausgepackt und dort mit
+demselben Messcode gemessen. Für das gemeinsame Theme (gui/theme.py)
+gegenüber Stylesheets je Widget z.B. --vorher <Theme-Commit>~1 --nachher
+<Theme-Commit>. Jede Messung läuft in einem eigenen Prozess auf einer
+Kopie der Daten.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEITEN = ["meine_daten", "meine_termine", "meine_termine_50", "termin_buchen", "einstellungen",
+          "dashboard", "zahnarzt_einstellungen"]
+
+
+def messen(runden):
+    """Läuft im Projektordner des gemessenen Stands; gibt ms je Seitenaufbau aus"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QThreadPool
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    app = QApplication(sys.argv)
+    QMessageBox.information = staticmethod(lambda *a, **k: 0)
+    QMessageBox.warning = staticmethod(lambda *a, **k: 0)
+    try:
+        from gui.theme import wende_theme_an
+        wende_theme_an(app)
+    except ImportError:  # Stand vor dem gemeinsamen Theme
+        pass
+    from gui.termin_store import termin_store
+    from components.main_window import MainFenster
+
+    def warten():
+        try:
+            from gui.daten_dienst import daten_dienst
+        except ImportError:  # Stand ohne DatenDienst
+            daten_dienst = None
+        while daten_dienst is not None and daten_dienst()._auftraege:
+            app.processEvents()
+            time.sleep(0.001)
+        QThreadPool.globalInstance().waitForDone()
+        app.processEvents()
+
+    def miss(fenster, bauen):
+        stapel = fenster.seiten.stapel
+        start = time.perf_counter()
+        for _ in range(runden):
+            seite = bauen()
+            stapel.addWidget(seite)
+            stapel.setCurrentWidget(seite)
+            app.processEvents()
+            stapel.removeWidget(seite)
+            seite.deleteLater()
+        app.processEvents()
+        return (time.perf_counter() - start) / runden * 1000
+
+    patient = MainFenster("Frau Meyer", "Patient")
+    patient.show()
+    arzt = MainFenster("Dr. Kraft", "Zahnarzt")
+    arzt.show()
+    warten()
+    termin = {"patient": "Frau Meyer", "behandlung": "Krone", "material": "normal", "dauer": 30, "anzahl": 1}
+    termin_store.buche("Dr. Kraft", "2099-01-05", "10:00", dict(termin))
+    warten()
+    zeiten = {
+        "meine_daten": miss(patient, patient.view_manager._baue_meine_daten),
+        "meine_termine": miss(patient, patient.view_manager._baue_meine_termine),
+        "termin_buchen": miss(patient, patient.booking_manager._baue_termin_buchen),
+        "einstellungen": miss(patient, patient.settings_manager._baue_einstellungen),
+        "dashboard": miss(arzt, arzt.view_manager._baue_zahnarzt_dashboard),
+        "zahnarzt_einstellungen": miss(arzt, arzt.settings_manager._baue_einstellungen),
+    }
+    for i in range(49):
+        termin_store.buche("Dr. Kraft", "2099-02-%02d" % (i % 28 + 1), "%02d:00" % (8 + i // 28), dict(termin))
+    warten()
+    zeiten["meine_termine_50"] = miss(patient, patient.view_manager._baue_meine_termine)
+    print(json.dumps(zeiten))
+
+
+def stand_messen(ordner, runden):
+    ergebnis = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--messen", "--runden", str(runden)],
+        cwd=ordner, env=dict(os.environ, PYTHONPATH=ordner),
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+    )
+    return json.loads(ergebnis.stdout.strip().splitlines()[-1])
+
+
+def auspacken(commit, ziel):
+    archiv = os.path.join(ziel, "stand.tar")
+    subprocess.run(["git", "archive", "-o", archiv, commit], cwd=PROJEKT, check=True)
+    with tarfile.open(archiv) as tar:
+        tar.extractall(ziel)
+    os.remove(archiv)
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vorher", help="älterer Commit zum Vergleich")
+    parser.add_argument("--nachher", help="statt des Arbeitsstands diesen Commit messen")
+    parser.add_argument("--runden", type=int, default=20)
+    parser.add_argument("--messen", action="store_true", help=argparse.SUPPRESS)
+    argumente = parser.parse_args(argumente)
+    if argumente.messen:
+        messen(argumente.runden)
+        return
+
+    from benchmarks import daten_kopie
+
+    # Der aktuelle Stand schreibt in eine Kopie der Daten (PRAXIS_DATEN), ein Commit in seinen Auszug
+    daten_kopie()
+    staende = {}
+    for name, commit in (("vorher", argumente.vorher), ("nachher", argumente.nachher)):
+        if commit:
+            with tempfile.TemporaryDirectory(prefix="praxis-bench-") as ordner:
+                auspacken(commit, ordner)
+                staende[name] = stand_messen(ordner, argumente.runden)
+    if not argumente.nachher:
+        staende["jetzt"] = stand_messen(PROJEKT, argumente.runden)
+
+    print(f"Seitenaufbau in ms ({argumente.runden} Runden)")
+    print(f"{'Seite':<24}" + "".join(f"{name:>10}" for name in staende))
+    for seite in SEITEN:
+        print(f"{seite:<24}" + "".join(f"{zeiten[seite]:10.1f}" for zeiten in staende.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from components.vorschaubilder import vorschau_cache
+
+# Maße einer Karte und Kantenlänge des Arztbildes
+KARTE_BREITE = 230
+KARTE_HOEHE = 340
+BILD_GROESSE = 180
+ABSTAND = 10
+
+ArztRolle = Qt.UserRole
+BildRolle = Qt.UserRole + 1
+
+
+class ArztKartenModell(QAbstractListModel):
+    """Liste der wählbaren Zahnärzte mit ihrem Bildpfad"""
+
+    def __init__(self, aerzte, bilder, parent=None):
+        super().__init__(parent)
+        self.aerzte = aerzte
+        self._bilder_merken(bilder)
+        vorschau_cache(BILD_GROESSE).fertig.connect(self._bild_geladen)
+
+    def _bilder_merken(self, bilder):
+        self.bilder = bilder
+        # Bildpfad -> Zeilen, damit ein fertiges Bild nur diese Karten neu zeichnet
+        self._zeilen_je_bild = {}
+        for zeile, arzt in enumerate(self.aerzte):
+            bild = bilder.get(arzt["name"])
+            if bild:
+                self._zeilen_je_bild.setdefault(bild, []).append(zeile)
+
+    def setze_bilder(self, bilder):
+        """Bildpfade nachreichen (z.B. im Hintergrund geladen)"""
+        self._bilder_merken(bilder)
+        if self.aerzte:
+            self.dataChanged.emit(self.index(0), self.index(len(self.aerzte) - 1), [BildRolle])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.aerzte)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        arzt = self.aerzte[index.row()]
+        if role == Qt.DisplayRole:
+            return arzt["name"]
+        if role == ArztRolle:
+            return arzt
+        if role == BildRolle:
+            return self.bilder.get(arzt["name"])
+        return None
+
+    def _bild_geladen(self, bild, pixmap):
+        for zeile in self._zeilen_je_bild.get(bild, []):
+            index = self.index(zeile)
+            self.dataChanged.emit(index, index, [BildRolle])
+
+
+class ArztKartenDelegate(QStyledItemDelegate):
+    """Zeichnet eine Arztkarte; Bilder werden erst für sichtbare Karten geladen"""
+
+    def sizeHint(self, option, index):
+        return QSize(KARTE_BREITE, KARTE_HOEHE)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        ausgewaehlt = bool(option.state & QStyle.State_Selected)
+        akzent = QColor("#217dbb")
+
+        # Karte
+        rand = 3 if ausgewaehlt else 2
+        karte = QRectF(option.rect).adjusted(rand / 2, rand / 2, -rand / 2, -rand / 2)
+        painter.setPen(QPen(akzent if ausgewaehlt else QColor("#e0e0e0"), rand))
+        painter.setBrush(Qt.white)
+        painter.drawRoundedRect(karte, 18, 18)
+
+        # Bild oben, zentriert
+        bild_rect = QRectF(
+            option.rect.x() + (option.rect.width() - BILD_GROESSE) / 2,
+            option.rect.y() + 20, BILD_GROESSE, BILD_GROESSE
+        )
+        pfad = QPainterPath()
+        pfad.addRoundedRect(bild_rect, 10, 10)
+        name = index.data(Qt.DisplayRole)
+        bild = index.data(BildRolle)
+        cache = vorschau_cache(BILD_GROESSE)
+        pixmap = cache.pixmap(bild) if bild else None
+        if pixmap is not None:
+            painter.setClipPath(pfad)
+            painter.drawPixmap(bild_rect.toRect(), pixmap)
+            painter.setClipping(False)
+        else:
+            # Ohne (lesbares) Bild der Anfangsbuchstabe, sonst grau bis das Bild geladen ist
+            ohne_bild = not bild or cache.fehlgeschlagen(bild)
+            painter.fillPath(pfad, QColor("#3498db") if ohne_bild else QColor("#f8f9fa"))
+            if ohne_bild:
+                schrift = QFont(option.font)
+                schrift.setPixelSize(48)
+                schrift.setBold(True)
+                painter.setFont(schrift)
+                painter.setPen(Qt.white)
+                painter.drawText(bild_rect, Qt.AlignCenter, name[0].upper())
+
+        # Name darunter
+        schrift = QFont(option.font)
+        schrift.setPixelSize(18)
+        schrift.setBold(True)
+        painter.setFont(schrift)
+        painter.setPen(akzent if ausgewaehlt else QColor("#2c3e50"))
+        text_rect = QRectF(option.rect.x() + 10, bild_rect.bottom() + 18, option.rect.width() - 20, 60)
+        painter.drawText(text_rect, Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, name)
+        painter.restore()
+
+
+class ArztKartenAnsicht(QListView):
+    """Horizontale Kartenreihe ohne eigene Widgets je Karte"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setUniformItemSizes(True)
+        self.setSpacing(ABSTAND)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setCursor(Qt.PointingHandCursor)
+        self.setItemDelegate(ArztKartenDelegate(self))
+        self.setObjectName("arzt_karten")
+        self.setFixedHeight(KARTE_HOEHE + 2 * ABSTAND + self.horizontalScrollBar().sizeHint().height())
@@ -1,45 +1,98 @@
-from gui.data_manager import BEHANDLUNGEN
+from gui.data_manager import behandlungskatalog
+
+try:
+    import numpy as np
+except ImportError:  # ohne NumPy rechnet berechne_kosten in reinem Python
+    np = None
+
+# Summen je Patient, in der Reihenfolge der Spalten kosten, zeit, eigenanteil, versicherung_anteil
+SUMMEN = ("gesamt_kosten", "gesamt_zeit", "eigenanteil", "versicherung_anteil")
+
+# Katalog, zu dem die Arrays gehören, und (preise, dauern, erstattungen)
+_np_tabellen = (None, None)
+
+
+def _tabellen_numpy(katalog):
+    """Preise, Dauern und Erstattungen des Katalogs als Arrays (einmal je Katalog)"""
+    global _np_tabellen
+    if _np_tabellen[0] is not katalog:
+        form = (len(katalog.arten), len(katalog.materialien))
+        _np_tabellen = (katalog, (
+            np.array(katalog.preise).reshape(form),
+            np.array(katalog.dauern).reshape(form),
+            np.array(katalog.erstattungen, dtype=float).reshape(form + (katalog.unbekannt + 1,)),
+        ))
+    return _np_tabellen[1]
+
+
+def _positionen_numpy(katalog, spalten):
+    preise, dauern, erstattungen = _tabellen_numpy(katalog)
+    art = np.array(spalten["art"], dtype=np.intp)
+    material = np.array(spalten["material"], dtype=np.intp)
+    anzahl = np.array(spalten["anzahl"])
+    kosten = preise[art, material] * anzahl
+    zeit = dauern[art, material] * anzahl
+    erstattung = erstattungen[art, material, np.array(spalten["versicherung"], dtype=np.intp)]
+    return kosten, zeit, kosten * (1 - erstattung), kosten * erstattung
+
+
+def _summen_numpy(patient, werte, anzahl_patienten):
+    # bincount summiert in Reihenfolge wie die Python-Schleife; ganzzahlige Spalten bleiben ganzzahlig
+    summe = np.bincount(patient, weights=werte, minlength=anzahl_patienten)
+    return summe.astype(werte.dtype) if werte.dtype.kind in "iu" else summe
+
+
+def berechne_kosten(patienten, katalog=None):
+    """Kosten und Zeit für viele Patienten in einem Durchlauf (z.B. Monatsabrechnung).
+
+    Gibt ein Dict mit drei Teilen zurück, Spalten als Listen:
+    "positionen": je bekanntem Problem patient (Index), art, anzahl, material,
+        kosten, zeit, einheit, eigenanteil, versicherung_anteil
+    "patienten": je Patient gesamt_kosten, gesamt_zeit, eigenanteil, versicherung_anteil
+    "gesamt": dieselben Summen über alle Patienten
+    Mit NumPy wird vektorisiert gerechnet, sonst in einer Schleife.
+    """
+    if katalog is None:
+        katalog = behandlungskatalog()
+    spalten = katalog.kodiere(patienten)
+    anzahl_patienten = len(patienten)
+    if np is not None:
+        patient = np.array(spalten["patient"], dtype=np.intp)
+        werte = _positionen_numpy(katalog, spalten)
+        summen = [_summen_numpy(patient, w, anzahl_patienten).tolist() for w in werte]
+        kosten, zeit, eigenanteil, versicherung_anteil = (w.tolist() for w in werte)
+    else:
+        kosten, zeit, eigenanteil, versicherung_anteil = [], [], [], []
+        summen = [[0] * anzahl_patienten, [0] * anzahl_patienten,
+                  [0.0] * anzahl_patienten, [0.0] * anzahl_patienten]
+        for p, art, material, versicherung, anzahl in zip(
+                spalten["patient"], spalten["art"], spalten["material"], spalten["versicherung"], spalten["anzahl"]):
+            werte = katalog.werte(art, material, versicherung, anzahl)
+            for liste, summe, wert in zip((kosten, zeit, eigenanteil, versicherung_anteil), summen, werte):
+                liste.append(wert)
+                summe[p] += wert
+    return {
+        "positionen": {
+            "patient": spalten["patient"],
+            "art": [katalog.arten[a] for a in spalten["art"]],
+            "anzahl": spalten["anzahl"],
+            "material": spalten["material_name"],
+            "kosten": kosten,
+            "zeit": zeit,
+            "einheit": [katalog.einheiten[a] for a in spalten["art"]],
+            "eigenanteil": eigenanteil,
+            "versicherung_anteil": versicherung_anteil,
+        },
+        "patienten": dict(zip(SUMMEN, summen)),
+        "gesamt": {name: sum(werte) for name, werte in zip(SUMMEN, summen)},
+    }
+
 
 def berechne_kosten_und_zeit(patient):
     if not patient:
         return None
-    
-    gesamt_kosten = 0
-    gesamt_zeit = 0
-    versicherung = patient["krankenkasse"]
-    
-    analyse = []
-    for problem in patient["probleme"]:
-        behandlung = BEHANDLUNGEN.get(problem["art"])
-        if behandlung:
-            anzahl = problem["anzahl"]
-            # Füllmaterial berücksichtigen (default: normal)
-            material = problem.get("material", "normal")
-            mat_info = behandlung["materialien"].get(material, behandlung["materialien"]["normal"])
-            kosten = mat_info["preis"] * anzahl
-            zeit = mat_info["zeit"] * anzahl
-            einheit = behandlung["einheit"]
-            erstattung = mat_info["erstattung"].get(versicherung, 0.0)
-            eigenanteil = kosten * (1 - erstattung)
-            versicherung_anteil = kosten * erstattung
-            analyse.append({
-                "art": problem["art"],
-                "anzahl": anzahl,
-                "material": material,
-                "kosten": kosten,
-                "zeit": zeit,
-                "einheit": einheit,
-                "eigenanteil": eigenanteil,
-                "versicherung_anteil": versicherung_anteil
-            })
-            gesamt_kosten += kosten
-            gesamt_zeit += zeit
-    gesamt_eigenanteil = sum(item["eigenanteil"] for item in analyse)
-    gesamt_versicherung_anteil = sum(item["versicherung_anteil"] for item in analyse)
-    return {
-        "analyse": analyse,
-        "gesamt_kosten": gesamt_kosten,
-        "eigenanteil": gesamt_eigenanteil,
-        "versicherung_anteil": gesamt_versicherung_anteil,
-        "gesamt_zeit": gesamt_zeit
-    } 
\ No newline at end of file
+    ergebnis = berechne_kosten([patient])
+    positionen = ergebnis["positionen"]
+    felder = ("art", "anzahl", "material", "kosten", "zeit", "einheit", "eigenanteil", "versicherung_anteil")
+    analyse = [dict(zip(felder, werte)) for werte in zip(*(positionen[feld] for feld in felder))]
+    return dict({name: werte[0] for name, werte in ergebnis["patienten"].items()}, analyse=analyse)
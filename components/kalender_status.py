@@ -0,0 +1,177 @@
+import os
+from datetime import date, timedelta
+
+from PyQt5.QtCore import QDate
+from PyQt5.QtGui import QColor, QTextCharFormat
+
+from gui.termin_store import termin_store
+from components.verfuegbarkeit import WOCHENTAGE_KURZ, freie_startzeiten, arbeitsminuten
+
+# Wie viele Monate im Voraus gebucht werden kann (PRAXIS_HORIZONT_MONATE)
+HORIZONT_MONATE = int(os.environ.get("PRAXIS_HORIZONT_MONATE", "12"))
+
+# Status eines Kalendertages
+VERGANGEN = "vergangen"
+WOCHENENDE = "wochenende"
+ARBEITSFREI = "arbeitsfrei"
+FREI = "frei"
+AUSGEBUCHT = "ausgebucht"
+# Auslastung im Zahnarzt-Kalender: gebuchte Minuten / Arbeitsminuten in Vierteln
+AUSLASTUNG = ("auslastung_1", "auslastung_2", "auslastung_3", "auslastung_4")
+
+FARBEN = {
+    VERGANGEN: "#e0e0e0",     # Alle Tage vor heute: grau
+    WOCHENENDE: "#ffb3b3",    # Samstag und Sonntag: rot
+    ARBEITSFREI: "#e0e0e0",   # Arzt arbeitet nicht: grau
+    FREI: "#b9fbc0",          # Verfügbare Tage: grün
+    AUSGEBUCHT: "#ffd8a8",    # Kein freier Termin für die Behandlung: hellorange
+    # Auslastung bis 25 %, 50 %, 75 %, darüber: von gelb nach rot
+    AUSLASTUNG[0]: "#fff3b0",
+    AUSLASTUNG[1]: "#ffd700",
+    AUSLASTUNG[2]: "#ffa94d",
+    AUSLASTUNG[3]: "#ff6b6b",
+}
+
+_formate = {}
+
+
+def format_fuer(status):
+    """Ein gemeinsames QTextCharFormat je Status (schwarze Schrift, farbiger Hintergrund)"""
+    if status not in _formate:
+        format = QTextCharFormat()
+        format.setForeground(QColor("#000000"))
+        format.setBackground(QColor(FARBEN[status]))
+        _formate[status] = format
+    return _formate[status]
+
+
+class TagesStatusCache:
+    """Status je (Arzt, Datum) für die Kalenderfärbung.
+
+    Berechnet wird monatsweise, erst wenn ein Monat angezeigt wird; fertige
+    Monate bleiben gespeichert, Blättern kostet danach nichts mehr.
+    Buchungen und Stornierungen verwerfen über die Beobachter des
+    TerminStore nur den betroffenen Tag; geänderte Arbeitszeiten oder ein
+    neuer Tag alles Betroffene.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._heute = None
+        # (arzt, auslastung, dauer) -> (Arbeitszeiten, {(jahr, monat): {datum 'yyyy-MM-dd': status}})
+        self._monate = {}
+        store.beobachten(self._termin_geaendert)
+
+    def _termin_geaendert(self, arzt, datum):
+        if arzt is None:
+            self._monate.clear()
+            return
+        monat = (int(datum[:4]), int(datum[5:7]))
+        for (name, auslastung, dauer), (_, monate) in self._monate.items():
+            if name == arzt and (auslastung or dauer):
+                monate.get(monat, {}).pop(datum, None)
+
+    def _status(self, tag, zeiten, arzt_termine, minuten, dauer):
+        wochentag = WOCHENTAGE_KURZ[tag.weekday()]
+        if tag < self._heute:
+            return VERGANGEN
+        if wochentag in ("Sa", "So"):
+            return WOCHENENDE
+        if wochentag not in zeiten:
+            return ARBEITSFREI
+        if dauer:
+            tag_termine = arzt_termine.get(tag.isoformat())
+            if tag_termine and not freie_startzeiten(zeiten[wochentag], tag_termine, dauer):
+                return AUSGEBUCHT
+        if minuten:
+            gebucht = minuten.get(tag.isoformat())
+            if gebucht:
+                anteil = gebucht / max(arbeitsminuten(zeiten[wochentag]), 1)
+                return AUSLASTUNG[min(int(anteil * 4), 3)]
+        return FREI
+
+    def _monat(self, jahr, monat, zeiten, arzt_termine, minuten, dauer):
+        tag = date(jahr, monat, 1)
+        status_je_tag = {}
+        while tag.month == monat:
+            status_je_tag[tag.isoformat()] = self._status(tag, zeiten, arzt_termine, minuten, dauer)
+            tag += timedelta(days=1)
+        return status_je_tag
+
+    def tage(self, arzt, tage, auslastung=False, dauer=None):
+        """Status für die gegebenen Tage (datetime.date) als Liste von (tag, status).
+
+        auslastung: Tage nach gebuchten Minuten einfärben (Zahnarzt-Kalender);
+        kommt allein mit der Minutensumme je Tag aus dem TerminStore aus.
+        dauer: Tage ohne freien Termin dieser Länge als ausgebucht markieren.
+        """
+        self.store.aktualisieren()
+        heute = date.today()
+        if heute != self._heute:
+            self._heute = heute
+            self._monate.clear()
+        zeiten = arzt["zeiten"]
+        arbeitszeiten = tuple(sorted((tag, tuple(fenster)) for tag, fenster in zeiten.items()))
+        schluessel = (arzt["name"], auslastung, dauer)
+        eintrag = self._monate.get(schluessel)
+        if eintrag is None or eintrag[0] != arbeitszeiten:
+            eintrag = (arbeitszeiten, {})
+            self._monate[schluessel] = eintrag
+        monate = eintrag[1]
+        arzt_termine = self.store.arzt_termine(arzt["name"]) if dauer else None
+        minuten = self.store.gebuchte_minuten(arzt["name"]) if auslastung else None
+        ergebnis = []
+        for tag in tage:
+            status_je_tag = monate.get((tag.year, tag.month))
+            if status_je_tag is None:
+                # Ganzen Monat auf einmal berechnen, sobald er sichtbar wird
+                status_je_tag = self._monat(tag.year, tag.month, zeiten, arzt_termine, minuten, dauer)
+                monate[(tag.year, tag.month)] = status_je_tag
+            datum_str = tag.isoformat()
+            status = status_je_tag.get(datum_str)
+            if status is None:
+                # Nach Buchung/Stornierung verworfener Tag
+                status = self._status(tag, zeiten, arzt_termine, minuten, dauer)
+                status_je_tag[datum_str] = status
+            ergebnis.append((tag, status))
+        return ergebnis
+
+
+class KalenderFaerbung:
+    """Färbt in einem QCalendarWidget nur die sichtbaren Tage.
+
+    Beim Blättern (currentPageChanged) wird der neue Monat nachgezogen;
+    Formate werden nur gesetzt, wenn sich der Status eines Tages geändert hat.
+    """
+
+    def __init__(self, kalender, arzt, auslastung=False, dauer=None, cache=None):
+        self.kalender = kalender
+        self.arzt = arzt
+        self.auslastung = auslastung
+        self.dauer = dauer
+        self.cache = cache or tages_status
+        self._angewendet = {}
+        kalender.currentPageChanged.connect(lambda jahr, monat: self.aktualisieren())
+        self.aktualisieren()
+
+    def sichtbare_tage(self):
+        """Die 6 Wochen der aktuellen Seite, begrenzt auf den wählbaren Zeitraum"""
+        erster = QDate(self.kalender.yearShown(), self.kalender.monthShown(), 1)
+        versatz = (erster.dayOfWeek() - self.kalender.firstDayOfWeek()) % 7
+        start = max(erster.addDays(-versatz), self.kalender.minimumDate())
+        ende = min(erster.addDays(42 - versatz - 1), self.kalender.maximumDate())
+        tage = []
+        while start <= ende:
+            tage.append(start.toPyDate())
+            start = start.addDays(1)
+        return tage
+
+    def aktualisieren(self):
+        for tag, status in self.cache.tage(self.arzt, self.sichtbare_tage(), self.auslastung, self.dauer):
+            if self._angewendet.get(tag) != status:
+                self.kalender.setDateTextFormat(QDate(tag), format_fuer(status))
+                self._angewendet[tag] = status
+
+
+# Gemeinsamer Cache für die ganze App
+tages_status = TagesStatusCache(termin_store)
@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox,
     QHBoxLayout, QFrame, QSizePolicy, QComboBox, QCalendarWidget,
-    QScrollArea, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView
+    QScrollArea, QCheckBox, QTableWidget, QTableWidgetItem, QHeaderView, QStackedWidget
 )
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QColor, QPalette, QTextCharFormat, QPixmap
@@ -10,34 +10,45 @@ import json
 import sys
 
 from gui.data_manager import (
-    patienten, zahnaerzte, BEHANDLUNGEN, speichere_daten,
-    pfad_patienten, pfad_zahnaerzte, STYLE
+    patienten, zahnaerzte, finde_eintrag
 )
 from components.view_manager import get_weekday
 from components.calculator import berechne_kosten_und_zeit
 from components.settings_manager import SettingsManager
 from components.booking_manager import BookingManager
 from components.view_manager import ViewManager
+from components.seiten_cache import SeitenCache
+from gui.daten_dienst import daten_dienst
+from gui.daten_waechter import daten_waechter
 from gui.register import RegistrierungsFenster, ZahnarztRegistrierungsFenster
 
+# Offene Fenster halten sich hier selbst, nicht über Attribute des Fensters, das sie geöffnet hat;
+# sonst hielte jedes abgemeldete Fenster das nächste fest und keins würde freigegeben
+_offene_fenster = set()
+
+def offen_halten(fenster):
+    """Hält ein Fenster, bis es geschlossen ist; danach wird es freigegeben"""
+    fenster.setAttribute(Qt.WA_DeleteOnClose)
+    _offene_fenster.add(fenster)
+    fenster.destroyed.connect(lambda: _offene_fenster.discard(fenster))
+
 class MainFenster(QWidget):
     def __init__(self, benutzername, rolle):
         super().__init__()
+        # Nach dem Abmelden freigeben, samt aller Seiten und ihrer Beobachter
+        offen_halten(self)
         self.benutzername = benutzername
         self.rolle = rolle
-        self.current_page = None  # Speichert aktuelle Seite
+        # Ab hier gleicht der Wächter im Hintergrund ab; Lesezugriffe warten nicht mehr auf die Datenhaltung
+        waechter = daten_waechter()
         
         # Finde aktuellen Patienten
         self.patient_data = None
         if rolle == "Patient":
-            for p in patienten:
-                if p["name"] == benutzername:
-                    self.patient_data = p
-                    break
+            self.patient_data = finde_eintrag("patienten", patienten, benutzername)
 
         self.setWindowTitle("BrightByte")
         self.setGeometry(300, 50, 1200, 600)
-        self.setStyleSheet(STYLE)
         
         # Hintergrundfarbe
         palette = self.palette()
@@ -58,12 +69,31 @@ class MainFenster(QWidget):
         self.view_manager = ViewManager(self)
         self.init_ui()
 
+        # Änderungen anderer Stationen und bearbeitete Dateien ohne Neustart übernehmen
+        waechter.geaendert.connect(self._daten_geaendert)
+        waechter.fehler.connect(self._daten_fehler)
+        daten_dienst().fehler.connect(self._dienst_fehler)
+        self._verbunden = True
+        # Termine (beim ersten Fenster) und alles Geänderte im Hintergrund laden
+        waechter.pruefen()
+
+    def closeEvent(self, event):
+        # Wächter und Dienst leben weiter; ohne Trennen hielten sie jedes abgemeldete Fenster fest
+        if self._verbunden:
+            self._verbunden = False
+            waechter = daten_waechter()
+            waechter.geaendert.disconnect(self._daten_geaendert)
+            waechter.fehler.disconnect(self._daten_fehler)
+            daten_dienst().fehler.disconnect(self._dienst_fehler)
+        super().closeEvent(event)
+
     def logout(self):
         # Import hier um zirkulären Import zu vermeiden
         from gui.login import LoginFenster
         # Öffne Login-Fenster
-        self.login_fenster = LoginFenster()
-        self.login_fenster.show()
+        login_fenster = LoginFenster()
+        offen_halten(login_fenster)
+        login_fenster.show()
         # Schließt aktuelle Fenster
         self.close()
 
@@ -115,6 +145,44 @@ class MainFenster(QWidget):
     def show_zahnarzt_dashboard(self):
         self.view_manager.show_zahnarzt_dashboard()
 
+    def _daten_geaendert(self, sammlung):
+        # Tabellen und Wochenplan melden sich selbst über den TerminStore; hier nur die offene Seite nachziehen
+        if not self.isVisible():
+            return
+        seite = self.seiten.aktuell()
+        if sammlung == "termine":
+            if seite == "meine_termine":
+                self.show_meine_termine()
+            elif seite == "dashboard":
+                self.view_manager.termine_aktualisiert()
+            return
+        if seite == "termin_buchen" and sammlung == "behandlungen" and self.patient_data["probleme"]:
+            # Auswahl bleibt stehen, nur die Kosten werden neu berechnet
+            self.update_kosten()
+            return
+        # Reine Anzeigeseiten werden neu gebaut, falls sich ihr Stand geändert hat
+        anzeigen = {
+            "meine_daten": self.show_meine_daten,
+            "dashboard": self.show_zahnarzt_dashboard,
+            "wochenplan": self.show_wochenplan,
+        }
+        if seite in anzeigen:
+            anzeigen[seite]()
+
+    def _daten_fehler(self, sammlung, text):
+        if self.isVisible() and sammlung == "behandlungen":
+            QMessageBox.warning(
+                self, "Preisliste ungültig",
+                f"Die geänderte Preisliste konnte nicht übernommen werden, es gelten weiter die bisherigen Preise.\n\n{text}"
+            )
+
+    def _dienst_fehler(self, text):
+        if self.isVisible():
+            QMessageBox.warning(self, "Speicherfehler", f"Die Änderung konnte nicht gespeichert werden:\n{text}")
+
+    def show_wochenplan(self):
+        self.view_manager.show_wochenplan()
+
     def init_ui(self):
         hauptlayout = QVBoxLayout()
         hauptlayout.setContentsMargins(20, 20, 20, 20)
@@ -122,30 +190,18 @@ class MainFenster(QWidget):
 
         # Begrüßung (Header)
         begruessung_container = QFrame()
-        begruessung_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 12px;
-            }
-        """)
+        begruessung_container.setProperty("stil", "kopf")
         begruessung_container.setFixedHeight(150)  # Feste Höhe für Header
         begruessung_layout = QVBoxLayout(begruessung_container)
         begruessung_layout.setAlignment(Qt.AlignCenter)
         
         self.begruessung_label = QLabel(f"Willkommen {self.benutzername}")
-        self.begruessung_label.setStyleSheet("""
-            font-size: 22px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 0px;
-            padding: 0px;
-        """)
+        self.begruessung_label.setObjectName("begruessung")
         self.begruessung_label.setAlignment(Qt.AlignCenter)
         begruessung_layout.addWidget(self.begruessung_label)
         
         rolle_label = QLabel(f"Angemeldet als {self.rolle}")
-        rolle_label.setStyleSheet("color: #7f8c8d; margin: 0px;")
+        rolle_label.setProperty("stil", "grau")
         rolle_label.setAlignment(Qt.AlignCenter)
         begruessung_layout.addWidget(rolle_label)
         
@@ -159,13 +215,7 @@ class MainFenster(QWidget):
 
         # Sidebar (Profilbereich)
         profil_container = QFrame()
-        profil_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        profil_container.setProperty("stil", "karte")
         profil_container.setFixedWidth(240)  # Feste Breite für Sidebar
         profil_layout = QVBoxLayout(profil_container)
         profil_layout.setSpacing(15)
@@ -173,13 +223,7 @@ class MainFenster(QWidget):
         # Profilbild rund
         profilbild = QLabel()
         profilbild.setFixedSize(100, 100)
-        profilbild.setStyleSheet("""
-            background-color: #3498db;
-            border-radius: 50px;
-            color: white;
-            font-size: 36px;
-            font-weight: bold;
-        """)
+        profilbild.setObjectName("profilbild")
         profilbild.setText(self.benutzername[0].upper())
         profilbild.setAlignment(Qt.AlignCenter)
         profil_layout.addWidget(profilbild, alignment=Qt.AlignCenter)
@@ -201,24 +245,13 @@ class MainFenster(QWidget):
         else:  # andere für Zahnarzt
             menu_buttons = [
                 ("Dashboard", "📊", self.show_zahnarzt_dashboard),
+                ("Wochenplan", "🗓️", self.show_wochenplan),
                 ("Einstellungen", "⚙️", self.show_einstellungen)
             ]
 
         for text, icon, func in menu_buttons:
             btn = QPushButton(f"{icon} {text}")
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    color: #2c3e50;
-                    text-align: left;
-                    padding: 12px;
-                    border-radius: 5px;
-                    font-weight: normal;
-                }
-                QPushButton:hover {
-                    background-color: #f0f0f0;
-                }
-            """)
+            btn.setProperty("stil", "menue")
             if func:
                 btn.clicked.connect(func)
             profil_layout.addWidget(btn)
@@ -227,36 +260,22 @@ class MainFenster(QWidget):
 
         # Logout Button
         logout_btn = QPushButton("🚪 Abmelden")
-        logout_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                text-align: center;
-                padding: 12px;
-                border-radius: 5px;
-                font-weight: bold;
-                margin-top: 10px;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        logout_btn.setObjectName("abmelden")
         logout_btn.clicked.connect(self.logout)
         profil_layout.addWidget(logout_btn)
 
         # Inhaltsbereich
         inhalt_container = QFrame()
-        inhalt_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        inhalt_container.setProperty("stil", "karte")
         inhalt_container.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.inhalt_layout_inner = QVBoxLayout(inhalt_container)
         self.inhalt_layout_inner.setContentsMargins(0, 0, 0, 0)
         self.inhalt_layout_inner.setSpacing(0)
+        # Seiten werden einmal gebaut und im Stapel aufgehoben
+        seiten_stapel = QStackedWidget()
+        seiten_stapel.setObjectName("seiten")
+        self.inhalt_layout_inner.addWidget(seiten_stapel)
+        self.seiten = SeitenCache(seiten_stapel)
 
         # Layout zusammensetzen
         inhalt_layout.addWidget(profil_container)
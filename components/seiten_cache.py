@@ -0,0 +1,61 @@
+import os
+from collections import OrderedDict
+
+# So viele fertig gebaute Seiten bleiben erhalten (PRAXIS_MAX_SEITEN)
+MAX_SEITEN = int(os.environ.get("PRAXIS_MAX_SEITEN", "4"))
+
+
+class SeitenCache:
+    """Seiten des Hauptfensters in einem QStackedWidget.
+
+    Jede Seite wird einmal gebaut und beim nächsten Aufruf nur wieder
+    angezeigt. Zu jeder Seite wird ihr Datenstand gemerkt (z.B. die Version
+    des TerminStore); hat er sich geändert, wird die Seite neu gebaut. Sind
+    mehr als max_seiten gebaut, fällt die am längsten nicht gezeigte heraus.
+    """
+
+    def __init__(self, stapel, max_seiten=MAX_SEITEN):
+        self.stapel = stapel
+        self.max_seiten = max_seiten
+        # schluessel -> (stand, seite), zuletzt gezeigte am Ende
+        self._seiten = OrderedDict()
+        # Zwischenschritt ohne Schlüssel (z.B. Arztwahl), wird beim Wechsel gelöscht
+        self._einmalig = None
+
+    def zeige(self, schluessel, bauen, stand=None):
+        """Zeigt die Seite schluessel; bauen() liefert das Widget, stand() ihren Datenstand"""
+        aktueller_stand = stand() if stand else None
+        eintrag = self._seiten.pop(schluessel, None)
+        if eintrag is not None and eintrag[0] != aktueller_stand:
+            self._entfernen(eintrag[1])
+            eintrag = None
+        if eintrag is None:
+            eintrag = (aktueller_stand, bauen())
+            self.stapel.addWidget(eintrag[1])
+        self._seiten[schluessel] = eintrag
+        self._anzeigen(eintrag[1])
+        while len(self._seiten) > self.max_seiten:
+            _, (_, seite) = self._seiten.popitem(last=False)
+            self._entfernen(seite)
+
+    def aktuell(self):
+        """Schlüssel der angezeigten Seite (None bei einem Zwischenschritt)"""
+        if self._einmalig is not None or not self._seiten:
+            return None
+        return next(reversed(self._seiten))
+
+    def zeige_einmalig(self, seite):
+        """Zeigt eine Seite, die nicht aufgehoben wird"""
+        self.stapel.addWidget(seite)
+        self._anzeigen(seite)
+        self._einmalig = seite
+
+    def _anzeigen(self, seite):
+        self.stapel.setCurrentWidget(seite)
+        if self._einmalig is not None and self._einmalig is not seite:
+            self._entfernen(self._einmalig)
+            self._einmalig = None
+
+    def _entfernen(self, seite):
+        self.stapel.removeWidget(seite)
+        seite.deleteLater()
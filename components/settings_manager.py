@@ -5,44 +5,70 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QColor, QPalette
-from gui.data_manager import speichere_daten, patienten, zahnaerzte, pfad_patienten, pfad_zahnaerzte
-import os, json
+from gui.data_manager import (
+    speicher, schreibe_eintrag, uebernimm_eintrag, finde_eintrag, eintrag_stand, patienten, zahnaerzte, behandlungskatalog
+)
+from gui.passwort_hash import hash_passwort
+from gui.termin_store import termin_store
+from gui.daten_dienst import daten_dienst
+
+# Der eigene Datensatz wurde inzwischen an einer anderen Station umbenannt oder gelöscht
+GEAENDERT_MELDUNG = ("Ihre Daten wurden inzwischen an einer anderen Station umbenannt oder gelöscht. "
+                     "Bitte melden Sie sich erneut an.")
 
 class SettingsManager:
     def __init__(self, main_window):
         self.main_window = main_window
 
     def show_einstellungen(self):
-        if self.main_window.current_page:
-            self.main_window.current_page.hide()
-            self.main_window.current_page.deleteLater()
+        # Nur der eigene Datensatz zählt; Änderungen an anderen bauen die Seite nicht neu
+        if self.main_window.rolle == "Patient":
+            seiten_stand = lambda: eintrag_stand("patienten", patienten, self.main_window.benutzername)
+        else:
+            seiten_stand = lambda: eintrag_stand("zahnaerzte", zahnaerzte, self.main_window.benutzername)
+        self.main_window.seiten.zeige("einstellungen", self._baue_einstellungen, seiten_stand)
+
+    def _speichern(self, sammlung, datensatz, aenderung, meldung, danach=None, vorbereiten=None):
+        """Ändert den eigenen Datensatz im DatenDienst; nach dem Speichern meldung und danach().
+
+        Statt aenderung kann vorbereiten übergeben werden: läuft im Worker
+        vor der Sperre (für teure Berechnungen) und liefert die aenderung.
+        """
+        name = datensatz["name"]
+
+        def arbeit():
+            return schreibe_eintrag(sammlung, name, aenderung if vorbereiten is None else vorbereiten())
+
+        def uebernehmen(quittung):
+            uebernimm_eintrag(quittung)
+            return quittung["ok"]
 
+        def fertig(gespeichert):
+            if not gespeichert:
+                QMessageBox.warning(self.main_window, "Fehler", GEAENDERT_MELDUNG)
+                return
+            QMessageBox.information(self.main_window, "Erfolg", meldung)
+            if danach is not None:
+                danach()
+
+        daten_dienst().starte(arbeit, fertig, uebernehmen=uebernehmen)
+
+    def _baue_einstellungen(self):
         # Container für Einstellungen
         settings_container = QFrame(self.main_window)
-        settings_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        settings_container.setProperty("stil", "karte")
         settings_layout = QVBoxLayout(settings_container)
 
         # Überschrift
         titel = QLabel("Einstellungen", settings_container)
-        titel.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 20px;
-        """)
+        titel.setProperty("stil", "titel")
         titel.setAlignment(Qt.AlignCenter)
         settings_layout.addWidget(titel)
 
         # Scroll-Bereich für Einstellungen
         scroll = QScrollArea(settings_container)
         scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: 5px solid #E8F4F8; }")
+        scroll.setProperty("stil", "liste")
         
         scroll_content = QWidget(scroll)
         scroll_layout = QVBoxLayout(scroll_content)
@@ -51,18 +77,11 @@ class SettingsManager:
         if self.main_window.rolle == "Patient":
             # Passwort ändern
             passwort_group = QFrame(scroll_content)
-            passwort_group.setStyleSheet("""
-                QFrame {
-                    background-color: #f8f9fa;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }
-            """)
+            passwort_group.setProperty("stil", "gruppe")
             passwort_layout = QVBoxLayout(passwort_group)
             
             passwort_label = QLabel("Passwort ändern", passwort_group)
-            passwort_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+            passwort_label.setProperty("stil", "abschnitt")
             passwort_layout.addWidget(passwort_label)
             
             self.main_window.neues_passwort = QLineEdit(passwort_group)
@@ -78,18 +97,11 @@ class SettingsManager:
 
             # Krankenkasse ändern
             kasse_group = QFrame(scroll_content)
-            kasse_group.setStyleSheet("""
-                QFrame {
-                    background-color: #f8f9fa;
-                    border-radius: 8px;
-                    padding: 15px;
-                    margin-bottom: 15px;
-                }
-            """)
+            kasse_group.setProperty("stil", "gruppe")
             kasse_layout = QVBoxLayout(kasse_group)
             
             kasse_label = QLabel("Krankenkasse ändern", kasse_group)
-            kasse_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+            kasse_label.setProperty("stil", "abschnitt")
             kasse_layout.addWidget(kasse_label)
             
             self.main_window.kasse_box = QComboBox(kasse_group)
@@ -105,24 +117,16 @@ class SettingsManager:
 
             # Neue Probleme hinzufügen
             probleme_group = QFrame(scroll_content)
-            probleme_group.setStyleSheet("""
-                QFrame {
-                    background-color: #f8f9fa;
-                    border-radius: 8px;
-                    padding: 15px;
-                }
-            """)
+            probleme_group.setProperty("stil", "letzte_gruppe")
             probleme_layout = QVBoxLayout(probleme_group)
             
             probleme_label = QLabel("Neue Behandlung hinzufügen", probleme_group)
-            probleme_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+            probleme_label.setProperty("stil", "abschnitt")
             probleme_layout.addWidget(probleme_label)
             
-            self.main_window.problem_box = QComboBox(probleme_group)
-            self.main_window.problem_box.addItems([
-                "Karies klein", "Karies groß", "Teilkrone", "Krone", "Wurzelbehandlung"
-            ])
-            probleme_layout.addWidget(self.main_window.problem_box)
+            self.main_window.neues_problem_box = QComboBox(probleme_group)
+            self.main_window.neues_problem_box.addItems(behandlungskatalog().arten)
+            probleme_layout.addWidget(self.main_window.neues_problem_box)
             
             self.main_window.problem_anzahl = QLineEdit(probleme_group)
             self.main_window.problem_anzahl.setPlaceholderText("Anzahl")
@@ -136,27 +140,16 @@ class SettingsManager:
 
         else:  # Zahnarzt Einstellungen
             # Finde aktuellen Zahnarzt
-            self.main_window.zahnarzt_data = None
-            for z in zahnaerzte:
-                if z["name"] == self.main_window.benutzername:
-                    self.main_window.zahnarzt_data = z
-                    break
+            self.main_window.zahnarzt_data = finde_eintrag("zahnaerzte", zahnaerzte, self.main_window.benutzername)
 
             if self.main_window.zahnarzt_data:
                 # Name ändern
                 name_group = QFrame(scroll_content)
-                name_group.setStyleSheet("""
-                    QFrame {
-                        background-color: #f8f9fa;
-                        border-radius: 8px;
-                        padding: 15px;
-                        margin-bottom: 15px;
-                    }
-                """)
+                name_group.setProperty("stil", "gruppe")
                 name_layout = QVBoxLayout(name_group)
                 
                 name_label = QLabel("Name ändern", name_group)
-                name_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+                name_label.setProperty("stil", "abschnitt")
                 name_layout.addWidget(name_label)
                 
                 self.main_window.neuer_name = QLineEdit(name_group)
@@ -172,18 +165,11 @@ class SettingsManager:
 
                 # Passwort ändern
                 passwort_group = QFrame(scroll_content)
-                passwort_group.setStyleSheet("""
-                    QFrame {
-                        background-color: #f8f9fa;
-                        border-radius: 8px;
-                        padding: 15px;
-                        margin-bottom: 15px;
-                    }
-                """)
+                passwort_group.setProperty("stil", "gruppe")
                 passwort_layout = QVBoxLayout(passwort_group)
                 
                 passwort_label = QLabel("Passwort ändern", passwort_group)
-                passwort_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+                passwort_label.setProperty("stil", "abschnitt")
                 passwort_layout.addWidget(passwort_label)
                 
                 self.main_window.neues_passwort = QLineEdit(passwort_group)
@@ -199,24 +185,17 @@ class SettingsManager:
 
                 # Krankenkassen
                 kassen_group = QFrame(scroll_content)
-                kassen_group.setStyleSheet("""
-                    QFrame {
-                        background-color: #f8f9fa;
-                        border-radius: 8px;
-                        padding: 15px;
-                        margin-bottom: 15px;
-                    }
-                """)
+                kassen_group.setProperty("stil", "gruppe")
                 kassen_layout = QVBoxLayout(kassen_group)
                 
                 kassen_label = QLabel("Behandelt folgende Versicherungen:", kassen_group)
-                kassen_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+                kassen_label.setProperty("stil", "abschnitt")
                 kassen_layout.addWidget(kassen_label)
                 
                 self.main_window.kassen_checkboxes = {}
                 for kasse in ["gesetzlich", "privat", "freiwillig gesetzlich"]:
                     cb = QCheckBox(kasse, kassen_group)
-                    cb.setStyleSheet("color: #2c3e50; margin-left: 10px;")
+                    cb.setProperty("stil", "eingerueckt")
                     cb.setChecked(kasse in self.main_window.zahnarzt_data["behandelt"])
                     self.main_window.kassen_checkboxes[kasse] = cb
                     kassen_layout.addWidget(cb)
@@ -229,17 +208,11 @@ class SettingsManager:
 
                 # Behandlungszeiten
                 zeiten_group = QFrame(scroll_content)
-                zeiten_group.setStyleSheet("""
-                    QFrame {
-                        background-color: #f8f9fa;
-                        border-radius: 8px;
-                        padding: 15px;
-                    }
-                """)
+                zeiten_group.setProperty("stil", "letzte_gruppe")
                 zeiten_layout = QVBoxLayout(zeiten_group)
                 
                 zeiten_label = QLabel("Wöchentliche Behandlungszeiten:", zeiten_group)
-                zeiten_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #2c3e50;")
+                zeiten_label.setProperty("stil", "abschnitt")
                 zeiten_layout.addWidget(zeiten_label)
                 
                 self.main_window.wochentage = {
@@ -257,7 +230,7 @@ class SettingsManager:
                     
                     # Checkbox für den Tag
                     tag_cb = QCheckBox(tag_lang, tag_frame)
-                    tag_cb.setStyleSheet("color: #2c3e50; font-weight: bold;")
+                    tag_cb.setProperty("stil", "fett")
                     tag_cb.setChecked(tag_kurz in self.main_window.zahnarzt_data["zeiten"])
                     tag_layout.addWidget(tag_cb)
                     
@@ -283,7 +256,6 @@ class SettingsManager:
                             zeit_layout = QHBoxLayout(zeit_container)
                             
                             von_label = QLabel("Von:", zeit_container)
-                            von_label.setStyleSheet("color: #2c3e50;")
                             zeit_layout.addWidget(von_label)
                             
                             von_zeit = QComboBox(zeit_container)
@@ -292,7 +264,6 @@ class SettingsManager:
                             zeit_layout.addWidget(von_zeit)
                             
                             bis_label = QLabel("Bis:", zeit_container)
-                            bis_label.setStyleSheet("color: #2c3e50;")
                             zeit_layout.addWidget(bis_label)
                             
                             bis_zeit = QComboBox(zeit_container)
@@ -302,18 +273,7 @@ class SettingsManager:
                             
                             # Entfernen-Button
                             remove_btn = QPushButton("×", zeit_container)
-                            remove_btn.setStyleSheet("""
-                                QPushButton {
-                                    background-color: #e74c3c;
-                                    color: white;
-                                    border-radius: 10px;
-                                    padding: 2px 6px;
-                                    font-weight: bold;
-                                }
-                                QPushButton:hover {
-                                    background-color: #c0392b;
-                                }
-                            """)
+                            remove_btn.setProperty("stil", "entfernen")
                             remove_btn.clicked.connect(lambda checked, c=zeit_container, t=tag_kurz: self.remove_zeitslot(t, c))
                             zeit_layout.addWidget(remove_btn)
                             
@@ -325,17 +285,7 @@ class SettingsManager:
                     
                     # Button für zusätzliche Zeitslots
                     add_slot_btn = QPushButton("+ Zeitslot hinzufügen", tag_frame)
-                    add_slot_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: transparent;
-                            color: #3498db;
-                            border: 1px solid #3498db;
-                            padding: 5px;
-                        }
-                        QPushButton:hover {
-                            background-color: #f0f9ff;
-                        }
-                    """)
+                    add_slot_btn.setProperty("stil", "umrandet")
                     add_slot_btn.clicked.connect(lambda checked, tag=tag_kurz: self.add_zeitslot(tag))
                     
                     self.main_window.zeiten_widgets[tag_kurz]["add_button"] = add_slot_btn
@@ -352,8 +302,7 @@ class SettingsManager:
 
         scroll.setWidget(scroll_content)
         settings_layout.addWidget(scroll)
-        self.main_window.inhalt_layout_inner.addWidget(settings_container)
-        self.main_window.current_page = settings_container
+        return settings_container
 
     def update_zahnarzt_name(self):
         if not self.main_window.zahnarzt_data:
@@ -363,61 +312,62 @@ class SettingsManager:
             QMessageBox.warning(self.main_window, "Fehler", "Bitte geben Sie einen Namen ein.")
             return
         # Prüfe ob der Name bereits existiert
-        for arzt in zahnaerzte:
-            if arzt["name"] == neuer_name and arzt != self.main_window.zahnarzt_data:
-                QMessageBox.warning(
-                    self.main_window,
-                    "Fehler",
-                    f"Ein Zahnarzt mit dem Namen '{neuer_name}' existiert bereits."
-                )
-                return
+        arzt = finde_eintrag("zahnaerzte", zahnaerzte, neuer_name)
+        if arzt is not None and arzt is not self.main_window.zahnarzt_data:
+            QMessageBox.warning(
+                self.main_window,
+                "Fehler",
+                f"Ein Zahnarzt mit dem Namen '{neuer_name}' existiert bereits."
+            )
+            return
         alter_name = self.main_window.zahnarzt_data["name"]
-        self.main_window.zahnarzt_data["name"] = neuer_name
-        speichere_daten(pfad_zahnaerzte, zahnaerzte)
-        # --- Bild-Mapping aktualisieren ---
-        bilder_json_path = os.path.join(os.path.dirname(__file__), "..", "data", "zahnaerzte_bilder.json")
-        bilder_json_path = os.path.abspath(bilder_json_path)
-        try:
-            with open(bilder_json_path, "r", encoding="utf-8") as f:
-                bilder_mapping = json.load(f)
-        except Exception:
-            bilder_mapping = {}
-        if alter_name in bilder_mapping:
-            bilder_mapping[neuer_name] = bilder_mapping.pop(alter_name)
-            with open(bilder_json_path, "w", encoding="utf-8") as f:
-                json.dump(bilder_mapping, f, indent=2, ensure_ascii=False)
-        # Termine aktualisieren
-        termine_path = os.path.join(os.path.dirname(__file__), "..", "data", "termine.json")
-        termine_path = os.path.abspath(termine_path)
-        try:
-            with open(termine_path, "r", encoding="utf-8") as f:
-                termine = json.load(f)
-        except Exception:
-            termine = {}
-        # Zahnarzt-Termine (oberste Ebene)
-        if alter_name in termine:
-            termine[neuer_name] = termine.pop(alter_name)
-        # Patiententermine: Arztname in Details ersetzen
-        for arzt_name in list(termine.keys()):
-            for datum, tag_termine in termine[arzt_name].items():
-                for zeit, termin in tag_termine.items():
-                    if termin.get("zahnarzt") == alter_name:
-                        termin["zahnarzt"] = neuer_name
-                    # Fallback: Falls der Name als "arzt" gespeichert ist
-                    if termin.get("arzt") == alter_name:
-                        termin["arzt"] = neuer_name
-        with open(termine_path, "w", encoding="utf-8") as f:
-            json.dump(termine, f, indent=2, ensure_ascii=False)
-        # Patienten-Termine aktualisieren (falls dort gespeichert)
-        # UI sofort aktualisieren 
-        self.main_window.benutzername = neuer_name
-        self.main_window.zahnarzt_data["name"] = neuer_name
-        if hasattr(self.main_window, "update_begruessung_label"):
-            self.main_window.update_begruessung_label()
-        QMessageBox.information(self.main_window, "Erfolg", "Name wurde aktualisiert!")
-        # UI-Refresh: Dashboard neu laden, falls offen
-        if hasattr(self.main_window, "show_zahnarzt_dashboard"):
-            self.main_window.show_zahnarzt_dashboard()
+
+        def umbenennen():
+            # Läuft im Worker: zuerst der Zahnarzt, dann die Termine, zuletzt das Bild-Mapping.
+            # frueherer_name bleibt stehen, damit termin_store.repariere_umbenennungen nach einem
+            # Absturz zwischen den Schritten die Termine nachholen kann
+            arzt = schreibe_eintrag("zahnaerzte", alter_name,
+                                    lambda z: z.update(name=neuer_name, frueherer_name=alter_name))
+            if not arzt["ok"]:
+                return [arzt], None
+            termine = termin_store.schreibe({"op": "arzt_umbenennen", "alt": alter_name, "neu": neuer_name})
+            if not termine["ok"]:
+                # Der neue Name hat schon Termine zu denselben Zeiten: Zahnarzt zurück
+                def zuruecknehmen(z):
+                    z["name"] = alter_name
+                    z.pop("frueherer_name", None)
+                return [arzt, schreibe_eintrag("zahnaerzte", neuer_name, zuruecknehmen)], termine
+            bild = speicher.lade("bilder").get(alter_name)
+            if bild:
+                speicher.setze_bild(neuer_name, bild, alter_name)
+            return [arzt], termine
+
+        def uebernehmen(ergebnis):
+            aerzte, termine = ergebnis
+            for quittung in aerzte:
+                uebernimm_eintrag(quittung)
+            if termine is None:
+                return GEAENDERT_MELDUNG
+            termin_store.uebernimm_aenderung(termine)
+            if not termine["ok"]:
+                return f"Unter dem Namen '{neuer_name}' sind schon Termine zu denselben Zeiten eingetragen."
+            return None
+
+        def fertig(fehler):
+            if fehler is not None:
+                QMessageBox.warning(self.main_window, "Fehler", fehler)
+                return
+            # UI aktualisieren
+            self.main_window.benutzername = neuer_name
+            self.main_window.zahnarzt_data["name"] = neuer_name
+            if hasattr(self.main_window, "update_begruessung_label"):
+                self.main_window.update_begruessung_label()
+            QMessageBox.information(self.main_window, "Erfolg", "Name wurde aktualisiert!")
+            # UI-Refresh: Dashboard neu laden, falls offen
+            if hasattr(self.main_window, "show_zahnarzt_dashboard"):
+                self.main_window.show_zahnarzt_dashboard()
+
+        daten_dienst().starte(umbenennen, fertig, uebernehmen=uebernehmen)
 
     def update_zahnarzt_kassen(self):
         if not self.main_window.zahnarzt_data:
@@ -428,9 +378,8 @@ class SettingsManager:
             QMessageBox.warning(self.main_window, "Fehler", "Bitte mindestens eine Krankenkasse auswählen.")
             return
             
-        self.main_window.zahnarzt_data["behandelt"] = behandelt
-        speichere_daten(pfad_zahnaerzte, zahnaerzte)
-        QMessageBox.information(self.main_window, "Erfolg", "Krankenkassen wurden aktualisiert!")
+        self._speichern("zahnaerzte", self.main_window.zahnarzt_data,
+                        lambda z: z.update(behandelt=behandelt), "Krankenkassen wurden aktualisiert!")
 
     def update_zahnarzt_zeiten(self):
         if not self.main_window.zahnarzt_data:
@@ -476,9 +425,8 @@ class SettingsManager:
         if not hat_zeiten:
             QMessageBox.warning(self.main_window, "Fehler", "Bitte mindestens einen Tag mit Behandlungszeiten auswählen.")
             return
-        self.main_window.zahnarzt_data["zeiten"] = zeiten
-        speichere_daten(pfad_zahnaerzte, zahnaerzte)
-        QMessageBox.information(self.main_window, "Erfolg", "Behandlungszeiten wurden aktualisiert!")
+        self._speichern("zahnaerzte", self.main_window.zahnarzt_data,
+                        lambda z: z.update(zeiten=zeiten), "Behandlungszeiten wurden aktualisiert!")
 
     def add_zeitslot(self, tag):
         widgets = self.main_window.zeiten_widgets[tag]
@@ -490,13 +438,11 @@ class SettingsManager:
         zeit_container = QFrame()
         zeit_layout = QHBoxLayout(zeit_container)
         von_label = QLabel("Von:")
-        von_label.setStyleSheet("color: #2c3e50;")
         zeit_layout.addWidget(von_label)
         von_zeit = QComboBox()
         von_zeit.addItems([f"{h:02d}:00" for h in range(8, 19)])
         zeit_layout.addWidget(von_zeit)
         bis_label = QLabel("Bis:")
-        bis_label.setStyleSheet("color: #2c3e50;")
         zeit_layout.addWidget(bis_label)
         bis_zeit = QComboBox()
         bis_zeit.addItems([f"{h:02d}:00" for h in range(8, 19)])
@@ -504,18 +450,7 @@ class SettingsManager:
         zeit_layout.addWidget(bis_zeit)
         # Entfernen-Button
         remove_btn = QPushButton("×")
-        remove_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                color: white;
-                border-radius: 10px;
-                padding: 2px 6px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        remove_btn.setProperty("stil", "entfernen")
         remove_btn.clicked.connect(lambda: self.remove_zeitslot(tag, zeit_container))
         zeit_layout.addWidget(remove_btn)
         slots_layout.addWidget(zeit_container)
@@ -538,19 +473,23 @@ class SettingsManager:
         if not neues_passwort:
             QMessageBox.warning(self.main_window, "Fehler", "Bitte geben Sie ein neues Passwort ein.")
             return
+
+        def passwort_setzen():
+            # Hash (PBKDF2) im Worker, aber außerhalb der Sperre berechnen
+            neuer_hash = hash_passwort(neues_passwort)
+            return lambda d: d.update(passwort=neuer_hash)
             
         if self.main_window.rolle == "Patient":
             if not self.main_window.patient_data:
                 return
-            self.main_window.patient_data["passwort"] = neues_passwort
-            speichere_daten(pfad_patienten, patienten)
+            self._speichern("patienten", self.main_window.patient_data, None,
+                            "Passwort wurde aktualisiert!", vorbereiten=passwort_setzen)
         else:  # Zahnarzt
             if not self.main_window.zahnarzt_data:
                 return
-            self.main_window.zahnarzt_data["passwort"] = neues_passwort
-            speichere_daten(pfad_zahnaerzte, zahnaerzte)
+            self._speichern("zahnaerzte", self.main_window.zahnarzt_data, None,
+                            "Passwort wurde aktualisiert!", vorbereiten=passwort_setzen)
             
-        QMessageBox.information(self.main_window, "Erfolg", "Passwort wurde aktualisiert!")
         self.main_window.neues_passwort.clear()
 
     def update_krankenkasse(self):
@@ -558,16 +497,15 @@ class SettingsManager:
             return
             
         neue_kasse = self.main_window.kasse_box.currentText()
-        self.main_window.patient_data["krankenkasse"] = neue_kasse
-        speichere_daten(pfad_patienten, patienten)
-        QMessageBox.information(self.main_window, "Erfolg", "Krankenkasse wurde aktualisiert!")
-        self.main_window.show_meine_daten()  # Aktualisiere die Analyse-Ansicht
+        self._speichern("patienten", self.main_window.patient_data,
+                        lambda p: p.update(krankenkasse=neue_kasse), "Krankenkasse wurde aktualisiert!",
+                        self.main_window.show_meine_daten)  # Aktualisiere die Analyse-Ansicht
 
     def add_problem(self):
         if not self.main_window.patient_data:
             return
             
-        problem = self.main_window.problem_box.currentText()
+        problem = self.main_window.neues_problem_box.currentText()
         try:
             anzahl = int(self.main_window.problem_anzahl.text().strip())
             if anzahl <= 0:
@@ -581,15 +519,12 @@ class SettingsManager:
             "anzahl": anzahl,
             "material": "normal"
         }
-        # Prüfe ob Problem bereits existiert
-        problem_existiert = False
-        for p in self.main_window.patient_data["probleme"]:
-            if p["art"] == problem:
-                p["anzahl"] += anzahl
-                problem_existiert = True
-                break
-        if not problem_existiert:
-            self.main_window.patient_data["probleme"].append(neues_problem)
-        speichere_daten(pfad_patienten, patienten)
-        QMessageBox.information(self.main_window, "Erfolg", "Behandlung hinzugefügt!")
-        self.main_window.show_meine_daten() 
\ No newline at end of file
+        def problem_hinzufuegen(patient):
+            # Prüfe ob Problem bereits existiert
+            for p in patient["probleme"]:
+                if p["art"] == problem:
+                    p["anzahl"] += anzahl
+                    return
+            patient["probleme"].append(neues_problem)
+        self._speichern("patienten", self.main_window.patient_data, problem_hinzufuegen,
+                        "Behandlung hinzugefügt!", self.main_window.show_meine_daten)
@@ -0,0 +1,208 @@
+from datetime import date
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
+from PyQt5.QtWidgets import QAbstractItemView, QListView, QStyledItemDelegate
+
+from components.verfuegbarkeit import WOCHENTAGE
+
+# Zeilenhöhen (Datumskopf inkl. Abstand zur vorigen Gruppe, Termin) und Absage-Button
+KOPF_HOEHE = 48
+TERMIN_HOEHE = 86
+GRUPPEN_ABSTAND = 10
+BUTTON_BREITE = 140
+BUTTON_HOEHE = 30
+
+ArtRolle = Qt.UserRole
+TerminRolle = Qt.UserRole + 1
+LetzterRolle = Qt.UserRole + 2
+
+KOPF = "kopf"
+TERMIN = "termin"
+
+
+def datum_text(datum):
+    """'yyyy-MM-dd' -> 'Montag, 05.01.2099'"""
+    tag = date.fromisoformat(datum)
+    return f"{WOCHENTAGE[tag.weekday()]}, {tag.strftime('%d.%m.%Y')}"
+
+
+class TerminListenModell(QAbstractListModel):
+    """Termine eines Patienten als flache Liste: je Datum ein Kopf, darunter die Termine"""
+
+    def __init__(self, termine, parent=None):
+        super().__init__(parent)
+        # (art, datum_oder_termin, letzter_termin_des_tages)
+        self.zeilen = []
+        for termin in termine:
+            if not self.zeilen or self.zeilen[-1][1]["datum"] != termin["datum"]:
+                self.zeilen.append((KOPF, termin, False))
+            self.zeilen.append((TERMIN, termin, False))
+        for i, (art, termin, _) in enumerate(self.zeilen):
+            if art == TERMIN and (i + 1 == len(self.zeilen) or self.zeilen[i + 1][0] == KOPF):
+                self.zeilen[i] = (art, termin, True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.zeilen)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        art, termin, letzter = self.zeilen[index.row()]
+        if role == Qt.DisplayRole:
+            if art == KOPF:
+                return datum_text(termin["datum"])
+            return f"{termin['zeit']} Uhr – {termin['behandlung']} – {termin['arzt']}"
+        if role == ArtRolle:
+            return art
+        if role == TerminRolle:
+            return termin
+        if role == LetzterRolle:
+            return letzter
+        return None
+
+    def flags(self, index):
+        # Zeilen sind nicht auswählbar, nur der Absage-Button reagiert
+        return Qt.ItemIsEnabled if index.isValid() else Qt.NoItemFlags
+
+
+class TerminListenDelegate(QStyledItemDelegate):
+    """Zeichnet Datumsköpfe und Terminkarten; Klick auf "Termin absagen" meldet absagen"""
+
+    absagen = pyqtSignal(str, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._button_zeile = None
+
+    def sizeHint(self, option, index):
+        hoehe = KOPF_HOEHE if index.data(ArtRolle) == KOPF else TERMIN_HOEHE
+        if index.row() == 0:
+            hoehe -= GRUPPEN_ABSTAND
+        return QSize(option.rect.width(), hoehe)
+
+    @staticmethod
+    def _karte(rect):
+        return QRectF(rect).adjusted(12, 4, -12, -6)
+
+    def _button(self, rect):
+        karte = self._karte(rect)
+        return QRectF(karte.right() - 14 - BUTTON_BREITE, karte.center().y() - BUTTON_HOEHE / 2,
+                      BUTTON_BREITE, BUTTON_HOEHE)
+
+    @staticmethod
+    def _schrift(basis, pixel=None, fett=False):
+        schrift = QFont(basis)
+        if pixel:
+            schrift.setPixelSize(pixel)
+        schrift.setBold(fett)
+        return schrift
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        art = index.data(ArtRolle)
+        termin = index.data(TerminRolle)
+        rect = QRectF(option.rect)
+
+        # Hintergrund der Tagesgruppe: oben am Kopf und unten am letzten Termin abgerundet
+        gruppe = QRectF(rect)
+        if art == KOPF and index.row() > 0:
+            gruppe.setTop(gruppe.top() + GRUPPEN_ABSTAND)
+        painter.setClipRect(gruppe)
+        pfad = QPainterPath()
+        oben = art == KOPF
+        unten = art == TERMIN and index.data(LetzterRolle)
+        pfad.addRoundedRect(gruppe.adjusted(0, 0 if oben else -10, 0, 0 if unten else 10), 5, 5)
+        painter.fillPath(pfad, QColor("#f8f9fa"))
+        painter.setClipping(False)
+
+        if art == KOPF:
+            painter.setFont(self._schrift(option.font, 14, True))
+            painter.setPen(QColor("#2c3e50"))
+            painter.drawText(gruppe.adjusted(14, 0, -14, 0), Qt.AlignLeft | Qt.AlignVCenter,
+                             datum_text(termin["datum"]))
+            painter.restore()
+            return
+
+        # Karte
+        karte = self._karte(option.rect)
+        painter.setPen(QPen(QColor("#e0e0e0"), 1))
+        painter.setBrush(Qt.white)
+        painter.drawRoundedRect(karte, 5, 5)
+
+        # Links Uhrzeit und Dauer, rechts davon Behandlung, Anzahl und Arzt
+        links = QRectF(karte.left() + 14, karte.top() + 8, 90, karte.height() - 16)
+        painter.setPen(QColor("#2c3e50"))
+        painter.setFont(self._schrift(option.font, fett=True))
+        painter.drawText(links, Qt.AlignLeft | Qt.AlignTop, f"{termin['zeit']} Uhr")
+        painter.setPen(QColor("#7f8c8d"))
+        painter.setFont(self._schrift(option.font, 15))
+        painter.drawText(links, Qt.AlignLeft | Qt.AlignBottom, f"{termin['dauer']} Min.")
+
+        painter.setPen(QColor("#e0e0e0"))
+        linie_x = links.right() + 8
+        painter.drawLine(int(linie_x), int(karte.top() + 8), int(linie_x), int(karte.bottom() - 8))
+
+        button = self._button(option.rect)
+        info = QRectF(linie_x + 14, karte.top() + 6, button.left() - linie_x - 28, karte.height() - 12)
+        drittel = info.height() / 3
+        painter.setPen(QColor("#2c3e50"))
+        painter.setFont(self._schrift(option.font, fett=True))
+        painter.drawText(QRectF(info.left(), info.top(), info.width(), drittel),
+                         Qt.AlignLeft | Qt.AlignVCenter, termin["behandlung"])
+        painter.setPen(QColor("#7f8c8d"))
+        painter.setFont(self._schrift(option.font, 13))
+        painter.drawText(QRectF(info.left(), info.top() + drittel, info.width(), drittel),
+                         Qt.AlignLeft | Qt.AlignVCenter, f"Anzahl Zähne: {termin.get('anzahl')}")
+        painter.setPen(QColor("#34495e"))
+        painter.setFont(self._schrift(option.font, 15))
+        painter.drawText(QRectF(info.left(), info.top() + 2 * drittel, info.width(), drittel),
+                         Qt.AlignLeft | Qt.AlignVCenter, termin["arzt"])
+
+        # Absage-Button
+        hover = self._button_zeile == index.row()
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#c0392b" if hover else "#e74c3c"))
+        painter.drawRoundedRect(button, 5, 5)
+        painter.setPen(Qt.white)
+        painter.setFont(self._schrift(option.font, fett=True))
+        painter.drawText(button, Qt.AlignCenter, "Termin absagen")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        auf_button = index.data(ArtRolle) == TERMIN \
+            and event.type() in (QEvent.MouseMove, QEvent.MouseButtonRelease) \
+            and self._button(option.rect).contains(event.pos())
+        if event.type() == QEvent.MouseMove:
+            self._hover_setzen(index.row() if auf_button else None)
+        elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and auf_button:
+            termin = index.data(TerminRolle)
+            self.absagen.emit(termin["arzt"], termin["datum"], termin["zeit"])
+            return True
+        return False
+
+    def _hover_setzen(self, zeile):
+        if zeile == self._button_zeile:
+            return
+        self._button_zeile = zeile
+        ansicht = self.parent()
+        ansicht.viewport().setCursor(Qt.PointingHandCursor if zeile is not None else Qt.ArrowCursor)
+        ansicht.viewport().update()
+
+
+class TerminListe(QListView):
+    """Terminliste ohne eigene Widgets je Termin"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("termin_liste")
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.setItemDelegate(TerminListenDelegate(self))
+
+    def leaveEvent(self, event):
+        self.itemDelegate()._hover_setzen(None)
+        super().leaveEvent(event)
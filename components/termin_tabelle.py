@@ -0,0 +1,90 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+SPALTEN = ["Uhrzeit", "Patient", "Behandlung", "Material", "Anzahl", "Dauer"]
+
+
+def zelle(zeit, termin, spalte):
+    """Text einer Zelle der Tagestabelle"""
+    if spalte == 0:
+        return zeit
+    if spalte == 1:
+        return str(termin["patient"])
+    if spalte == 2:
+        return str(termin["behandlung"])
+    if spalte == 3:
+        return str(termin.get("material", "normal"))
+    if spalte == 4:
+        anzahl = termin.get("anzahl")
+        return f"{anzahl} Zähne" if isinstance(anzahl, int) else "N/A"
+    return f"{termin['dauer']} Min."
+
+
+class TagesTerminModell(QAbstractTableModel):
+    """Termine eines Zahnarztes an einem Tag, direkt aus dem TerminStore.
+
+    zeige_tag wechselt den Tag, Buchungen und Stornierungen kommen über die
+    Beobachter des TerminStore. In beiden Fällen wird nach Uhrzeit
+    abgeglichen: nur Zeilen, die wegfallen, dazukommen oder sich ändern,
+    werden gemeldet (rowsRemoved, rowsInserted, dataChanged).
+    """
+
+    def __init__(self, store, arzt, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.arzt = arzt
+        self.datum = None
+        # Sortierte Uhrzeiten der Zeilen und zeit -> Termin (Termine aus dem Store, nicht verändern)
+        self.zeiten = []
+        self.termine = {}
+        rueckruf = self._termin_geaendert
+        store.beobachten(rueckruf)
+        self.destroyed.connect(lambda: store.abbestellen(rueckruf))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.zeiten)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(SPALTEN)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        zeit = self.zeiten[index.row()]
+        return zelle(zeit, self.termine[zeit], index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return SPALTEN[section]
+        return super().headerData(section, orientation, role)
+
+    def zeige_tag(self, datum):
+        """Wechselt auf den Tag datum ('yyyy-MM-dd')"""
+        self.datum = datum
+        self._abgleichen()
+
+    def _termin_geaendert(self, arzt, datum):
+        if self.datum is not None and (arzt is None or (arzt == self.arzt and datum == self.datum)):
+            self._abgleichen()
+
+    def _abgleichen(self):
+        neu = self.store.tag_termine(self.arzt, self.datum)
+        # Weggefallene Uhrzeiten von hinten entfernen, damit die Zeilennummern stimmen
+        for zeile in range(len(self.zeiten) - 1, -1, -1):
+            zeit = self.zeiten[zeile]
+            if zeit not in neu:
+                self.beginRemoveRows(QModelIndex(), zeile, zeile)
+                del self.zeiten[zeile]
+                del self.termine[zeit]
+                self.endRemoveRows()
+        # Neue Uhrzeiten an ihrer sortierten Stelle einfügen, geänderte Termine melden
+        for zeile, zeit in enumerate(sorted(neu)):
+            termin = neu[zeit]
+            if zeile < len(self.zeiten) and self.zeiten[zeile] == zeit:
+                if self.termine[zeit] != termin:
+                    self.termine[zeit] = termin
+                    self.dataChanged.emit(self.index(zeile, 0), self.index(zeile, len(SPALTEN) - 1))
+                continue
+            self.beginInsertRows(QModelIndex(), zeile, zeile)
+            self.zeiten.insert(zeile, zeit)
+            self.termine[zeit] = termin
+            self.endInsertRows()
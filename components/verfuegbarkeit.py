@@ -0,0 +1,217 @@
+from datetime import timedelta
+from functools import lru_cache
+
+from gui.termin_store import termin_store
+
+# Abstand der angebotenen Startzeiten in Minuten
+RASTER = 30
+
+WOCHENTAGE_KURZ = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+WOCHENTAGE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+
+# Zustand eines Rasters in belegung()
+SLOT_ARBEITSFREI = 0
+SLOT_FREI = 1
+SLOT_TEILWEISE = 2
+SLOT_BELEGT = 3
+
+
+def zeit_zu_minuten(zeit):
+    """'HH:MM' -> Minuten seit Mitternacht"""
+    stunden, minuten = zeit.split(":")
+    return int(stunden) * 60 + int(minuten)
+
+
+def minuten_zu_zeit(minuten):
+    """Minuten seit Mitternacht -> 'HH:MM'"""
+    return f"{minuten // 60:02d}:{minuten % 60:02d}"
+
+
+def _bits(start, ende):
+    """Bitmaske mit gesetzten Bits für die Minuten start..ende-1"""
+    if ende <= start:
+        return 0
+    return ((1 << (ende - start)) - 1) << start
+
+
+@lru_cache(maxsize=256)
+def _arbeitszeit_maske(zeitfenster):
+    maske = 0
+    for fenster in zeitfenster:
+        start, ende = fenster.split("-")
+        maske |= _bits(zeit_zu_minuten(start), zeit_zu_minuten(ende))
+    return maske
+
+
+def arbeitszeit_maske(zeitfenster):
+    """Bitset der Arbeitsminuten eines Tages aus ['08:00-12:00', ...]"""
+    return _arbeitszeit_maske(tuple(zeitfenster))
+
+
+def arbeitsminuten(zeitfenster):
+    """Anzahl der Arbeitsminuten eines Tages"""
+    return bin(arbeitszeit_maske(zeitfenster)).count("1")
+
+
+def belegt_maske(tag_termine):
+    """Bitset der Minuten, die durch gebuchte Termine belegt sind"""
+    maske = 0
+    for zeit, termin in tag_termine.items():
+        start = zeit_zu_minuten(zeit)
+        maske |= _bits(start, start + termin["dauer"])
+    return maske
+
+
+@lru_cache(maxsize=1024)
+def _startkandidaten(zeitfenster, dauer, raster):
+    kandidaten = []
+    for fenster in zeitfenster:
+        start, ende = fenster.split("-")
+        ende_min = zeit_zu_minuten(ende)
+        minute = zeit_zu_minuten(start)
+        while minute + dauer <= ende_min:
+            kandidaten.append(minute)
+            minute += raster
+    return tuple(kandidaten)
+
+
+def freie_startzeiten(zeitfenster, tag_termine, dauer, raster=RASTER):
+    """Alle Startzeiten ('HH:MM'), an denen ein Termin der Länge dauer frei ist.
+
+    Startzeiten liegen im Raster ab Beginn jedes Zeitfensters. Bestehende
+    Termine blockieren minutengenau, auch wenn sie außerhalb des Rasters liegen.
+    """
+    frei = arbeitszeit_maske(zeitfenster) & ~belegt_maske(tag_termine)
+    block = (1 << dauer) - 1
+    return [
+        minuten_zu_zeit(minute)
+        for minute in _startkandidaten(tuple(zeitfenster), dauer, raster)
+        if (frei >> minute) & block == block
+    ]
+
+
+class VerfuegbarkeitsIndex:
+    """Vorberechnete Belegungsmasken je (Arzt, Datum) auf Basis des TerminStore.
+
+    Über die Beobachter des TerminStore wird nur der geänderte Tag
+    verworfen; nach einem Neuladen oder einer Umbenennung alles.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._belegt = {}
+        # (arzt, datum) -> {(zeitfenster, von, bis, raster): Zustände je Raster}
+        self._slots = {}
+        store.beobachten(self._termin_geaendert)
+
+    def _termin_geaendert(self, arzt, datum):
+        if arzt is None:
+            self._belegt = {}
+            self._slots = {}
+        else:
+            self._belegt.pop((arzt, datum), None)
+            self._slots.pop((arzt, datum), None)
+
+    def _synchronisieren(self):
+        self.store.aktualisieren()
+
+    def _maske(self, arzt, datum, tag_termine):
+        maske = self._belegt.get((arzt, datum))
+        if maske is None:
+            maske = belegt_maske(tag_termine)
+            self._belegt[(arzt, datum)] = maske
+        return maske
+
+    def belegt(self, arzt, datum):
+        """Bitset der belegten Minuten eines Arztes an einem Tag"""
+        self._synchronisieren()
+        return self._maske(arzt, datum, self.store.tag_termine(arzt, datum))
+
+    def belegung(self, aerzte, tage, von, bis, raster=RASTER):
+        """Zustand jedes Rasters von..bis (Minuten) für mehrere Ärzte und Tage.
+
+        aerzte: Zahnarzt-Dicts (mit "name" und "zeiten"), tage: datetime.date
+        Gibt je Arzt eine Liste mit bytes je Tag zurück, ein Byte je Raster
+        (SLOT_ARBEITSFREI, SLOT_FREI, SLOT_TEILWEISE, SLOT_BELEGT). Fertige
+        Tage bleiben gespeichert, bis sich ihre Termine ändern.
+        """
+        self._synchronisieren()
+        block = (1 << raster) - 1
+        ergebnis = []
+        for arzt in aerzte:
+            name = arzt["name"]
+            arzt_termine = None
+            zeilen = []
+            for tag in tage:
+                datum_str = tag.isoformat()
+                zeitfenster = tuple(arzt["zeiten"].get(WOCHENTAGE_KURZ[tag.weekday()], ()))
+                schluessel = (zeitfenster, von, bis, raster)
+                tag_slots = self._slots.setdefault((name, datum_str), {})
+                zustaende = tag_slots.get(schluessel)
+                if zustaende is None:
+                    if arzt_termine is None:
+                        arzt_termine = self.store.arzt_termine(name)
+                    tag_termine = arzt_termine.get(datum_str)
+                    belegt = self._maske(name, datum_str, tag_termine) if tag_termine else 0
+                    arbeit = _arbeitszeit_maske(zeitfenster)
+                    zustaende = bytearray()
+                    for minute in range(von, bis, raster):
+                        b = (belegt >> minute) & block
+                        if b == block:
+                            zustaende.append(SLOT_BELEGT)
+                        elif b:
+                            zustaende.append(SLOT_TEILWEISE)
+                        elif (arbeit >> minute) & block:
+                            zustaende.append(SLOT_FREI)
+                        else:
+                            zustaende.append(SLOT_ARBEITSFREI)
+                    zustaende = bytes(zustaende)
+                    tag_slots[schluessel] = zustaende
+                zeilen.append(zustaende)
+            ergebnis.append(zeilen)
+        return ergebnis
+
+    def suche_freie_termine(self, aerzte, dauer, ab, tage, anzahl, raster=RASTER):
+        """Die frühesten freien Termine über mehrere Ärzte und Tage.
+
+        aerzte: Zahnarzt-Dicts (mit "name" und "zeiten")
+        ab: datetime, ab dem gesucht wird (frühere Startzeiten am ersten Tag entfallen)
+        Gibt bis zu anzahl Tupel (datum 'yyyy-MM-dd', zeit 'HH:MM', arzt) zurück.
+        """
+        self._synchronisieren()
+        termine_je_arzt = {arzt["name"]: self.store.arzt_termine(arzt["name"]) for arzt in aerzte}
+        ergebnis = []
+        block = (1 << dauer) - 1
+        for tag in range(tage):
+            datum = ab.date() + timedelta(days=tag)
+            datum_str = datum.isoformat()
+            wochentag = WOCHENTAGE_KURZ[datum.weekday()]
+            ab_minute = ab.hour * 60 + ab.minute if tag == 0 else 0
+            tag_treffer = []
+            for arzt in aerzte:
+                zeitfenster = arzt["zeiten"].get(wochentag)
+                if not zeitfenster:
+                    continue
+                zeitfenster = tuple(zeitfenster)
+                kandidaten = _startkandidaten(zeitfenster, dauer, raster)
+                if not kandidaten:
+                    continue
+                tag_termine = termine_je_arzt[arzt["name"]].get(datum_str)
+                belegt = self._maske(arzt["name"], datum_str, tag_termine) if tag_termine else 0
+                frei = _arbeitszeit_maske(zeitfenster) & ~belegt
+                for minute in kandidaten:
+                    if minute < ab_minute:
+                        continue
+                    if not belegt or (frei >> minute) & block == block:
+                        tag_treffer.append((minute, arzt["name"], arzt))
+            # Alle Treffer eines Tages liegen vor denen des nächsten Tages
+            tag_treffer.sort(key=lambda t: (t[0], t[1]))
+            for minute, _, arzt in tag_treffer:
+                ergebnis.append((datum_str, minuten_zu_zeit(minute), arzt))
+                if len(ergebnis) >= anzahl:
+                    return ergebnis
+        return ergebnis
+
+
+# Gemeinsamer Index für die ganze App
+verfuegbarkeits_index = VerfuegbarkeitsIndex(termin_store)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QObject, QRect, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+
+# Vorskalierte Bilder auf der Platte (je Quelldatei und Änderungszeit)
+CACHE_ORDNER = os.path.join("cache", "vorschau")
+# So viele fertige QPixmaps bleiben im Speicher
+MAX_PIXMAPS = 200
+
+
+def datei_stand(quelle):
+    """(mtime_ns, Größe) der Quelldatei oder None, falls sie fehlt"""
+    try:
+        st = os.stat(quelle)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _cache_pfad(quelle, groesse, ordner):
+    st = os.stat(quelle)
+    schluessel = f"{os.path.abspath(quelle)}|{st.st_mtime_ns}|{st.st_size}|{groesse}"
+    return os.path.join(ordner, hashlib.sha1(schluessel.encode("utf-8")).hexdigest() + ".png")
+
+
+def lade_vorschau(quelle, groesse, ordner=CACHE_ORDNER):
+    """Quadratisches, mittig zugeschnittenes Vorschaubild als QImage (threadsicher).
+
+    Liegt schon ein vorskaliertes Bild im Cache-Ordner, wird nur dieses
+    gelesen; sonst dekodiert QImageReader die Quelle direkt in Zielgröße.
+    """
+    try:
+        cache_pfad = _cache_pfad(quelle, groesse, ordner)
+    except OSError:
+        return QImage()
+    bild = QImageReader(cache_pfad).read() if os.path.exists(cache_pfad) else QImage()
+    if not bild.isNull():
+        return bild
+    leser = QImageReader(quelle)
+    leser.setAutoTransform(True)
+    original = leser.size()
+    if original.isValid():
+        # Wie KeepAspectRatioByExpanding, danach die Mitte ausschneiden
+        skaliert = original.scaled(groesse, groesse, Qt.KeepAspectRatioByExpanding)
+        leser.setScaledSize(skaliert)
+        leser.setScaledClipRect(QRect(
+            (skaliert.width() - groesse) // 2, (skaliert.height() - groesse) // 2, groesse, groesse
+        ))
+    bild = leser.read()
+    if bild.isNull():
+        return bild
+    os.makedirs(ordner, exist_ok=True)
+    # Erst unter temporärem Namen speichern, damit nie halbe Dateien gelesen werden
+    tmp_pfad = f"{cache_pfad}.{os.getpid()}.tmp"
+    if bild.save(tmp_pfad, "PNG"):
+        os.replace(tmp_pfad, cache_pfad)
+    return bild
+
+
+class _Signale(QObject):
+    geladen = pyqtSignal(str, QImage, object)
+
+
+class _LadeAuftrag(QRunnable):
+    def __init__(self, quelle, groesse, ordner, signale):
+        super().__init__()
+        self.quelle = quelle
+        self.groesse = groesse
+        self.ordner = ordner
+        self.signale = signale
+
+    def run(self):
+        # Stand vor dem Lesen: ändert sich die Datei währenddessen, wird ein Fehler nicht festgehalten
+        stand = datei_stand(self.quelle)
+        self.signale.geladen.emit(self.quelle, lade_vorschau(self.quelle, self.groesse, self.ordner), stand)
+
+
+class VorschauCache(QObject):
+    """Vorschaubilder, die im Hintergrund geladen und im Speicher gehalten werden.
+
+    pixmap(quelle) liefert sofort ein fertiges Bild oder None; im zweiten Fall
+    wird es in einem Worker-Thread geladen und danach fertig(quelle, pixmap)
+    gesendet. Lässt sich eine Datei nicht lesen, ist pixmap dabei leer und
+    fehlgeschlagen(quelle) True; erneut geladen wird erst, wenn sich die
+    Datei ändert.
+    """
+
+    fertig = pyqtSignal(str, QPixmap)
+
+    def __init__(self, groesse, ordner=CACHE_ORDNER, max_pixmaps=MAX_PIXMAPS):
+        super().__init__()
+        self.groesse = groesse
+        self.ordner = ordner
+        self.max_pixmaps = max_pixmaps
+        self._pixmaps = OrderedDict()
+        self._laufend = set()
+        # quelle -> datei_stand, bei dem das Laden fehlgeschlagen ist
+        self._fehler = {}
+        self._signale = _Signale()
+        self._signale.geladen.connect(self._geladen)
+
+    def pixmap(self, quelle):
+        pixmap = self._pixmaps.get(quelle)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(quelle)
+            return pixmap
+        if quelle in self._fehler:
+            if self._fehler[quelle] == datei_stand(quelle):
+                return None
+            del self._fehler[quelle]
+        if quelle not in self._laufend:
+            self._laufend.add(quelle)
+            QThreadPool.globalInstance().start(_LadeAuftrag(quelle, self.groesse, self.ordner, self._signale))
+        return None
+
+    def fehlgeschlagen(self, quelle):
+        """True, wenn sich die Datei in ihrem aktuellen Stand nicht lesen ließ"""
+        return quelle in self._fehler
+
+    def _geladen(self, quelle, bild, stand):
+        # Läuft im GUI-Thread: erst hier darf eine QPixmap entstehen
+        self._laufend.discard(quelle)
+        if bild.isNull():
+            self._fehler[quelle] = stand
+            self.fertig.emit(quelle, QPixmap())
+            return
+        pixmap = QPixmap.fromImage(bild)
+        self._pixmaps[quelle] = pixmap
+        while len(self._pixmaps) > self.max_pixmaps:
+            self._pixmaps.popitem(last=False)
+        self.fertig.emit(quelle, pixmap)
+
+
+_caches = {}
+
+
+def vorschau_cache(groesse):
+    """Gemeinsamer Cache je Bildgröße (erst bei Bedarf anlegen, QApplication muss laufen)"""
+    if groesse not in _caches:
+        _caches[groesse] = VorschauCache(groesse)
+    return _caches[groesse]
@@ -0,0 +1,195 @@
+from datetime import timedelta
+
+from PyQt5.QtCore import Qt, QEvent, QRect
+from PyQt5.QtGui import QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QAbstractScrollArea, QToolTip
+
+from gui.termin_store import termin_store
+from components.kalender_status import FARBEN, FREI, ARBEITSFREI, AUSLASTUNG
+from components.verfuegbarkeit import (
+    WOCHENTAGE_KURZ, RASTER, SLOT_ARBEITSFREI, SLOT_FREI, SLOT_TEILWEISE, SLOT_BELEGT,
+    verfuegbarkeits_index, zeit_zu_minuten, minuten_zu_zeit
+)
+
+# Maße des Rasters: Namensspalte, Kopfzeilen (Tag, Stunden), eine Zeile je Arzt, ein Raster
+NAMEN_BREITE = 160
+KOPF_HOEHE = 44
+ZEILEN_HOEHE = 26
+SLOT_BREITE = 12
+TAGE = 7
+
+# Farben wie im Kalender: frei grün, arbeitsfrei grau, teilweise gelb, belegt rot
+SLOT_FARBEN = {
+    SLOT_ARBEITSFREI: QColor(FARBEN[ARBEITSFREI]),
+    SLOT_FREI: QColor(FARBEN[FREI]),
+    SLOT_TEILWEISE: QColor(FARBEN[AUSLASTUNG[1]]),
+    SLOT_BELEGT: QColor(FARBEN[AUSLASTUNG[3]]),
+}
+
+
+def zeitspanne(aerzte):
+    """Früheste Anfangs- und späteste Endzeit aller Ärzte in Minuten, auf volle Stunden gerundet"""
+    von, bis = 24 * 60, 0
+    for arzt in aerzte:
+        for zeitfenster in arzt["zeiten"].values():
+            for fenster in zeitfenster:
+                start, ende = fenster.split("-")
+                von = min(von, zeit_zu_minuten(start))
+                bis = max(bis, zeit_zu_minuten(ende))
+    if bis <= von:
+        return 8 * 60, 18 * 60
+    return von // 60 * 60, -(-bis // 60) * 60
+
+
+class WochenAgenda(QAbstractScrollArea):
+    """Wochenplan aller Zahnärzte: eine Zeile je Arzt, je Tag die Raster der Arbeitszeit.
+
+    Gezeichnet werden nur die sichtbaren Zeilen und Tage; die Zustände der
+    Raster kommen aus dem VerfuegbarkeitsIndex. Namensspalte und Kopfzeilen
+    bleiben beim Scrollen stehen. Buchungen der angezeigten Woche lösen über
+    die Beobachter des TerminStore ein Neuzeichnen aus.
+    """
+
+    def __init__(self, aerzte, montag, parent=None):
+        super().__init__(parent)
+        self.setObjectName("wochen_agenda")
+        self.aerzte = aerzte
+        self.von, self.bis = zeitspanne(aerzte)
+        self.slots = (self.bis - self.von) // RASTER
+        self.setze_woche(montag)
+        self.viewport().setMouseTracking(True)
+        rueckruf = self._termin_geaendert
+        termin_store.beobachten(rueckruf)
+        self.destroyed.connect(lambda: termin_store.abbestellen(rueckruf))
+
+    def setze_woche(self, montag):
+        self.montag = montag
+        self.tage = [montag + timedelta(days=i) for i in range(TAGE)]
+        self._datumsliste = {tag.isoformat() for tag in self.tage}
+        self._scrollbereich()
+        self.viewport().update()
+
+    def _termin_geaendert(self, arzt, datum):
+        if arzt is None or datum in self._datumsliste:
+            self.viewport().update()
+
+    def _tag_breite(self):
+        return self.slots * SLOT_BREITE
+
+    def _scrollbereich(self):
+        breite = TAGE * self._tag_breite()
+        hoehe = len(self.aerzte) * ZEILEN_HOEHE
+        sichtbar = self.viewport().size()
+        self.horizontalScrollBar().setRange(0, max(0, breite - (sichtbar.width() - NAMEN_BREITE)))
+        self.horizontalScrollBar().setPageStep(sichtbar.width() - NAMEN_BREITE)
+        self.horizontalScrollBar().setSingleStep(SLOT_BREITE * 2)
+        self.verticalScrollBar().setRange(0, max(0, hoehe - (sichtbar.height() - KOPF_HOEHE)))
+        self.verticalScrollBar().setPageStep(sichtbar.height() - KOPF_HOEHE)
+        self.verticalScrollBar().setSingleStep(ZEILEN_HOEHE)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._scrollbereich()
+
+    def _sichtbar(self):
+        """Bereich der sichtbaren Arztzeilen und Tage"""
+        dx, dy = self.horizontalScrollBar().value(), self.verticalScrollBar().value()
+        breite = self.viewport().width() - NAMEN_BREITE
+        hoehe = self.viewport().height() - KOPF_HOEHE
+        erste_zeile = dy // ZEILEN_HOEHE
+        letzte_zeile = min(len(self.aerzte), (dy + hoehe) // ZEILEN_HOEHE + 1)
+        erster_tag = dx // self._tag_breite()
+        letzter_tag = min(TAGE, (dx + breite) // self._tag_breite() + 1)
+        return dx, dy, range(erste_zeile, letzte_zeile), range(erster_tag, letzter_tag)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        dx, dy, zeilen, tage = self._sichtbar()
+        breite = self.viewport().width()
+        tag_breite = self._tag_breite()
+        belegung = verfuegbarkeits_index.belegung(
+            [self.aerzte[z] for z in zeilen], [self.tage[t] for t in tage], self.von, self.bis
+        )
+
+        # Raster: ein Rechteck je Slot, Linien zwischen den Tagen
+        painter.setClipRect(NAMEN_BREITE, KOPF_HOEHE, breite - NAMEN_BREITE, self.viewport().height())
+        for i, zeile in enumerate(zeilen):
+            y = KOPF_HOEHE + zeile * ZEILEN_HOEHE - dy
+            for j, tag in enumerate(tage):
+                x0 = NAMEN_BREITE + tag * tag_breite - dx
+                for slot, zustand in enumerate(belegung[i][j]):
+                    painter.fillRect(x0 + slot * SLOT_BREITE, y + 1, SLOT_BREITE - 1, ZEILEN_HOEHE - 2,
+                                     SLOT_FARBEN[zustand])
+        painter.setPen(QPen(QColor("#7f8c8d"), 1))
+        for tag in tage:
+            x = NAMEN_BREITE + tag * tag_breite - dx
+            painter.drawLine(x - 1, KOPF_HOEHE, x - 1, self.viewport().height())
+
+        # Kopf: Wochentag mit Datum, darunter die vollen Stunden
+        painter.setClipRect(NAMEN_BREITE, 0, breite - NAMEN_BREITE, KOPF_HOEHE)
+        painter.fillRect(NAMEN_BREITE, 0, breite - NAMEN_BREITE, KOPF_HOEHE, QColor("#f8f9fa"))
+        schrift = QFont(self.font())
+        schrift.setBold(True)
+        klein = QFont(self.font())
+        klein.setPixelSize(11)
+        for tag in tage:
+            x = NAMEN_BREITE + tag * tag_breite - dx
+            datum = self.tage[tag]
+            painter.setFont(schrift)
+            painter.setPen(QColor("#2c3e50"))
+            painter.drawText(QRect(x, 2, tag_breite, 20), Qt.AlignCenter,
+                             f"{WOCHENTAGE_KURZ[datum.weekday()]} {datum.strftime('%d.%m.')}")
+            painter.setFont(klein)
+            painter.setPen(QColor("#7f8c8d"))
+            for minute in range(self.von, self.bis, 60):
+                sx = x + (minute - self.von) // RASTER * SLOT_BREITE
+                painter.drawText(QRect(sx + 2, 24, 60 // RASTER * SLOT_BREITE, 18),
+                                 Qt.AlignLeft | Qt.AlignVCenter, str(minute // 60))
+        painter.setPen(QColor("#d0d0d0"))
+        painter.drawLine(NAMEN_BREITE, KOPF_HOEHE - 1, breite, KOPF_HOEHE - 1)
+
+        # Namensspalte
+        painter.setClipRect(0, KOPF_HOEHE, NAMEN_BREITE, self.viewport().height())
+        painter.fillRect(0, KOPF_HOEHE, NAMEN_BREITE, self.viewport().height(), QColor("#f8f9fa"))
+        painter.setFont(self.font())
+        painter.setPen(QColor("#2c3e50"))
+        for zeile in zeilen:
+            y = KOPF_HOEHE + zeile * ZEILEN_HOEHE - dy
+            painter.drawText(QRect(8, y, NAMEN_BREITE - 16, ZEILEN_HOEHE), Qt.AlignLeft | Qt.AlignVCenter,
+                             self.aerzte[zeile]["name"])
+        painter.setClipping(False)
+        painter.fillRect(0, 0, NAMEN_BREITE, KOPF_HOEHE, QColor("#f8f9fa"))
+        painter.setPen(QColor("#d0d0d0"))
+        painter.drawLine(0, KOPF_HOEHE - 1, NAMEN_BREITE, KOPF_HOEHE - 1)
+        painter.drawLine(NAMEN_BREITE - 1, 0, NAMEN_BREITE - 1, self.viewport().height())
+        painter.end()
+
+    def _slot_an(self, pos):
+        """(Arzt, Datum, Minute) unter einer Position im Viewport oder None"""
+        if pos.x() < NAMEN_BREITE or pos.y() < KOPF_HOEHE:
+            return None
+        x = pos.x() - NAMEN_BREITE + self.horizontalScrollBar().value()
+        zeile = (pos.y() - KOPF_HOEHE + self.verticalScrollBar().value()) // ZEILEN_HOEHE
+        tag = x // self._tag_breite()
+        if zeile >= len(self.aerzte) or tag >= TAGE:
+            return None
+        minute = self.von + (x % self._tag_breite()) // SLOT_BREITE * RASTER
+        return self.aerzte[zeile], self.tage[tag], minute
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            treffer = self._slot_an(event.pos())
+            if treffer is None:
+                QToolTip.hideText()
+                return True
+            arzt, tag, minute = treffer
+            text = f"{arzt['name']}\n{WOCHENTAGE_KURZ[tag.weekday()]} {tag.strftime('%d.%m.%Y')}, " \
+                   f"{minuten_zu_zeit(minute)}–{minuten_zu_zeit(minute + RASTER)} Uhr"
+            # Termine, die in dieses Raster fallen
+            for zeit, termin in sorted(termin_store.tag_termine(arzt["name"], tag.isoformat()).items()):
+                start = zeit_zu_minuten(zeit)
+                if start < minute + RASTER and start + termin["dauer"] > minute:
+                    text += f"\n{zeit} Uhr: {termin['patient']} ({termin['behandlung']}, {termin['dauer']} Min.)"
+            QToolTip.showText(event.globalPos(), text, self.viewport())
+            return True
+        return super().viewportEvent(event)
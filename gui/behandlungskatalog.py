@@ -0,0 +1,147 @@
+from numbers import Real
+
+
+def pruefe_behandlungen(behandlungen):
+    """Prüft die Liste aus kosten_behandlungen.json; ValueError beim ersten Fehler"""
+    arten = set()
+    for behandlung in behandlungen:
+        art = behandlung.get("art")
+        if not isinstance(art, str) or not art:
+            raise ValueError(f"Behandlung ohne Art: {behandlung!r}")
+        if art in arten:
+            raise ValueError(f"Behandlung doppelt: {art}")
+        arten.add(art)
+        if "einheit" not in behandlung:
+            raise ValueError(f"{art}: keine Einheit")
+        materialien = behandlung.get("materialien")
+        if not isinstance(materialien, dict) or "normal" not in materialien:
+            raise ValueError(f"{art}: Material 'normal' fehlt")
+        for material, mat_info in materialien.items():
+            preis, zeit = mat_info.get("preis"), mat_info.get("zeit")
+            if not isinstance(preis, Real) or isinstance(preis, bool) or preis < 0:
+                raise ValueError(f"{art}/{material}: ungültiger Preis {preis!r}")
+            # Die Dauer blockiert Minuten im Kalender, muss also ganzzahlig sein
+            if not isinstance(zeit, int) or isinstance(zeit, bool) or zeit <= 0:
+                raise ValueError(f"{art}/{material}: ungültige Dauer {zeit!r}")
+            erstattung = mat_info.get("erstattung")
+            if not isinstance(erstattung, dict):
+                raise ValueError(f"{art}/{material}: keine Erstattung")
+            for versicherung, anteil in erstattung.items():
+                if not isinstance(anteil, Real) or isinstance(anteil, bool) or not 0 <= anteil <= 1:
+                    raise ValueError(f"{art}/{material}/{versicherung}: ungültige Erstattung {anteil!r}")
+
+
+class Behandlungskatalog:
+    """Unveränderlicher Katalog der Behandlungen, einmal beim Laden geprüft.
+
+    Preis, Dauer und Erstattung liegen in flachen Tupeln an einem festen
+    Index je (Behandlung, Material[, Versicherung]). Fehlende Materialien
+    tragen schon die Werte von "normal", unbekannte Versicherungen zeigen
+    auf eine letzte Spalte ohne Erstattung. Jeder Zugriff ist damit O(1).
+    Attribute lassen sich nicht neu setzen; die Index-Dicts nicht verändern!
+    """
+
+    __slots__ = ("arten", "materialien", "versicherungen", "art_index", "material_index",
+                 "versicherung_index", "normal", "unbekannt", "breite", "einheiten", "preise", "dauern",
+                 "erstattungen")
+
+    def __init__(self, behandlungen):
+        pruefe_behandlungen(behandlungen)
+        arten = tuple(b["art"] for b in behandlungen)
+        # "normal" gibt es immer, auch in einem leeren Katalog (z.B. Datenbank ohne Migration)
+        materialien = [] if behandlungen else ["normal"]
+        versicherungen = []
+        for behandlung in behandlungen:
+            for material, mat_info in behandlung["materialien"].items():
+                if material not in materialien:
+                    materialien.append(material)
+                for versicherung in mat_info["erstattung"]:
+                    if versicherung not in versicherungen:
+                        versicherungen.append(versicherung)
+        preise, dauern, erstattungen = [], [], []
+        for behandlung in behandlungen:
+            for material in materialien:
+                mat_info = behandlung["materialien"].get(material, behandlung["materialien"]["normal"])
+                preise.append(mat_info["preis"])
+                dauern.append(mat_info["zeit"])
+                erstattungen.extend(mat_info["erstattung"].get(v, 0.0) for v in versicherungen)
+                erstattungen.append(0.0)
+
+        setzen = super().__setattr__
+        setzen("arten", arten)
+        setzen("materialien", tuple(materialien))
+        setzen("versicherungen", tuple(versicherungen))
+        setzen("art_index", {art: i for i, art in enumerate(arten)})
+        setzen("material_index", {m: i for i, m in enumerate(materialien)})
+        setzen("versicherung_index", {v: i for i, v in enumerate(versicherungen)})
+        setzen("normal", materialien.index("normal"))
+        setzen("unbekannt", len(versicherungen))
+        setzen("breite", len(materialien))
+        setzen("einheiten", tuple(b["einheit"] for b in behandlungen))
+        # preise/dauern[art * breite + material], erstattungen[(art * breite + material) * (unbekannt + 1) + v]
+        setzen("preise", tuple(preise))
+        setzen("dauern", tuple(dauern))
+        setzen("erstattungen", tuple(erstattungen))
+
+    def __setattr__(self, name, wert):
+        raise AttributeError("Behandlungskatalog ist unveränderlich")
+
+    def __contains__(self, art):
+        return art in self.art_index
+
+    def __iter__(self):
+        return iter(self.arten)
+
+    def __len__(self):
+        return len(self.arten)
+
+    # Zugriffe nach Namen: KeyError bei unbekannter Behandlung, unbekanntes Material wie "normal"
+    def preis(self, art, material="normal"):
+        return self.preise[self.art_index[art] * self.breite + self.material_index.get(material, self.normal)]
+
+    def dauer(self, art, material="normal"):
+        """Behandlungsdauer je Zahn in Minuten"""
+        return self.dauern[self.art_index[art] * self.breite + self.material_index.get(material, self.normal)]
+
+    def erstattung(self, art, material, versicherung):
+        """Erstattungsanteil 0..1 der Versicherung (0 für unbekannte Versicherungen)"""
+        zelle = self.art_index[art] * self.breite + self.material_index.get(material, self.normal)
+        return self.erstattungen[zelle * (self.unbekannt + 1) + self.versicherung_index.get(versicherung, self.unbekannt)]
+
+    def einheit(self, art):
+        return self.einheiten[self.art_index[art]]
+
+    def werte(self, art, material, versicherung, anzahl):
+        """kosten, zeit, eigenanteil, versicherung_anteil einer Position (Indizes wie in kodiere)"""
+        zelle = art * self.breite + material
+        kosten = self.preise[zelle] * anzahl
+        erstattung = self.erstattungen[zelle * (self.unbekannt + 1) + versicherung]
+        return kosten, self.dauern[zelle] * anzahl, kosten * (1 - erstattung), kosten * erstattung
+
+    def posten(self, art, material, versicherung, anzahl):
+        """kosten, zeit, eigenanteil, versicherung_anteil einer Behandlung (Namen wie im Patienten)"""
+        index = self.art_index.get(art)
+        if index is None:
+            return 0, 0, 0.0, 0.0
+        return self.werte(index, self.material_index.get(material, self.normal),
+                          self.versicherung_index.get(versicherung, self.unbekannt), anzahl)
+
+    def kodiere(self, patienten):
+        """Probleme aller Patienten als Indexspalten (nur bekannte Behandlungen)"""
+        spalten = {"patient": [], "art": [], "material": [], "versicherung": [], "anzahl": [], "material_name": []}
+        art_index, material_index, normal = self.art_index, self.material_index, self.normal
+        for p, patient in enumerate(patienten):
+            versicherung = self.versicherung_index.get(patient["krankenkasse"], self.unbekannt)
+            for problem in patient["probleme"]:
+                art = art_index.get(problem["art"])
+                if art is None:
+                    continue
+                # Füllmaterial berücksichtigen (default: normal)
+                material = problem.get("material", "normal")
+                spalten["patient"].append(p)
+                spalten["art"].append(art)
+                spalten["material"].append(material_index.get(material, normal))
+                spalten["versicherung"].append(versicherung)
+                spalten["anzahl"].append(problem["anzahl"])
+                spalten["material_name"].append(material)
+        return spalten
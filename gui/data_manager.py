@@ -1,4 +1,10 @@
-import json
+import copy
+import os
+import threading
+
+from gui.speicher import DATEN_ORDNER, oeffne_speicher
+from gui.speicher_langsam import LangsamerSpeicher
+from gui.behandlungskatalog import Behandlungskatalog
 
 # Stil-Definition
 STYLE = """
@@ -65,28 +71,301 @@ QFrame[frameShape="4"] { /* Horizontale Linie */
 }
 """
 
-# JSON-Hilfsfunktionen
-def lade_daten(pfad):
-    with open(pfad, "r", encoding="utf-8") as f:
-        daten = json.load(f)
-        # Nur für Patienten- und Zahnarztdateien das Feld setzen
-        if "patienten" in pfad or "zahnaerzte" in pfad:
-            for eintrag in daten:
-                if "passwort_geaendert" not in eintrag:
-                    eintrag["passwort_geaendert"] = False
-        return daten
-
-def speichere_daten(pfad, daten):
-    with open(pfad, "w", encoding="utf-8") as f:
-        json.dump(daten, f, ensure_ascii=False, indent=2)
-
-# Datenpfade
-pfad_patienten = "data/patienten.json"
-pfad_zahnaerzte = "data/zahnaerzte.json"
-pfad_behandlungen = "data/kosten_behandlungen.json"
+# Datenhaltung: "json" (Standard) oder "sqlite" (vorher "python -m gui.migration" ausführen),
+# im Ordner PRAXIS_DATEN (Standard: data)
+speicher = oeffne_speicher(os.environ.get("PRAXIS_SPEICHER", "json"), DATEN_ORDNER)
+# Langsames Netzlaufwerk simulieren: PRAXIS_LANGSAM_MS=800 verzögert jeden Zugriff
+if int(os.environ.get("PRAXIS_LANGSAM_MS", "0")):
+    speicher = LangsamerSpeicher(speicher, int(os.environ["PRAXIS_LANGSAM_MS"]) / 1000)
+
+def _ergaenzen(eintrag):
+    if "passwort_geaendert" not in eintrag:
+        eintrag["passwort_geaendert"] = False
+
+def lade_daten(sammlung):
+    daten = speicher.lade(sammlung)
+    # Nur für Patienten und Zahnärzte das Feld setzen
+    if sammlung in ("patienten", "zahnaerzte"):
+        for eintrag in daten:
+            _ergaenzen(eintrag)
+    return daten
+
+# Stand der Sammlungen, auf dem die Listen im Speicher beruhen
+_signaturen = {}
+# Datensätze je Sammlung nach Name; wird bei jeder Änderung mitgeführt
+_nach_name = {}
+# Höchste vergebene Nummer je Basisname ("Max_3" -> "Max": 3)
+_nummern = {}
+# Änderungszähler je Datensatz (sammlung -> name -> n) für Seiten, die nur einen Datensatz zeigen
+_versionen = {}
+# Lesezugriffe (stand, finde_eintrag, freier_name) gleichen vorher mit der Datenhaltung ab;
+# False, sobald das der DatenWaechter im Hintergrund erledigt
+abgleich_beim_lesen = True
+# Datensätze werden nur im GUI-Thread verändert; schreibe_eintrag kopiert sie im Worker unter dieser Sperre
+_lock = threading.Lock()
+
+def _nummer_merken(sammlung, name):
+    basis, _, nummer = name.rpartition("_")
+    if basis and nummer.isdecimal():
+        nummern = _nummern[sammlung]
+        nummern[basis] = max(nummern.get(basis, 0), int(nummer))
+
+def _indexiere(sammlung, nach_name):
+    _nach_name[sammlung] = nach_name
+    _nummern[sammlung] = {}
+    for name in nach_name:
+        _nummer_merken(sammlung, name)
+
+def _name_merken(sammlung, datensatz):
+    _nach_name[sammlung][datensatz["name"]] = datensatz
+    _nummer_merken(sammlung, datensatz["name"])
+
+def _hochzaehlen(sammlung, name):
+    versionen = _versionen.setdefault(sammlung, {})
+    versionen[name] = versionen.get(name, 0) + 1
+
+def lade_stand(sammlung):
+    """Signatur und Daten einer Sammlung, gemeinsam unter der Sperre gelesen.
+
+    Verändert keinen globalen Zustand und darf deshalb auch in einem
+    Worker-Thread laufen; "behandlungen" wird dabei schon geprüft und als
+    Behandlungskatalog geliefert (ValueError bei ungültiger Datei).
+    """
+    with speicher.sperre(sammlung):
+        signatur = speicher.signatur(sammlung)
+        daten = lade_daten(sammlung)
+    if sammlung == "behandlungen":
+        daten = Behandlungskatalog(daten)
+    return signatur, daten
+
+def lade_synchron(sammlung):
+    """Lädt eine Datensatz-Liste und merkt sich den Stand dafür"""
+    _signaturen[sammlung], daten = lade_stand(sammlung)
+    _indexiere(sammlung, {d["name"]: d for d in daten})
+    return daten
+
+def bekannte_signatur(sammlung):
+    """Signatur des Stands, auf dem die Daten im Speicher beruhen"""
+    return _signaturen.get(sammlung)
+
+def synchronisiere(sammlung, daten):
+    """Übernimmt Änderungen anderer Stationen in die Liste daten.
+
+    Datensätze werden an Ort und Stelle aktualisiert, damit Referenzen
+    (z.B. main_window.patient_data) gültig bleiben.
+    """
+    signatur = speicher.signatur(sammlung)
+    if signatur == _signaturen.get(sammlung):
+        return
+    _einarbeiten(sammlung, daten, lade_daten(sammlung), signatur)
+
+def _einarbeiten(sammlung, daten, frische_daten, signatur):
+    nach_name = {d["name"]: d for d in daten}
+    frische_namen = {frisch["name"] for frisch in frische_daten}
+    with _lock:
+        # An anderen Stationen gelöschte (oder umbenannte) Datensätze entfernen
+        geloescht = [name for name in nach_name if name not in frische_namen]
+        if geloescht:
+            daten[:] = [d for d in daten if d["name"] in frische_namen]
+            for name in geloescht:
+                del nach_name[name]
+                _hochzaehlen(sammlung, name)
+        for frisch in frische_daten:
+            vorhanden = nach_name.get(frisch["name"])
+            if vorhanden is None:
+                daten.append(frisch)
+                nach_name[frisch["name"]] = frisch
+            elif vorhanden != frisch:
+                vorhanden.clear()
+                vorhanden.update(frisch)
+            else:
+                continue
+            _hochzaehlen(sammlung, frisch["name"])
+    _indexiere(sammlung, nach_name)
+    _signaturen[sammlung] = signatur
+
+def _abgleichen(sammlung, daten):
+    if abgleich_beim_lesen:
+        synchronisiere(sammlung, daten)
+
+def stand(sammlung, daten):
+    """Stand der Sammlung nach Übernahme fremder Änderungen (ändert sich bei jeder Änderung)"""
+    _abgleichen(sammlung, daten)
+    return _signaturen[sammlung]
+
+def eintrag_stand(sammlung, daten, name):
+    """Stand eines einzelnen Datensatzes (ändert sich nur, wenn sich dieser Datensatz ändert)"""
+    _abgleichen(sammlung, daten)
+    # Mit Namen, weil die Zähler je Name laufen (Umbenennen hin und zurück)
+    return name, _versionen.get(sammlung, {}).get(name, 0)
+
+def finde_eintrag(sammlung, daten, name):
+    """Datensatz mit diesem Namen (oder None), ohne die Liste zu durchsuchen"""
+    _abgleichen(sammlung, daten)
+    return _nach_name[sammlung].get(name)
+
+def freier_name(sammlung, daten, basis):
+    """Nächster freier Name der Form basis_N (N größer als jede vergebene Nummer)"""
+    _abgleichen(sammlung, daten)
+    return f"{basis}_{_nummern[sammlung].get(basis, 0) + 1}"
+
+def aendere_eintrag(sammlung, daten, datensatz, aenderung, alter_name=None):
+    """Ändert einen Datensatz sicher gegenüber anderen Stationen.
+
+    Unter der Sperre werden zuerst Änderungen anderer Stationen
+    übernommen, dann aenderung(datensatz) ausgeführt und gespeichert.
+    Gibt das Ergebnis von aenderung zurück.
+    """
+    with speicher.sperre(sammlung):
+        synchronisiere(sammlung, daten)
+        name_vorher = datensatz["name"]
+        with _lock:
+            ergebnis = aenderung(datensatz)
+        if datensatz["name"] != name_vorher:
+            _nach_name[sammlung].pop(name_vorher, None)
+            _name_merken(sammlung, datensatz)
+        _hochzaehlen(sammlung, datensatz["name"])
+        speicher.setze(sammlung, datensatz, alter_name)
+        _signaturen[sammlung] = speicher.signatur(sammlung)
+    return ergebnis
+
+def fuege_eintrag_hinzu(sammlung, daten, datensatz):
+    """Fügt einen neuen Datensatz hinzu; False, falls der Name schon vergeben ist"""
+    with speicher.sperre(sammlung):
+        synchronisiere(sammlung, daten)
+        if datensatz["name"] in _nach_name[sammlung]:
+            return False
+        daten.append(datensatz)
+        _name_merken(sammlung, datensatz)
+        _hochzaehlen(sammlung, datensatz["name"])
+        speicher.setze(sammlung, datensatz)
+        _signaturen[sammlung] = speicher.signatur(sammlung)
+    return True
+
+def schreibe_eintrag(sammlung, name, aenderung):
+    """Ändert den Datensatz name nur in der Datenhaltung; darf in einem Worker-Thread laufen.
+
+    Unter der Sperre wird aenderung auf eine Kopie des aktuellen Datensatzes
+    ausgeführt (aus dem Speicher oder, falls der veraltet ist, frisch
+    gelesen) und gespeichert. aenderung darf deshalb nur den übergebenen
+    Datensatz anfassen. Das Ergebnis übernimmt uebernimm_eintrag im
+    GUI-Thread. Gibt es name nicht mehr (an einer anderen Station
+    umbenannt oder gelöscht), wird nichts geschrieben und die Quittung
+    hat ok=False.
+    """
+    with speicher.sperre(sammlung):
+        vorher = speicher.signatur(sammlung)
+        if vorher == _signaturen.get(sammlung):
+            with _lock:
+                datensatz = copy.deepcopy(_nach_name[sammlung].get(name))
+        else:
+            datensatz = next((d for d in lade_daten(sammlung) if d["name"] == name), None)
+        if datensatz is None:
+            return {"sammlung": sammlung, "name": name, "ok": False, "datensatz": None, "ergebnis": None,
+                    "vorher": vorher, "nachher": vorher}
+        ergebnis = aenderung(datensatz)
+        speicher.setze(sammlung, datensatz, name)
+        nachher = speicher.signatur(sammlung)
+    return {"sammlung": sammlung, "name": name, "ok": True, "datensatz": datensatz, "ergebnis": ergebnis,
+            "vorher": vorher, "nachher": nachher}
+
+def _setzen(sammlung, name, frisch):
+    # Wie wende_an: der Datensatz name (bzw. schon unter neuem Namen) wird an Ort und Stelle ersetzt
+    nach_name = _nach_name[sammlung]
+    vorhanden = nach_name.pop(name, None)
+    if vorhanden is None:
+        vorhanden = nach_name.pop(frisch["name"], None)
+    if vorhanden == frisch:
+        # z.B. eine eigene Änderung, die im Protokoll noch einmal ankommt
+        _name_merken(sammlung, vorhanden)
+        return False
+    with _lock:
+        if vorhanden is None:
+            _liste(sammlung).append(frisch)
+            vorhanden = frisch
+        else:
+            vorhanden.clear()
+            vorhanden.update(frisch)
+    _name_merken(sammlung, vorhanden)
+    _hochzaehlen(sammlung, vorhanden["name"])
+    return True
+
+def _loeschen(sammlung, name):
+    vorhanden = _nach_name[sammlung].pop(name, None)
+    if vorhanden is None:
+        return False
+    with _lock:
+        liste = _liste(sammlung)
+        # Nach Identität suchen, damit nur genau dieser Datensatz verschwindet
+        del liste[next(i for i, d in enumerate(liste) if d is vorhanden)]
+    _hochzaehlen(sammlung, name)
+    return True
+
+def uebernimm_eintrag(quittung):
+    """Übernimmt das Ergebnis von schreibe_eintrag (nur im GUI-Thread); gibt das Ergebnis von aenderung zurück"""
+    sammlung = quittung["sammlung"]
+    if not quittung["ok"]:
+        # Nichts geschrieben; die Umbenennung bzw. Löschung bringt der nächste Abgleich
+        return None
+    _setzen(sammlung, quittung["name"], quittung["datensatz"])
+    # War der Speicher vorher aktuell, ist er es jetzt auch; sonst holt der nächste Abgleich den Rest
+    if _signaturen.get(sammlung) == quittung["vorher"]:
+        _signaturen[sammlung] = quittung["nachher"]
+    return quittung["ergebnis"]
 
 # Daten laden
-patienten = lade_daten(pfad_patienten)
-zahnaerzte = lade_daten(pfad_zahnaerzte)
-behandlungen_liste = lade_daten(pfad_behandlungen)
-BEHANDLUNGEN = {b["art"]: b for b in behandlungen_liste} 
\ No newline at end of file
+patienten = lade_synchron("patienten")
+zahnaerzte = lade_synchron("zahnaerzte")
+# Unveränderlich, beim Laden einmal geprüft (siehe gui/behandlungskatalog.py)
+_signaturen["behandlungen"], _katalog = lade_stand("behandlungen")
+
+def _liste(sammlung):
+    return patienten if sammlung == "patienten" else zahnaerzte
+
+def behandlungskatalog():
+    """Der aktuelle Behandlungskatalog (Preise, Dauern, Erstattungen)"""
+    return _katalog
+
+def uebernimm_aenderungen(sammlung, signatur, eintraege, vorher):
+    """Übernimmt einzelne Änderungen (speicher.aenderungen) an Patienten oder Zahnärzten.
+
+    Nur im GUI-Thread aufrufen. Geändert werden nur die betroffenen
+    Datensätze; gibt die Namen der veränderten zurück oder None, wenn sich der Speicher
+    seit vorher geändert hat (dann neu laden).
+    """
+    if signatur == _signaturen.get(sammlung):
+        return []
+    if _signaturen.get(sammlung) != vorher:
+        return None
+    namen = []
+    for eintrag in eintraege:
+        if eintrag["op"] == "setzen":
+            _ergaenzen(eintrag["eintrag"])
+            if _setzen(sammlung, eintrag["name"], eintrag["eintrag"]):
+                namen.append(eintrag["eintrag"]["name"])
+        elif eintrag["op"] == "loeschen":
+            if _loeschen(sammlung, eintrag["name"]):
+                namen.append(eintrag["name"])
+    _signaturen[sammlung] = signatur
+    return namen
+
+def uebernehme(sammlung, signatur, daten, vorher):
+    """Übernimmt einen mit lade_stand geladenen Stand (nur im GUI-Thread aufrufen).
+
+    vorher ist die bekannte_signatur beim Laden. Patienten und Zahnärzte
+    werden wie bei synchronisiere an Ort und Stelle eingearbeitet, der
+    Behandlungskatalog wird als Ganzes ausgetauscht. Gibt False zurück,
+    wenn sich der Speicher seitdem geändert hat (z.B. durch eine eigene
+    Änderung); dann muss neu geladen werden.
+    """
+    global _katalog
+    if signatur == _signaturen.get(sammlung):
+        return True
+    if _signaturen.get(sammlung) != vorher:
+        return False
+    if sammlung == "behandlungen":
+        _katalog = daten
+        _signaturen[sammlung] = signatur
+    else:
+        _einarbeiten(sammlung, _liste(sammlung), daten, signatur)
+    return True
@@ -0,0 +1,102 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _Signale(QObject):
+    fertig = pyqtSignal(object, object)
+    fehlgeschlagen = pyqtSignal(object, str)
+    uebersprungen = pyqtSignal(object)
+
+
+class Auftrag(QRunnable):
+    """Eine Arbeit für den DatenDienst; abbrechen() verhindert Start und Rückmeldung"""
+
+    def __init__(self, arbeit, fertig, fehler, uebernehmen, signale):
+        super().__init__()
+        # Der Dienst hält die Referenz, bis die Rückmeldung im GUI-Thread angekommen ist
+        self.setAutoDelete(False)
+        self.arbeit = arbeit
+        self.fertig = fertig
+        self.fehler = fehler
+        self.uebernehmen = uebernehmen
+        self.signale = signale
+        self.abgebrochen = False
+
+    def abbrechen(self):
+        self.abgebrochen = True
+
+    def run(self):
+        if self.abgebrochen:
+            self.signale.uebersprungen.emit(self)
+            return
+        try:
+            ergebnis = self.arbeit()
+        except Exception as fehler:  # im Worker nicht abstürzen, sondern im GUI-Thread melden
+            self.signale.fehlgeschlagen.emit(self, str(fehler) or type(fehler).__name__)
+            return
+        self.signale.fertig.emit(self, ergebnis)
+
+
+class DatenDienst(QObject):
+    """Führt Zugriffe auf die Datenhaltung in einem eigenen Thread aus.
+
+    Aufträge laufen nacheinander in der Reihenfolge, in der sie gestartet
+    wurden; ihre Rückmeldungen kommen in derselben Reihenfolge im GUI-Thread
+    an. arbeit() läuft im Worker und darf nur die Datenhaltung anfassen
+    (z.B. TerminStore.schreibe, data_manager.schreibe_eintrag). Das Ergebnis
+    geht im GUI-Thread zuerst an uebernehmen, danach an fertig. Alle
+    Rückrufe entfallen, wenn der Auftrag abgebrochen wurde, z.B. weil die
+    Seite des besitzer-Widgets inzwischen verlassen wurde. Was arbeit schon
+    geschrieben hat, bleibt gespeichert; da die bekannte Signatur dann nicht
+    weitergerückt ist, holt es der nächste Abgleich.
+    """
+
+    # Fehler von Aufträgen ohne eigenen fehler-Rückruf
+    fehler = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._auftraege = set()
+        self._signale = _Signale()
+        self._signale.fertig.connect(self._fertig)
+        self._signale.fehlgeschlagen.connect(self._fehlgeschlagen)
+        self._signale.uebersprungen.connect(self._auftraege.discard)
+
+    def starte(self, arbeit, fertig=None, fehler=None, uebernehmen=None, besitzer=None):
+        """Startet arbeit() im Hintergrund und gibt den Auftrag zurück"""
+        auftrag = Auftrag(arbeit, fertig, fehler, uebernehmen, self._signale)
+        if besitzer is not None:
+            besitzer.destroyed.connect(auftrag.abbrechen)
+        self._auftraege.add(auftrag)
+        self._pool.start(auftrag)
+        return auftrag
+
+    def _fertig(self, auftrag, ergebnis):
+        self._auftraege.discard(auftrag)
+        if auftrag.abgebrochen:
+            return
+        if auftrag.uebernehmen is not None:
+            ergebnis = auftrag.uebernehmen(ergebnis)
+        if auftrag.fertig is not None:
+            auftrag.fertig(ergebnis)
+
+    def _fehlgeschlagen(self, auftrag, text):
+        self._auftraege.discard(auftrag)
+        if auftrag.abgebrochen:
+            return
+        if auftrag.fehler is not None:
+            auftrag.fehler(text)
+        else:
+            self.fehler.emit(text)
+
+
+_dienst = None
+
+
+def daten_dienst():
+    """Gemeinsamer Dienst für die ganze App (erst bei Bedarf anlegen, QApplication muss laufen)"""
+    global _dienst
+    if _dienst is None:
+        _dienst = DatenDienst()
+    return _dienst
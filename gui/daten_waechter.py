@@ -0,0 +1,174 @@
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from gui import data_manager
+from gui.daten_dienst import daten_dienst
+from gui.termin_store import termin_store
+
+# Diese Sammlungen werden bei Änderungen der Dateien neu geladen
+SAMMLUNGEN = ("patienten", "zahnaerzte", "behandlungen", "termine")
+# Mehrere Änderungen kurz hintereinander (Datei + Journal, Editor speichert) zusammenfassen
+VERZOEGERUNG_MS = 200
+# Auf Netzlaufwerken meldet der Dateiwächter Änderungen anderer Rechner oft nicht;
+# deshalb zusätzlich regelmäßig die Signaturen abfragen (0 = nur Dateiwächter)
+ABFRAGE_MS = int(os.environ.get("PRAXIS_ABFRAGE_MS", "2000"))
+# Für diese Sammlungen liefert die Datenhaltung einzelne Änderungen (speicher.aenderungen)
+EINZELN = ("patienten", "zahnaerzte", "termine")
+
+
+def _bekannte_signatur(sammlung):
+    if sammlung == "termine":
+        return termin_store.bekannte_signatur()
+    return data_manager.bekannte_signatur(sammlung)
+
+
+class DatenWaechter(QObject):
+    """Lädt Sammlungen neu, sobald andere Stationen oder ein Editor ihre Dateien ändern.
+
+    Ein QFileSystemWatcher beobachtet die Dateien der Datenhaltung und ihre
+    Ordner (atomares Ersetzen legt eine neue Datei an), zusätzlich wird
+    alle ABFRAGE_MS geprüft (gemeinsamer Datenordner auf einem
+    Netzlaufwerk). Im DatenDienst wird geprüft, welche Sammlungen nicht
+    mehr zum Stand im Speicher passen. Kennt die Datenhaltung die
+    Änderungen seit dem bekannten Stand, werden nur diese gelesen,
+    sonst die ganze Sammlung. Übernommen wird im GUI-Thread in einem
+    Schritt (uebernimm_aenderungen bzw. uebernehme von data_manager und
+    TerminStore); danach wird geaendert(sammlung) gesendet.
+    Ein ungültiger Stand (z.B. fehlerhafte Preisliste) wird verworfen und
+    fehler(sammlung, text) gesendet, der bisherige bleibt aktiv, bis die
+    Datei erneut geändert wird.
+
+    Solange der Wächter läuft, gleichen Lesezugriffe nicht mehr selbst ab;
+    der GUI-Thread wartet damit nie auf die Datenhaltung. Seiten, die
+    frische Daten brauchen, fordern sie mit aktualisiere an.
+    """
+
+    geaendert = pyqtSignal(str)
+    fehler = pyqtSignal(str, str)
+
+    def __init__(self, speicher=data_manager.speicher, sammlungen=SAMMLUNGEN, abfrage_ms=ABFRAGE_MS):
+        super().__init__()
+        self.speicher = speicher
+        self.sammlungen = sammlungen
+        self._laufend = set()
+        # sammlung -> Signatur eines Stands, der nicht geladen werden konnte
+        self._verworfen = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(VERZOEGERUNG_MS)
+        self._timer.timeout.connect(self.pruefen)
+        self._abfrage = QTimer(self)
+        self._abfrage.setInterval(abfrage_ms)
+        self._abfrage.timeout.connect(self.pruefen)
+        if abfrage_ms > 0:
+            self._abfrage.start()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._geaendert)
+        self._watcher.directoryChanged.connect(self._geaendert)
+        self._beobachten()
+        data_manager.abgleich_beim_lesen = False
+        termin_store.abgleich_beim_lesen = False
+
+    def _dateien(self):
+        return [pfad for sammlung in self.sammlungen for pfad in self.speicher.dateien(sammlung)]
+
+    def _beobachten(self):
+        # Ersetzte oder neu angelegte Dateien (wieder) aufnehmen
+        dateien = [pfad for pfad in self._dateien() if os.path.exists(pfad)]
+        ordner = {os.path.dirname(os.path.abspath(pfad)) for pfad in self._dateien()}
+        neu = [pfad for pfad in dateien + sorted(ordner)
+               if pfad not in self._watcher.files() and pfad not in self._watcher.directories()]
+        if neu:
+            self._watcher.addPaths(neu)
+
+    def _geaendert(self, pfad):
+        self._timer.start()
+
+    def pruefen(self):
+        """Lädt alle Sammlungen neu, die nicht mehr aktuell sind"""
+        self._beobachten()
+        self.aktualisiere(self.sammlungen)
+
+    def laedt(self, sammlung):
+        """True, solange die Sammlung geprüft oder neu geladen wird"""
+        return sammlung in self._laufend
+
+    def aktualisiere(self, sammlungen, fertig=None, besitzer=None):
+        """Bringt die Sammlungen im Hintergrund auf den aktuellen Stand.
+
+        fertig() wird danach im GUI-Thread aufgerufen, außer der Auftrag
+        wurde abgebrochen (z.B. weil besitzer inzwischen gelöscht ist).
+        Gibt den Auftrag zurück; Aufträge laufen der Reihe nach, fertig
+        kommt also erst, wenn alle vorher gestarteten Ladevorgänge
+        übernommen sind.
+        """
+        dienst = daten_dienst()
+        for sammlung in sammlungen:
+            if sammlung in self._laufend:
+                continue
+            self._laufend.add(sammlung)
+            dienst.starte(
+                lambda sammlung=sammlung: self._laden(sammlung),
+                uebernehmen=lambda ergebnis, sammlung=sammlung: self._geladen(sammlung, ergebnis),
+                fehler=lambda text, sammlung=sammlung: self._fehlgeschlagen(sammlung, text),
+            )
+        if fertig is None:
+            return None
+        return dienst.starte(lambda: None, fertig=lambda _: fertig(), besitzer=besitzer)
+
+    def _laden(self, sammlung):
+        # Läuft im Worker: None, wenn der Speicher aktuell ist oder dieser Stand schon verworfen wurde
+        vorher = _bekannte_signatur(sammlung)
+        signatur = self.speicher.signatur(sammlung)
+        if signatur == vorher or self._verworfen.get(sammlung) == signatur:
+            return None
+        if vorher is not None and sammlung in EINZELN:
+            aenderungen = self.speicher.aenderungen(sammlung, vorher)
+            if aenderungen is not None:
+                return vorher, True, aenderungen
+        try:
+            return vorher, False, data_manager.lade_stand(sammlung)
+        except (OSError, ValueError):
+            # Diesen Stand nicht immer wieder laden; erst eine neue Änderung zählt
+            self._verworfen[sammlung] = signatur
+            raise
+
+    def _geladen(self, sammlung, ergebnis):
+        # Läuft im GUI-Thread
+        self._laufend.discard(sammlung)
+        if ergebnis is None:
+            return
+        vorher, einzeln, (signatur, daten) = ergebnis
+        self._verworfen.pop(sammlung, None)
+        if sammlung == "termine" and einzeln:
+            uebernommen = termin_store.uebernimm_aenderungen(signatur, daten, vorher)
+        elif sammlung == "termine":
+            uebernommen = termin_store.uebernehme(signatur, daten, vorher)
+        elif einzeln:
+            uebernommen = data_manager.uebernimm_aenderungen(sammlung, signatur, daten, vorher) is not None
+        else:
+            uebernommen = data_manager.uebernehme(sammlung, signatur, daten, vorher)
+        if not uebernommen:
+            # Inzwischen schon wieder geändert: den neuen Stand laden
+            self._timer.start()
+            return
+        self.geaendert.emit(sammlung)
+
+    def _fehlgeschlagen(self, sammlung, text):
+        self._laufend.discard(sammlung)
+        self.fehler.emit(sammlung, text)
+        # Wurde während des Ladens weiter geschrieben (z.B. halb gespeicherte Datei),
+        # passt die Signatur nicht mehr zum verworfenen Stand und der nächste Versuch lädt neu
+        self._timer.start()
+
+
+_waechter = None
+
+
+def daten_waechter():
+    """Gemeinsamer Wächter für die ganze App (erst bei Bedarf anlegen, QApplication muss laufen)"""
+    global _waechter
+    if _waechter is None:
+        _waechter = DatenWaechter()
+    return _waechter
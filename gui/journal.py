@@ -0,0 +1,107 @@
+import json
+import os
+
+# Nach so vielen Einträgen wird das Journal in den Snapshot übernommen
+KOMPAKTIERUNG_AB = 200
+
+
+class Journal:
+    """Append-only Änderungsprotokoll neben einer JSON-Datei (<datei>.journal).
+
+    Jede Änderung wird als eine JSON-Zeile angehängt und mit fsync gesichert.
+    Beim Laden wird der Snapshot gelesen und das Journal darauf angewendet,
+    deshalb müssen alle Einträge mehrfach anwendbar sein (idempotent).
+    """
+
+    def __init__(self, pfad_snapshot, max_eintraege=KOMPAKTIERUNG_AB):
+        self.pfad_snapshot = pfad_snapshot
+        self.pfad = pfad_snapshot + ".journal"
+        self.max_eintraege = max_eintraege
+        self.anzahl = 0
+        # Größe des Journals, bis zu der anzahl gezählt ist, und der Snapshot dazu
+        self.groesse = 0
+        self.snapshot = None
+        self.lesen()
+
+    def _snapshot_stand(self):
+        # Beim Kompaktieren wird der Snapshot per os.replace ersetzt (neue Datei)
+        try:
+            st = os.stat(self.pfad_snapshot)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def lesen(self):
+        """Alle gültigen Einträge; aktualisiert dabei auch die Anzahl"""
+        self.snapshot = self._snapshot_stand()
+        eintraege, self.groesse = self._lesen(0)
+        self.anzahl = len(eintraege)
+        return eintraege
+
+    def lesen_ab(self, position):
+        """Gültige Einträge ab einer Byte-Position (Größe des Journals bei einem früheren Stand)"""
+        return self._lesen(position)[0]
+
+    def _lesen(self, position):
+        eintraege = []
+        try:
+            with open(self.pfad, "rb") as f:
+                f.seek(position)
+                for zeile in f:
+                    try:
+                        eintraege.append(json.loads(zeile))
+                    except ValueError:
+                        continue  # Halb geschriebene oder beschädigte Zeile überspringen
+                return eintraege, f.tell()
+        except FileNotFoundError:
+            return eintraege, 0
+
+    def anhaengen(self, eintrag):
+        zeile = (json.dumps(eintrag, ensure_ascii=False) + "\n").encode("utf-8")
+        with open(self.pfad, "ab+") as f:
+            ende = f.seek(0, os.SEEK_END)
+            # Halb geschriebene Zeile eines abgestürzten Prozesses abschließen
+            if ende > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    zeile = b"\n" + zeile
+            f.write(zeile)
+            f.flush()
+            os.fsync(f.fileno())
+        # Hat seit dem letzten Zählen niemand sonst geschrieben, ist nur die eigene Zeile dazugekommen;
+        # sonst zählt zaehlen den Rest nach
+        if ende == self.groesse:
+            self.anzahl += 1
+            self.groesse = ende + len(zeile)
+
+    def zaehlen(self):
+        """Zeilen im Journal zählen, auch die anderer Stationen (unter der Sperre aufrufen).
+
+        Gelesen wird nur, was seit dem letzten Zählen von anderen Stationen
+        angehängt wurde; wurde anderswo kompaktiert, wird von vorn gezählt.
+        """
+        try:
+            groesse = os.path.getsize(self.pfad)
+        except FileNotFoundError:
+            groesse = 0
+        snapshot = self._snapshot_stand()
+        if groesse < self.groesse or snapshot != self.snapshot:
+            self.anzahl = self.groesse = 0
+            self.snapshot = snapshot
+        if groesse > self.groesse:
+            with open(self.pfad, "rb") as f:
+                f.seek(self.groesse)
+                self.anzahl += f.read(groesse - self.groesse).count(b"\n")
+            self.groesse = groesse
+        return self.anzahl
+
+    def voll(self):
+        return self.anzahl >= self.max_eintraege
+
+    def leeren(self):
+        # Erst aufrufen, nachdem der Snapshot atomar geschrieben wurde
+        with open(self.pfad, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.anzahl = self.groesse = 0
+        self.snapshot = self._snapshot_stand()
@@ -10,14 +10,14 @@ from PyQt5.QtCore import QByteArray
 
 from gui.passwort import PasswortAendernFenster
 from gui.register import RegistrierungsFenster, ZahnarztRegistrierungsFenster
-from gui.data_manager import patienten, zahnaerzte, STYLE
+from gui.data_manager import patienten, zahnaerzte, finde_eintrag, aendere_eintrag
+from gui.passwort_hash import pruefe_passwort, braucht_neuen_hash, hash_passwort
 
 class LoginFenster(QWidget):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("BrightByte")
         self.setGeometry(700, 200, 400, 500)
-        self.setStyleSheet(STYLE)
 
         # Hintergrundfarbe
         palette = self.palette()
@@ -27,31 +27,20 @@ class LoginFenster(QWidget):
 
         # Container für Login-Formular
         main_container = QFrame(self)
-        main_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        main_container.setProperty("stil", "karte")
 
         layout = QVBoxLayout(main_container)
         layout.setSpacing(15)
 
         # Willkommens-Header
         welcome_label = QLabel("Willkommen")
-        welcome_label.setStyleSheet("""
-            font-size: 28px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 10px;
-        """)
+        welcome_label.setObjectName("willkommen")
         welcome_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(welcome_label)
 
         # Untertitel
         subtitle_label = QLabel("Bitte melden Sie sich an")
-        subtitle_label.setStyleSheet("color: #7f8c8d;")
+        subtitle_label.setProperty("stil", "grau")
         subtitle_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(subtitle_label)
 
@@ -90,19 +79,14 @@ class LoginFenster(QWidget):
         self.pw_toggle_btn.setCheckable(True)
         self.pw_toggle_btn.setIcon(self.eye_icon)
         self.pw_toggle_btn.setToolTip("Passwort anzeigen/ausblenden")
-        self.pw_toggle_btn.setStyleSheet("QToolButton { border: none; padding: 0 8px; }")
+        self.pw_toggle_btn.setObjectName("passwort_umschalter")
         self.pw_toggle_btn.toggled.connect(self.toggle_password_visibility)
         pw_layout.addWidget(self.pw_toggle_btn)
         layout.addLayout(pw_layout)
 
         # Button Container
         button_container = QFrame()
-        button_container.setStyleSheet("""
-            QFrame {
-                background-color: transparent;
-                border: none;
-            }
-        """)
+        button_container.setProperty("stil", "transparent")
         button_layout = QVBoxLayout(button_container)
         button_layout.setSpacing(10)
         
@@ -113,7 +97,8 @@ class LoginFenster(QWidget):
         
         # Registrierungs-Buttons
         reg_label = QLabel("Neu hier? Registrieren Sie sich als:")
-        reg_label.setStyleSheet("color: #7f8c8d; margin-top: 10px;")
+        reg_label.setObjectName("registrieren_hinweis")
+        reg_label.setProperty("stil", "grau")
         reg_label.setAlignment(Qt.AlignCenter)
         button_layout.addWidget(reg_label)
         
@@ -121,26 +106,11 @@ class LoginFenster(QWidget):
         
         self.patient_reg_button = QPushButton("🏥 Patient")
         self.patient_reg_button.clicked.connect(self.zeige_patienten_registrierung)
-        self.patient_reg_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-        """)
+        self.patient_reg_button.setProperty("stil", "gruen")
         reg_buttons_layout.addWidget(self.patient_reg_button)
         
         self.arzt_reg_button = QPushButton("👨‍⚕️ Zahnarzt")
         self.arzt_reg_button.clicked.connect(self.zeige_zahnarzt_registrierung)
-        self.arzt_reg_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-        """)
         reg_buttons_layout.addWidget(self.arzt_reg_button)
         
         button_layout.addLayout(reg_buttons_layout)
@@ -164,29 +134,24 @@ class LoginFenster(QWidget):
         benutzername = self.benutzername.text().strip()
         passwort = self.passwort.text().strip()
 
-        for p in patienten:
-            if p["name"] == benutzername and p["passwort"] == passwort:
-                if not p.get("passwort_geaendert", False):
-                    QMessageBox.information(self, "Erstlogin", f"Willkommen Patient {benutzername}! Bitte Passwort ändern.")
-                    self.passwortfenster = PasswortAendernFenster(p, "Patient", parent=self)
-                    self.passwortfenster.show()
-                else:
-                    self.mainfenster = MainFenster(p["name"], "Patient")
-                    self.mainfenster.show()
-                    self.close()
-                return
-
-        for z in zahnaerzte:
-            if z["name"] == benutzername and z["passwort"] == passwort:
-                if not z.get("passwort_geaendert", False):
-                    QMessageBox.information(self, "Erstlogin", f"Willkommen Zahnarzt {benutzername}! Bitte Passwort ändern.")
-                    self.passwortfenster = PasswortAendernFenster(z, "Zahnarzt", parent=self)
-                    self.passwortfenster.show()
-                else:
-                    self.mainfenster = MainFenster(z["name"], "Zahnarzt")
-                    self.mainfenster.show()
-                    self.close()
-                return
+        # Erst Patienten, dann Zahnärzte (Nachschlagen über den Namensindex)
+        for rolle, sammlung, daten in (("Patient", "patienten", patienten), ("Zahnarzt", "zahnaerzte", zahnaerzte)):
+            konto = finde_eintrag(sammlung, daten, benutzername)
+            if konto is None or not pruefe_passwort(passwort, konto["passwort"]):
+                continue
+            # Klartext oder alter Arbeitsfaktor: Hash beim Login erneuern
+            if braucht_neuen_hash(konto["passwort"]):
+                neuer_hash = hash_passwort(passwort)
+                aendere_eintrag(sammlung, daten, konto, lambda k: k.update(passwort=neuer_hash))
+            if not konto.get("passwort_geaendert", False):
+                QMessageBox.information(self, "Erstlogin", f"Willkommen {rolle} {benutzername}! Bitte Passwort ändern.")
+                self.passwortfenster = PasswortAendernFenster(konto, rolle, parent=self)
+                self.passwortfenster.show()
+            else:
+                # Das Hauptfenster hält sich selbst (siehe offen_halten)
+                MainFenster(konto["name"], rolle).show()
+                self.close()
+            return
 
         QMessageBox.warning(self, "Fehler", "Benutzername oder Passwort falsch!")
 
@@ -0,0 +1,50 @@
+"""Einmalige Übernahme der Daten aus data/*.json in die SQLite-Datenbank.
+
+Aufruf aus dem Projektordner:
+    python -m gui.migration [--ordner data] [--ueberschreiben]
+
+Ohne --ordner gilt wie in der App PRAXIS_DATEN (Standard: data).
+
+Danach die App mit PRAXIS_SPEICHER=sqlite starten.
+"""
+import argparse
+import os
+import sys
+
+from gui.speicher import DATEN_ORDNER, SAMMLUNGEN, oeffne_speicher
+
+
+def migriere(quelle, ziel):
+    """Kopiert alle Sammlungen von quelle nach ziel; gibt die Anzahl je Sammlung zurück"""
+    anzahl = {}
+    for sammlung in SAMMLUNGEN:
+        with quelle.sperre(sammlung):
+            daten = quelle.lade(sammlung)
+        ziel.ersetze(sammlung, daten)
+        if sammlung == "termine":
+            anzahl[sammlung] = sum(len(tag) for arzt in daten.values() for tag in arzt.values())
+        else:
+            anzahl[sammlung] = len(daten)
+    return anzahl
+
+
+def main(argumente=None):
+    parser = argparse.ArgumentParser(description="JSON-Daten in die SQLite-Datenbank übernehmen")
+    parser.add_argument("--ordner", default=DATEN_ORDNER, help="Datenordner mit den JSON-Dateien (Standard: PRAXIS_DATEN oder data)")
+    parser.add_argument("--ueberschreiben", action="store_true",
+                        help="vorhandene Datenbank ersetzen")
+    argumente = parser.parse_args(argumente)
+
+    db_pfad = os.path.join(argumente.ordner, "praxis.db")
+    if os.path.exists(db_pfad) and not argumente.ueberschreiben:
+        print(f"{db_pfad} existiert bereits (mit --ueberschreiben ersetzen).")
+        return 1
+    anzahl = migriere(oeffne_speicher("json", argumente.ordner), oeffne_speicher("sqlite", argumente.ordner))
+    for sammlung, n in anzahl.items():
+        print(f"{sammlung}: {n}")
+    print(f"Fertig: {db_pfad}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
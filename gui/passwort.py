@@ -1,7 +1,8 @@
 from PyQt5.QtWidgets import QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox, QFrame
 from PyQt5.QtGui import QColor, QPalette
 from PyQt5.QtCore import Qt
-from gui.data_manager import speichere_daten, patienten, zahnaerzte, pfad_patienten, pfad_zahnaerzte, STYLE
+from gui.data_manager import aendere_eintrag, patienten, zahnaerzte
+from gui.passwort_hash import hash_passwort
 from components.main_window import MainFenster
 
 class PasswortAendernFenster(QWidget):
@@ -12,7 +13,6 @@ class PasswortAendernFenster(QWidget):
         self.parent_fenster = parent
         self.setWindowTitle("BrightByte | Passwort ändern")
         self.setGeometry(700, 200, 400, 300)
-        self.setStyleSheet(STYLE)
 
         # Hintergrundfarbe
         palette = self.palette()
@@ -22,30 +22,19 @@ class PasswortAendernFenster(QWidget):
 
         # Container Formular
         main_container = QFrame(self)
-        main_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        main_container.setProperty("stil", "karte")
         
         layout = QVBoxLayout(main_container)
         layout.setSpacing(15)
 
         # Überschrift
         self.label_info = QLabel(f"Passwort ändern für {self.benutzer['name']}")
-        self.label_info.setStyleSheet("""
-            font-size: 18px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 10px;
-        """)
+        self.label_info.setObjectName("passwort_titel")
         layout.addWidget(self.label_info, alignment=Qt.AlignCenter)
 
         # Rolle Label
         rolle_label = QLabel(f"Angemeldet als {rolle}")
-        rolle_label.setStyleSheet("color: #7f8c8d;")
+        rolle_label.setProperty("stil", "grau")
         rolle_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(rolle_label)
 
@@ -81,17 +70,20 @@ class PasswortAendernFenster(QWidget):
             QMessageBox.warning(self, "Fehler", "Passwörter stimmen nicht überein.")
             return
 
-        self.benutzer["passwort"] = neues
-        self.benutzer["passwort_geaendert"] = True
+        # Hash außerhalb der Sperre berechnen
+        neuer_hash = hash_passwort(neues)
+
+        def passwort_setzen(benutzer):
+            benutzer["passwort"] = neuer_hash
+            benutzer["passwort_geaendert"] = True
 
         if self.rolle == "Patient":
-            speichere_daten(pfad_patienten, patienten)
+            aendere_eintrag("patienten", patienten, self.benutzer, passwort_setzen)
         else:
-            speichere_daten(pfad_zahnaerzte, zahnaerzte)
+            aendere_eintrag("zahnaerzte", zahnaerzte, self.benutzer, passwort_setzen)
 
         QMessageBox.information(self, "Erfolg", "Passwort erfolgreich geändert.")
-        self.mainfenster = MainFenster(self.benutzer["name"], self.rolle)
-        self.mainfenster.show()
+        MainFenster(self.benutzer["name"], self.rolle).show()
         self.close()
         if self.parent_fenster:
             self.parent_fenster.close()
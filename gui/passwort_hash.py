@@ -0,0 +1,37 @@
+import hashlib
+import hmac
+import os
+
+VERFAHREN = "pbkdf2_sha256"
+
+# Arbeitsfaktor: PBKDF2-Iterationen je Hash, bestimmt die Rechenzeit pro Login.
+# Über die Umgebungsvariable PRAXIS_PBKDF2_ITERATIONEN anpassbar.
+ITERATIONEN = int(os.environ.get("PRAXIS_PBKDF2_ITERATIONEN", "200000"))
+
+
+def hash_passwort(passwort, iterationen=None):
+    """Gesalzener Hash im Format 'pbkdf2_sha256$iterationen$salz$hash'"""
+    iterationen = iterationen or ITERATIONEN
+    salz = os.urandom(16)
+    wert = hashlib.pbkdf2_hmac("sha256", passwort.encode("utf-8"), salz, iterationen)
+    return f"{VERFAHREN}${iterationen}${salz.hex()}${wert.hex()}"
+
+
+def ist_gehasht(gespeichert):
+    return gespeichert.startswith(VERFAHREN + "$")
+
+
+def pruefe_passwort(passwort, gespeichert):
+    """Vergleicht in konstanter Zeit; alte Klartext-Passwörter werden noch akzeptiert"""
+    if not ist_gehasht(gespeichert):
+        return hmac.compare_digest(passwort.encode("utf-8"), gespeichert.encode("utf-8"))
+    _, iterationen, salz, wert = gespeichert.split("$")
+    berechnet = hashlib.pbkdf2_hmac("sha256", passwort.encode("utf-8"), bytes.fromhex(salz), int(iterationen))
+    return hmac.compare_digest(berechnet, bytes.fromhex(wert))
+
+
+def braucht_neuen_hash(gespeichert):
+    """True für Klartext oder Hashes mit anderem Arbeitsfaktor (beim Login erneuern)"""
+    if not ist_gehasht(gespeichert):
+        return True
+    return int(gespeichert.split("$")[1]) != ITERATIONEN
@@ -2,9 +2,12 @@ from PyQt5.QtWidgets import QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout
 from PyQt5.QtGui import QColor, QPalette
 from PyQt5.QtCore import Qt
 import os
-import json
 
-from gui.data_manager import patienten, zahnaerzte, speichere_daten, pfad_patienten, pfad_zahnaerzte, STYLE
+from gui.data_manager import (
+    patienten, zahnaerzte, speicher, aendere_eintrag, fuege_eintrag_hinzu, finde_eintrag, freier_name,
+    behandlungskatalog
+)
+from gui.passwort_hash import hash_passwort
 
 # Registrierungsfenster neue Patienten
 class RegistrierungsFenster(QWidget):
@@ -12,7 +15,6 @@ class RegistrierungsFenster(QWidget):
         super().__init__()
         self.setWindowTitle("BrightByte | Registrierung")
         self.setGeometry(700, 200, 400, 500)
-        self.setStyleSheet(STYLE)
 
         # Hintergrundfarbe
         palette = self.palette()
@@ -22,30 +24,19 @@ class RegistrierungsFenster(QWidget):
 
         # Container Formular
         main_container = QFrame(self)
-        main_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        main_container.setProperty("stil", "karte")
 
         layout = QVBoxLayout(main_container)
         layout.setSpacing(15)
 
         # Überschrift
         titel = QLabel("Neue Registrierung")
-        titel.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 10px;
-        """)
+        titel.setProperty("stil", "formular_titel")
         layout.addWidget(titel, alignment=Qt.AlignCenter)
 
         # Untertitel
         untertitel = QLabel("Bitte füllen Sie alle Felder aus")
-        untertitel.setStyleSheet("color: #7f8c8d;")
+        untertitel.setProperty("stil", "grau")
         untertitel.setAlignment(Qt.AlignCenter)
         layout.addWidget(untertitel)
 
@@ -61,7 +52,7 @@ class RegistrierungsFenster(QWidget):
 
         # Versicherung
         versicherung_label = QLabel("Versicherung:")
-        versicherung_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
+        versicherung_label.setProperty("stil", "fett")
         layout.addWidget(versicherung_label)
         
         self.versicherung_box = QComboBox()
@@ -70,13 +61,11 @@ class RegistrierungsFenster(QWidget):
 
         # Beschwerden
         probleme_label = QLabel("Beschwerde:")
-        probleme_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
+        probleme_label.setProperty("stil", "fett")
         layout.addWidget(probleme_label)
         
         self.probleme_box = QComboBox()
-        self.probleme_box.addItems([
-            "Karies klein", "Karies groß", "Teilkrone", "Krone", "Wurzelbehandlung"
-        ])
+        self.probleme_box.addItems(behandlungskatalog().arten)
         layout.addWidget(self.probleme_box)
 
         self.eingabe_anzahl = QLineEdit()
@@ -111,21 +100,7 @@ class RegistrierungsFenster(QWidget):
             return
 
         # Prüft ob Name bereits existiert
-        existierender_patient = None
-        basis_name = name
-        nummer = 1
-        
-        # Finde die höchste existierende Nummer
-        for patient in patienten:
-            if patient["name"] == name:
-                existierender_patient = patient
-                break
-            elif patient["name"].startswith(name + "_"):
-                try:
-                    nr = int(patient["name"].split("_")[-1])
-                    nummer = max(nummer, nr + 1)
-                except ValueError:
-                    continue
+        existierender_patient = finde_eintrag("patienten", patienten, name)
 
         if existierender_patient:
             msgbox = QMessageBox(self)
@@ -138,23 +113,23 @@ class RegistrierungsFenster(QWidget):
 
             if msgbox.clickedButton() == ja_btn:
                 # Aktualisiere existierenden Patienten
-                existierender_patient["passwort"] = pw
-                # Füge neue Beschwerden hinzu
-                neues_problem = {
-                    "art": beschwerde,
-                    "anzahl": anzahl,
-                    "material": "normal"
-                }
-                # Prüfe ob Problem bereits existiert
-                problem_existiert = False
-                for problem in existierender_patient["probleme"]:
-                    if problem["art"] == beschwerde:
-                        problem["anzahl"] += anzahl
-                        problem_existiert = True
-                        break
-                if not problem_existiert:
-                    existierender_patient["probleme"].append(neues_problem)
-                speichere_daten(pfad_patienten, patienten)
+                neuer_hash = hash_passwort(pw)
+
+                def patient_aktualisieren(patient):
+                    patient["passwort"] = neuer_hash
+                    # Füge neue Beschwerden hinzu
+                    neues_problem = {
+                        "art": beschwerde,
+                        "anzahl": anzahl,
+                        "material": "normal"
+                    }
+                    # Prüfe ob Problem bereits existiert
+                    for problem in patient["probleme"]:
+                        if problem["art"] == beschwerde:
+                            problem["anzahl"] += anzahl
+                            return
+                    patient["probleme"].append(neues_problem)
+                aendere_eintrag("patienten", patienten, existierender_patient, patient_aktualisieren)
                 QMessageBox.information(
                     self,
                     "Erfolg",
@@ -163,18 +138,8 @@ class RegistrierungsFenster(QWidget):
                 self.close()
                 return
             else:
-                # Generiere neuen Namen mit Nummerierung
-                while True:
-                    name = f"{basis_name}_{nummer}"
-                    # Prüfe ob dieser Name bereits existiert
-                    name_existiert = False
-                    for patient in patienten:
-                        if patient["name"] == name:
-                            name_existiert = True
-                            nummer += 1
-                            break
-                    if not name_existiert:
-                        break
+                # Generiere neuen Namen mit Nummerierung (name_1, name_2, ...)
+                name = freier_name("patienten", patienten, name)
                 # Informiere Benutzer über den neuen Namen
                 QMessageBox.information(
                     self,
@@ -185,7 +150,7 @@ class RegistrierungsFenster(QWidget):
         # Erstelle neuen Patienten
         neuer_patient = {
             "name": name,
-            "passwort": pw,
+            "passwort": hash_passwort(pw),
             "krankenkasse": versicherung,
             "probleme": [
                 {
@@ -197,8 +162,9 @@ class RegistrierungsFenster(QWidget):
             "passwort_geaendert": True
         }
 
-        patienten.append(neuer_patient)
-        speichere_daten(pfad_patienten, patienten)
+        if not fuege_eintrag_hinzu("patienten", patienten, neuer_patient):
+            QMessageBox.warning(self, "Fehler", f"Der Name '{name}' wurde gerade an einer anderen Station vergeben. Bitte erneut registrieren.")
+            return
 
         QMessageBox.information(
             self,
@@ -215,7 +181,6 @@ class ZahnarztRegistrierungsFenster(QWidget):
         super().__init__()
         self.setWindowTitle("BrightByte | Registrierung")
         self.setGeometry(700, 200, 400, 400)
-        self.setStyleSheet(STYLE)
 
         # Hintergrundfarbe
         palette = self.palette()
@@ -225,25 +190,14 @@ class ZahnarztRegistrierungsFenster(QWidget):
 
         # Container Formular
         main_container = QFrame(self)
-        main_container.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-            }
-        """)
+        main_container.setProperty("stil", "karte")
 
         layout = QVBoxLayout(main_container)
         layout.setSpacing(15)
 
         # Überschrift
         titel = QLabel("Zahnarzt Registrierung")
-        titel.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #2c3e50;
-            margin-bottom: 10px;
-        """)
+        titel.setProperty("stil", "formular_titel")
         layout.addWidget(titel, alignment=Qt.AlignCenter)
 
         # Formularfelder
@@ -258,13 +212,13 @@ class ZahnarztRegistrierungsFenster(QWidget):
 
         # Behandelte Versicherungen
         kassen_label = QLabel("Behandelte Versicherungen:")
-        kassen_label.setStyleSheet("color: #2c3e50; font-weight: bold;")
+        kassen_label.setProperty("stil", "fett")
         layout.addWidget(kassen_label)
         
         self.kassen_checkboxes = {}
         for kasse in ["gesetzlich", "privat", "freiwillig gesetzlich"]:
             cb = QCheckBox(kasse)
-            cb.setStyleSheet("color: #2c3e50; margin-left: 10px;")
+            cb.setProperty("stil", "eingerueckt")
             self.kassen_checkboxes[kasse] = cb
             layout.addWidget(cb)
 
@@ -289,32 +243,26 @@ class ZahnarztRegistrierungsFenster(QWidget):
         if not behandelt:
             QMessageBox.warning(self, "Fehler", "Bitte mindestens eine Kasse auswählen.")
             return
-        for zahnarzt in zahnaerzte:
-            if zahnarzt["name"] == name:
-                QMessageBox.warning(self, "Fehler", "Ein Zahnarzt mit diesem Namen existiert bereits.")
-                return
+        if finde_eintrag("zahnaerzte", zahnaerzte, name) is not None:
+            QMessageBox.warning(self, "Fehler", "Ein Zahnarzt mit diesem Namen existiert bereits.")
+            return
 
         neuer_zahnarzt = {
             "name": name,
-            "passwort": passwort,
+            "passwort": hash_passwort(passwort),
             "behandelt": behandelt,
             "zeiten": {},  # Standard: keine Zeiten
             "passwort_geaendert": True
         }
-        zahnaerzte.append(neuer_zahnarzt)
-        speichere_daten(pfad_zahnaerzte, zahnaerzte)
+        if not fuege_eintrag_hinzu("zahnaerzte", zahnaerzte, neuer_zahnarzt):
+            QMessageBox.warning(self, "Fehler", "Ein Zahnarzt mit diesem Namen existiert bereits.")
+            return
 
         # Automatische Bildzuweisung
         bilder_dir = os.path.join(os.path.dirname(__file__), "..", "arzt_bilder")
         bilder_dir = os.path.abspath(bilder_dir)
         alle_bilder = [f"arzt_bilder/doc{i}.jpg" for i in range(1, 13)]
-        bilder_json_path = os.path.join(os.path.dirname(__file__), "..", "data", "zahnaerzte_bilder.json")
-        bilder_json_path = os.path.abspath(bilder_json_path)
-        try:
-            with open(bilder_json_path, "r", encoding="utf-8") as f:
-                bilder_mapping = json.load(f)
-        except Exception:
-            bilder_mapping = {}
+        bilder_mapping = speicher.lade("bilder")
         vergebene_bilder = set(bilder_mapping.values())
         freies_bild = None
         for bild in alle_bilder:
@@ -324,9 +272,7 @@ class ZahnarztRegistrierungsFenster(QWidget):
         if not freies_bild:
             # Falls alle vergeben, nimmt das erste Bild
             freies_bild = alle_bilder[0]
-        bilder_mapping[name] = freies_bild
-        with open(bilder_json_path, "w", encoding="utf-8") as f:
-            json.dump(bilder_mapping, f, indent=2, ensure_ascii=False)
+        speicher.setze_bild(name, freies_bild)
 
         QMessageBox.information(
             self,
@@ -0,0 +1,131 @@
+import os
+
+# Sammlungen, die jede Datenhaltung anbietet
+SAMMLUNGEN = ("patienten", "zahnaerzte", "behandlungen", "termine", "bilder")
+# Datenordner, z.B. ein gemeinsamer Ordner mehrerer Stationen (PRAXIS_DATEN=//server/praxis)
+DATEN_ORDNER = os.environ.get("PRAXIS_DATEN", "data")
+
+
+class Speicher:
+    """Schnittstelle der Datenhaltung (JSON-Dateien oder SQLite).
+
+    Sammlungen:
+    - "patienten", "zahnaerzte": Listen von Dicts mit eindeutigem "name"
+    - "behandlungen": Liste von Dicts mit eindeutiger "art" (nur lesend)
+    - "termine": termine[arzt][datum][zeit] -> Termin
+    - "bilder": Arztname -> Bilddatei
+    """
+
+    def sperre(self, sammlung):
+        """Kontextmanager für exklusiven, prozessübergreifenden Zugriff (wiedereintrittsfähig)"""
+        raise NotImplementedError
+
+    def signatur(self, sammlung):
+        """Ändert sich bei jeder Änderung der Sammlung, auch durch andere Stationen"""
+        raise NotImplementedError
+
+    def dateien(self, sammlung):
+        """Dateien, deren Änderung auf eine Änderung der Sammlung hinweist (für Dateiwächter)"""
+        raise NotImplementedError
+
+    def aenderungen(self, sammlung, signatur):
+        """Änderungen seit dem Stand signatur als (neue Signatur, Einträge) oder None.
+
+        Die Einträge haben dieselbe Form wie in setze, loesche und aendere_termine
+        ({"op": ...}). None heißt, dass sich die Änderungen nicht einzeln
+        angeben lassen (z.B. Datei ersetzt, Protokoll gekürzt); dann muss die
+        Sammlung ganz geladen werden.
+        """
+        return None
+
+    def lade(self, sammlung):
+        raise NotImplementedError
+
+    def ersetze(self, sammlung, daten):
+        """Schreibt die komplette Sammlung neu (Kompaktierung, Migration)"""
+        raise NotImplementedError
+
+    def setze(self, sammlung, datensatz, alter_name=None):
+        """Speichert einen Patienten/Zahnarzt; alter_name bei Umbenennungen angeben"""
+        raise NotImplementedError
+
+    def loesche(self, sammlung, name):
+        """Entfernt einen Patienten/Zahnarzt"""
+        raise NotImplementedError
+
+    def aendere_termine(self, eintrag):
+        """Führt eine Terminänderung aus (siehe wende_termin_an)"""
+        raise NotImplementedError
+
+    def setze_bild(self, arzt, bild, alter_name=None):
+        raise NotImplementedError
+
+
+def leer(sammlung):
+    return {} if sammlung in ("termine", "bilder") else []
+
+
+def wende_an(daten, eintrag):
+    """Wendet eine Änderung ({"op": "setzen"/"loeschen", ...}) auf eine Liste von Datensätzen an"""
+    if eintrag["op"] == "loeschen":
+        daten[:] = [d for d in daten if d["name"] != eintrag["name"]]
+    elif eintrag["op"] == "setzen":
+        datensatz = eintrag["eintrag"]
+        for i, vorhanden in enumerate(daten):
+            if vorhanden["name"] in (eintrag["name"], datensatz["name"]):
+                daten[i] = datensatz
+                return
+        daten.append(datensatz)
+
+
+def wende_termin_an(termine, eintrag):
+    """Wendet eine Terminänderung auf termine[arzt][datum][zeit] an.
+
+    Operationen: "buchen" (arzt, datum, zeit, termin), "stornieren" (arzt,
+    datum, zeit) und "arzt_umbenennen" (alt, neu). Gibt den verdrängten bzw.
+    gelöschten Termin zurück.
+    """
+    op = eintrag["op"]
+    if op == "buchen":
+        tag_termine = termine.setdefault(eintrag["arzt"], {}).setdefault(eintrag["datum"], {})
+        vorher = tag_termine.get(eintrag["zeit"])
+        tag_termine[eintrag["zeit"]] = eintrag["termin"]
+        return vorher
+    if op == "stornieren":
+        arzt_termine = termine.get(eintrag["arzt"], {})
+        tag_termine = arzt_termine.get(eintrag["datum"], {})
+        termin = tag_termine.pop(eintrag["zeit"], None)
+        if termin is not None and not tag_termine:
+            del arzt_termine[eintrag["datum"]]
+        return termin
+    if op == "arzt_umbenennen":
+        alt, neu = eintrag["alt"], eintrag["neu"]
+        # Zahnarzt-Termine (oberste Ebene); vorhandene Termine von neu bleiben erhalten
+        if alt in termine:
+            neu_termine = termine.setdefault(neu, {})
+            for datum, tag_termine in termine.pop(alt).items():
+                neu_termine.setdefault(datum, {}).update(tag_termine)
+        # Arztname in Details ersetzen
+        for arzt_termine in termine.values():
+            for tag_termine in arzt_termine.values():
+                for termin in tag_termine.values():
+                    benenne_in_termin_um(termin, alt, neu)
+
+
+def benenne_in_termin_um(termin, alt, neu):
+    if termin.get("zahnarzt") == alt:
+        termin["zahnarzt"] = neu
+    # Fallback: Falls der Name als "arzt" gespeichert ist
+    if termin.get("arzt") == alt:
+        termin["arzt"] = neu
+
+
+def oeffne_speicher(art, ordner):
+    """Datenhaltung nach Art: "json" (Dateien im Ordner) oder "sqlite" (ordner/praxis.db)"""
+    if art == "json":
+        from gui.speicher_json import JsonSpeicher
+        return JsonSpeicher(ordner)
+    if art == "sqlite":
+        from gui.speicher_sqlite import SqliteSpeicher
+        return SqliteSpeicher(os.path.join(ordner, "praxis.db"))
+    raise ValueError(f"Unbekannte Datenhaltung: {art}")
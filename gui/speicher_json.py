@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+
+from gui.journal import Journal
+from gui.sperre import DateiSperre
+from gui.speicher import Speicher, leer, wende_an, wende_termin_an
+
+DATEIEN = {
+    "patienten": "patienten.json",
+    "zahnaerzte": "zahnaerzte.json",
+    "behandlungen": "kosten_behandlungen.json",
+    "termine": "termine.json",
+    "bilder": "zahnaerzte_bilder.json",
+}
+
+
+def speichere_daten(pfad, daten):
+    # In temporäre Datei schreiben und atomar ersetzen, damit ein Absturz
+    # nie eine halb geschriebene Datei hinterlässt
+    fd, tmp_pfad = tempfile.mkstemp(dir=os.path.dirname(pfad) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(daten, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_pfad, pfad)
+    except BaseException:
+        if os.path.exists(tmp_pfad):
+            os.remove(tmp_pfad)
+        raise
+
+
+def datei_signatur(*pfade):
+    signatur = []
+    for p in pfade:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            signatur.append(None)
+            continue
+        signatur.append((st.st_mtime_ns, st.st_size))
+    return tuple(signatur)
+
+
+class JsonSpeicher(Speicher):
+    """JSON-Dateien im Datenordner, je Datei ein Journal und eine Sperre.
+
+    Einzelne Änderungen werden ans Journal angehängt; erst wenn es voll ist,
+    wird der Snapshot komplett neu geschrieben.
+    """
+
+    def __init__(self, ordner):
+        self.ordner = ordner
+        self._journale = {}
+        self._sperren = {}
+
+    def pfad(self, sammlung):
+        return os.path.join(self.ordner, DATEIEN[sammlung])
+
+    def journal(self, sammlung):
+        if sammlung not in self._journale:
+            self._journale[sammlung] = Journal(self.pfad(sammlung))
+        return self._journale[sammlung]
+
+    def sperre(self, sammlung):
+        if sammlung not in self._sperren:
+            self._sperren[sammlung] = DateiSperre(self.pfad(sammlung))
+        return self._sperren[sammlung]
+
+    def signatur(self, sammlung):
+        return datei_signatur(self.pfad(sammlung), self.journal(sammlung).pfad)
+
+    def dateien(self, sammlung):
+        return [self.pfad(sammlung), self.journal(sammlung).pfad]
+
+    def aenderungen(self, sammlung, signatur):
+        # Solange der Snapshot derselbe ist, wurde seit signatur nur ans Journal angehängt
+        with self.sperre(sammlung):
+            aktuell = self.signatur(sammlung)
+            snapshot, journal = signatur
+            if aktuell[0] != snapshot or aktuell[1] is None or (journal is not None and aktuell[1][1] < journal[1]):
+                return None
+            eintraege = self.journal(sammlung).lesen_ab(journal[1] if journal is not None else 0)
+        return aktuell, eintraege
+
+    def lade(self, sammlung):
+        anwenden = wende_termin_an if sammlung == "termine" else wende_an
+        # Unter Sperre, damit keine gleichzeitige Kompaktierung dazwischenkommt
+        with self.sperre(sammlung):
+            try:
+                with open(self.pfad(sammlung), "r", encoding="utf-8") as f:
+                    daten = json.load(f)
+            except FileNotFoundError:
+                daten = leer(sammlung)
+            # Noch nicht kompaktierte Änderungen nachspielen
+            for eintrag in self.journal(sammlung).lesen():
+                anwenden(daten, eintrag)
+        return daten
+
+    def ersetze(self, sammlung, daten):
+        with self.sperre(sammlung):
+            speichere_daten(self.pfad(sammlung), daten)
+            self.journal(sammlung).leeren()
+
+    def _protokollieren(self, sammlung, eintrag):
+        with self.sperre(sammlung):
+            journal = self.journal(sammlung)
+            journal.anhaengen(eintrag)
+            # anzahl kennt nur die eigenen Einträge; andere Stationen hängen an dieselbe Datei an
+            journal.zaehlen()
+            if journal.voll():
+                self.ersetze(sammlung, self.lade(sammlung))
+
+    def setze(self, sammlung, datensatz, alter_name=None):
+        self._protokollieren(sammlung, {"op": "setzen", "name": alter_name or datensatz["name"], "eintrag": datensatz})
+
+    def loesche(self, sammlung, name):
+        self._protokollieren(sammlung, {"op": "loeschen", "name": name})
+
+    def aendere_termine(self, eintrag):
+        self._protokollieren("termine", eintrag)
+
+    def setze_bild(self, arzt, bild, alter_name=None):
+        with self.sperre("bilder"):
+            bilder = self.lade("bilder")
+            if alter_name is not None:
+                bilder.pop(alter_name, None)
+            bilder[arzt] = bild
+            self.ersetze("bilder", bilder)
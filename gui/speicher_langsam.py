@@ -0,0 +1,57 @@
+import time
+
+from gui.speicher import Speicher
+
+
+class LangsamerSpeicher(Speicher):
+    """Hängt an jeden Zugriff auf eine andere Datenhaltung eine feste Verzögerung.
+
+    Simuliert ein langsames Netzlaufwerk, um zu prüfen, dass die Oberfläche
+    dabei nicht einfriert: PRAXIS_LANGSAM_MS=800 python main.py
+    Die Sperren selbst werden nicht verzögert, nur die Zugriffe darin.
+    """
+
+    def __init__(self, speicher, verzoegerung):
+        self.speicher = speicher
+        self.verzoegerung = verzoegerung
+
+    def _warten(self):
+        time.sleep(self.verzoegerung)
+
+    def sperre(self, sammlung):
+        return self.speicher.sperre(sammlung)
+
+    def dateien(self, sammlung):
+        return self.speicher.dateien(sammlung)
+
+    def signatur(self, sammlung):
+        self._warten()
+        return self.speicher.signatur(sammlung)
+
+    def aenderungen(self, sammlung, signatur):
+        self._warten()
+        return self.speicher.aenderungen(sammlung, signatur)
+
+    def lade(self, sammlung):
+        self._warten()
+        return self.speicher.lade(sammlung)
+
+    def ersetze(self, sammlung, daten):
+        self._warten()
+        self.speicher.ersetze(sammlung, daten)
+
+    def setze(self, sammlung, datensatz, alter_name=None):
+        self._warten()
+        self.speicher.setze(sammlung, datensatz, alter_name)
+
+    def loesche(self, sammlung, name):
+        self._warten()
+        self.speicher.loesche(sammlung, name)
+
+    def aendere_termine(self, eintrag):
+        self._warten()
+        self.speicher.aendere_termine(eintrag)
+
+    def setze_bild(self, arzt, bild, alter_name=None):
+        self._warten()
+        self.speicher.setze_bild(arzt, bild, alter_name)
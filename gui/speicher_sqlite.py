@@ -0,0 +1,252 @@
+import json
+import sqlite3
+import threading
+
+from gui.speicher import Speicher, benenne_in_termin_um
+
+# So viele Änderungen je Sammlung bleiben im Protokoll; wer weiter zurückliegt, lädt alles
+PROTOKOLL_LAENGE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patienten (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    daten TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS patienten_name ON patienten (name);
+
+CREATE TABLE IF NOT EXISTS zahnaerzte (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    daten TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS zahnaerzte_name ON zahnaerzte (name);
+
+CREATE TABLE IF NOT EXISTS behandlungen (
+    id INTEGER PRIMARY KEY,
+    art TEXT NOT NULL UNIQUE,
+    daten TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS termine (
+    arzt TEXT NOT NULL,
+    datum TEXT NOT NULL,
+    zeit TEXT NOT NULL,
+    patient TEXT NOT NULL,
+    daten TEXT NOT NULL
+);
+-- Dient auch für Abfragen nach (arzt, datum)
+CREATE UNIQUE INDEX IF NOT EXISTS termine_arzt_datum ON termine (arzt, datum, zeit);
+CREATE INDEX IF NOT EXISTS termine_patient ON termine (patient);
+
+CREATE TABLE IF NOT EXISTS bilder (
+    arzt TEXT PRIMARY KEY,
+    bild TEXT NOT NULL
+);
+
+-- Änderungszähler je Sammlung, damit andere Stationen Änderungen erkennen
+CREATE TABLE IF NOT EXISTS zaehler (
+    sammlung TEXT PRIMARY KEY,
+    stand INTEGER NOT NULL
+);
+
+-- Die letzten Änderungen je Sammlung (stand wie in zaehler), damit andere Stationen
+-- nur diese nachladen; eintrag NULL heißt "alles ersetzt"
+CREATE TABLE IF NOT EXISTS aenderungen (
+    sammlung TEXT NOT NULL,
+    stand INTEGER NOT NULL,
+    eintrag TEXT,
+    PRIMARY KEY (sammlung, stand)
+);
+"""
+
+
+class _Transaktion:
+    """Wiedereintrittsfähige Schreibtransaktion (BEGIN IMMEDIATE ... COMMIT)"""
+
+    def __init__(self, speicher):
+        self.speicher = speicher
+        self._tiefe = 0
+
+    def __enter__(self):
+        self.speicher._lokal.acquire()
+        if self._tiefe == 0:
+            try:
+                self.speicher.db.execute("BEGIN IMMEDIATE")
+            except BaseException:
+                self.speicher._lokal.release()
+                raise
+        self._tiefe += 1
+        return self
+
+    def __exit__(self, typ, *exc):
+        self._tiefe -= 1
+        if self._tiefe == 0:
+            self.speicher.db.execute("ROLLBACK" if typ else "COMMIT")
+        self.speicher._lokal.release()
+        return False
+
+
+class SqliteSpeicher(Speicher):
+    """Alle Sammlungen in einer SQLite-Datenbank.
+
+    Schreibzugriffe laufen in einer Transaktion, die auch andere Prozesse
+    ausschließt; Datensätze werden einzeln über indizierte Schlüssel geändert.
+    """
+
+    def __init__(self, pfad):
+        self.pfad = pfad
+        # isolation_level=None: Transaktionen werden selbst gesteuert
+        self.db = sqlite3.connect(pfad, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+        self._lokal = threading.RLock()
+        self._transaktion = _Transaktion(self)
+
+    def sperre(self, sammlung):
+        # Eine Transaktion für die ganze Datenbank
+        return self._transaktion
+
+    def _zaehlen(self, sammlung, eintrag=None):
+        # Nur innerhalb einer Transaktion aufrufen: Zähler und Protokoll ändern sich gemeinsam
+        self.db.execute(
+            "INSERT INTO zaehler (sammlung, stand) VALUES (?, 1) "
+            "ON CONFLICT (sammlung) DO UPDATE SET stand = stand + 1",
+            (sammlung,),
+        )
+        stand = self.signatur(sammlung)
+        self.db.execute(
+            "INSERT OR REPLACE INTO aenderungen (sammlung, stand, eintrag) VALUES (?, ?, ?)",
+            (sammlung, stand, None if eintrag is None else _json(eintrag)),
+        )
+        self.db.execute("DELETE FROM aenderungen WHERE sammlung = ? AND stand <= ?",
+                        (sammlung, stand - PROTOKOLL_LAENGE))
+
+    def signatur(self, sammlung):
+        with self._lokal:
+            zeile = self.db.execute("SELECT stand FROM zaehler WHERE sammlung = ?", (sammlung,)).fetchone()
+        return zeile[0] if zeile else 0
+
+    def dateien(self, sammlung):
+        # Im WAL-Modus landen Änderungen zuerst in <db>-wal
+        return [self.pfad, self.pfad + "-wal"]
+
+    def aenderungen(self, sammlung, signatur):
+        with self._lokal:
+            aktuell = self.signatur(sammlung)
+            zeilen = self.db.execute(
+                "SELECT eintrag FROM aenderungen WHERE sammlung = ? AND stand > ? AND stand <= ? ORDER BY stand",
+                (sammlung, signatur, aktuell),
+            ).fetchall()
+        # Lücke (Protokoll gekürzt, Datenbank von vor dem Protokoll) oder ganz ersetzt
+        if len(zeilen) != aktuell - signatur or any(eintrag is None for eintrag, in zeilen):
+            return None
+        return aktuell, [json.loads(eintrag) for eintrag, in zeilen]
+
+    def lade(self, sammlung):
+        with self._lokal:
+            if sammlung == "termine":
+                termine = {}
+                for arzt, datum, zeit, daten in self.db.execute(
+                    "SELECT arzt, datum, zeit, daten FROM termine ORDER BY arzt, datum, zeit"
+                ):
+                    termine.setdefault(arzt, {}).setdefault(datum, {})[zeit] = json.loads(daten)
+                return termine
+            if sammlung == "bilder":
+                return dict(self.db.execute("SELECT arzt, bild FROM bilder"))
+            if sammlung in ("patienten", "zahnaerzte", "behandlungen"):
+                return [json.loads(daten) for daten, in self.db.execute(f"SELECT daten FROM {sammlung} ORDER BY id")]
+        raise KeyError(sammlung)
+
+    def ersetze(self, sammlung, daten):
+        with self._transaktion:
+            self.db.execute(f"DELETE FROM {sammlung}")
+            if sammlung == "termine":
+                self.db.executemany(
+                    "INSERT INTO termine (arzt, datum, zeit, patient, daten) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (arzt, datum, zeit, termin["patient"], _json(termin))
+                        for arzt, arzt_termine in daten.items()
+                        for datum, tag_termine in arzt_termine.items()
+                        for zeit, termin in tag_termine.items()
+                    ],
+                )
+            elif sammlung == "bilder":
+                self.db.executemany("INSERT INTO bilder (arzt, bild) VALUES (?, ?)", daten.items())
+            elif sammlung == "behandlungen":
+                self.db.executemany(
+                    "INSERT INTO behandlungen (art, daten) VALUES (?, ?)",
+                    [(b["art"], _json(b)) for b in daten],
+                )
+            else:
+                self.db.executemany(
+                    f"INSERT INTO {sammlung} (name, daten) VALUES (?, ?)",
+                    [(d["name"], _json(d)) for d in daten],
+                )
+            self._zaehlen(sammlung)
+
+    def setze(self, sammlung, datensatz, alter_name=None):
+        if sammlung not in ("patienten", "zahnaerzte"):
+            raise KeyError(sammlung)
+        with self._transaktion:
+            cursor = self.db.execute(
+                f"UPDATE {sammlung} SET name = ?, daten = ? WHERE name = ?",
+                (datensatz["name"], _json(datensatz), alter_name or datensatz["name"]),
+            )
+            if cursor.rowcount == 0:
+                self.db.execute(
+                    f"INSERT INTO {sammlung} (name, daten) VALUES (?, ?)",
+                    (datensatz["name"], _json(datensatz)),
+                )
+            self._zaehlen(sammlung, {"op": "setzen", "name": alter_name or datensatz["name"], "eintrag": datensatz})
+
+    def loesche(self, sammlung, name):
+        if sammlung not in ("patienten", "zahnaerzte"):
+            raise KeyError(sammlung)
+        with self._transaktion:
+            self.db.execute(f"DELETE FROM {sammlung} WHERE name = ?", (name,))
+            self._zaehlen(sammlung, {"op": "loeschen", "name": name})
+
+    def aendere_termine(self, eintrag):
+        op = eintrag["op"]
+        with self._transaktion:
+            if op == "buchen":
+                self.db.execute(
+                    "INSERT OR REPLACE INTO termine (arzt, datum, zeit, patient, daten) VALUES (?, ?, ?, ?, ?)",
+                    (eintrag["arzt"], eintrag["datum"], eintrag["zeit"],
+                     eintrag["termin"]["patient"], _json(eintrag["termin"])),
+                )
+            elif op == "stornieren":
+                self.db.execute(
+                    "DELETE FROM termine WHERE arzt = ? AND datum = ? AND zeit = ?",
+                    (eintrag["arzt"], eintrag["datum"], eintrag["zeit"]),
+                )
+            elif op == "arzt_umbenennen":
+                alt, neu = eintrag["alt"], eintrag["neu"]
+                try:
+                    self.db.execute("UPDATE termine SET arzt = ? WHERE arzt = ?", (neu, alt))
+                except sqlite3.IntegrityError:
+                    # Nichts überschreiben; die Transaktion wird zurückgerollt
+                    raise ValueError(f"{neu} hat schon Termine zu denselben Zeiten wie {alt}") from None
+                # Arztname in Details ersetzen; LIKE filtert grob vor
+                zeilen = self.db.execute(
+                    "SELECT rowid, daten FROM termine WHERE daten LIKE ?", (f"%{_json(alt)}%",)
+                ).fetchall()
+                for rowid, daten in zeilen:
+                    termin = json.loads(daten)
+                    benenne_in_termin_um(termin, alt, neu)
+                    self.db.execute("UPDATE termine SET daten = ? WHERE rowid = ?", (_json(termin), rowid))
+            else:
+                raise ValueError(f"Unbekannte Terminänderung: {op}")
+            self._zaehlen("termine", eintrag)
+
+    def setze_bild(self, arzt, bild, alter_name=None):
+        with self._transaktion:
+            if alter_name is not None:
+                self.db.execute("DELETE FROM bilder WHERE arzt = ?", (alter_name,))
+            self.db.execute("INSERT OR REPLACE INTO bilder (arzt, bild) VALUES (?, ?)", (arzt, bild))
+            self._zaehlen("bilder")
+
+
+def _json(wert):
+    return json.dumps(wert, ensure_ascii=False)
@@ -0,0 +1,66 @@
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class DateiSperre:
+    """Exklusive, prozessübergreifende Sperre über eine <datei>.lock-Datei.
+
+    Mehrere Stationen, die denselben Datenordner nutzen, schreiben damit nie
+    gleichzeitig. Die Sperre ist im selben Prozess wiedereintrittsfähig.
+    """
+
+    def __init__(self, pfad_daten):
+        self.pfad = pfad_daten + ".lock"
+        self._lokal = threading.RLock()
+        self._tiefe = 0
+        self._datei = None
+
+    def __enter__(self):
+        self._lokal.acquire()
+        if self._tiefe == 0:
+            try:
+                self._datei = open(self.pfad, "a+")
+                self._sperren()
+            except BaseException:
+                if self._datei:
+                    self._datei.close()
+                    self._datei = None
+                self._lokal.release()
+                raise
+        self._tiefe += 1
+        return self
+
+    def __exit__(self, *exc):
+        self._tiefe -= 1
+        if self._tiefe == 0:
+            self._entsperren()
+            self._datei.close()
+            self._datei = None
+        self._lokal.release()
+        return False
+
+    def _sperren(self):
+        if fcntl:
+            fcntl.flock(self._datei.fileno(), fcntl.LOCK_EX)
+            return
+        # msvcrt.locking gibt nach ca. 10 Sekunden auf, deshalb wiederholen
+        while True:
+            try:
+                self._datei.seek(0)
+                msvcrt.locking(self._datei.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def _entsperren(self):
+        if fcntl:
+            fcntl.flock(self._datei.fileno(), fcntl.LOCK_UN)
+        else:
+            self._datei.seek(0)
+            msvcrt.locking(self._datei.fileno(), msvcrt.LK_UNLCK, 1)
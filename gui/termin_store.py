@@ -0,0 +1,340 @@
+import threading
+from bisect import bisect_left, insort
+
+from gui.data_manager import speicher
+from gui.speicher import wende_termin_an
+
+# Unterscheiden sich nach einem kompletten Neuladen mehr Tage, wird "alles geändert" gemeldet
+EINZELN_MELDEN_BIS = 50
+
+
+def _ueberschneiden(alt_termine, neu_termine):
+    return any(zeit in neu_termine.get(datum, {}) for datum, tag_termine in alt_termine.items() for zeit in tag_termine)
+
+
+def geaenderte_tage(alt, neu):
+    """(arzt, datum) aller Tage, deren Termine sich zwischen alt und neu unterscheiden"""
+    tage = []
+    for arzt in alt.keys() | neu.keys():
+        alt_arzt, neu_arzt = alt.get(arzt, {}), neu.get(arzt, {})
+        for datum in alt_arzt.keys() | neu_arzt.keys():
+            if alt_arzt.get(datum) != neu_arzt.get(datum):
+                tage.append((arzt, datum))
+    return tage
+
+
+class TerminStore:
+    """Hält alle Termine einmal pro Prozess im Speicher.
+
+    Die Termine werden nur neu gelesen, wenn sich die Signatur der
+    Datenhaltung geändert hat (z.B. durch eine andere Instanz der App);
+    liefert die Datenhaltung die Änderungen einzeln, werden nur diese
+    angewendet. Beobachter erfahren in beiden Fällen nur die betroffenen
+    Tage.
+    Änderungen werden einzeln an die Datenhaltung übergeben. Alle
+    Schreibzugriffe laufen unter ihrer Sperre und sehen vorher den
+    aktuellen Stand. Sie bestehen aus zwei Schritten, damit der erste in
+    einem Worker-Thread laufen kann: schreibe (nur Datenhaltung) und
+    uebernimm_aenderung (Speicher, Indizes, Beobachter; nur im GUI-Thread).
+    """
+
+    def __init__(self, speicher):
+        self.speicher = speicher
+        self.sperre = speicher.sperre("termine")
+        self._signatur = None
+        # Wird bei jeder Änderung erhöht, damit abgeleitete Caches veralten
+        self.version = 0
+        # termine[arzt][datum][zeit] -> Termin (Index nach Arzt und Datum)
+        self._termine = {}
+        # patient -> nach (datum, zeit, arzt) sortierte Liste
+        self._nach_patient = {}
+        # Änderungszähler je Patient; _generation zählt, wie oft "alles" geändert wurde
+        self._patient_versionen = {}
+        self._generation = 0
+        # minuten[arzt][datum] -> Summe der gebuchten Dauer (für die Auslastung)
+        self._minuten = {}
+        # Rückrufe beobachter(arzt, datum) bei jeder Änderung; (None, None) heißt "alles"
+        self._beobachter = []
+        # Lesezugriffe gleichen vorher mit der Datenhaltung ab; False, sobald das
+        # der DatenWaechter im Hintergrund erledigt
+        self.abgleich_beim_lesen = True
+        # Termine werden nur im GUI-Thread verändert; schreibe liest einen Tag im Worker unter dieser Sperre
+        self._lock = threading.Lock()
+
+    def beobachten(self, rueckruf):
+        self._beobachter.append(rueckruf)
+
+    def abbestellen(self, rueckruf):
+        if rueckruf in self._beobachter:
+            self._beobachter.remove(rueckruf)
+
+    def _melden(self, arzt, datum):
+        for rueckruf in list(self._beobachter):
+            rueckruf(arzt, datum)
+
+    def aktualisieren(self):
+        if not self.abgleich_beim_lesen or self.speicher.signatur("termine") == self._signatur:
+            return
+        with self.sperre:
+            signatur = self.speicher.signatur("termine")
+            termine = self.speicher.lade("termine")
+        self._ersetzen(termine, signatur)
+
+    def bekannte_signatur(self):
+        """Signatur des Stands, auf dem die Termine im Speicher beruhen"""
+        return self._signatur
+
+    def uebernehme(self, signatur, termine, vorher):
+        """Übernimmt einen im Hintergrund geladenen Stand (nur im GUI-Thread aufrufen).
+
+        vorher ist die bekannte_signatur beim Laden. Gibt False zurück, wenn
+        sich der Speicher seitdem geändert hat (z.B. durch eine eigene
+        Buchung); dann muss neu geladen werden.
+        """
+        if signatur == self._signatur:
+            return True
+        if self._signatur != vorher:
+            return False
+        self._ersetzen(termine, signatur)
+        return True
+
+    def uebernimm_aenderungen(self, signatur, eintraege, vorher):
+        """Übernimmt einzelne Änderungen (speicher.aenderungen) wie uebernehme (nur im GUI-Thread)"""
+        if signatur == self._signatur:
+            return True
+        if self._signatur != vorher:
+            return False
+        tage = {}
+        for eintrag in eintraege:
+            # Eigene Änderungen kommen im Protokoll noch einmal an
+            if self._schon_angewendet(eintrag):
+                continue
+            self._anwenden(eintrag)
+            tage[(None, None) if eintrag["op"] == "arzt_umbenennen" else (eintrag["arzt"], eintrag["datum"])] = True
+        self._signatur = signatur
+        if tage:
+            self.version += 1
+            for arzt, datum in ([(None, None)] if (None, None) in tage else tage):
+                self._melden(arzt, datum)
+        return True
+
+    def _schon_angewendet(self, eintrag):
+        if eintrag["op"] == "arzt_umbenennen":
+            return False
+        tag_termine = self._termine.get(eintrag["arzt"], {}).get(eintrag["datum"], {})
+        if eintrag["op"] == "buchen":
+            return tag_termine.get(eintrag["zeit"]) == eintrag["termin"]
+        return eintrag["zeit"] not in tag_termine
+
+    def _ersetzen(self, termine, signatur):
+        alt = self._termine
+        # Beim ersten Laden ist alles neu
+        tage = geaenderte_tage(alt, termine) if self._signatur is not None else None
+        self._termine = termine
+        self._indexiere()
+        self._signatur = signatur
+        self.version += 1
+        if tage is None or len(tage) > EINZELN_MELDEN_BIS:
+            self._generation += 1
+            self._melden(None, None)
+            return
+        for arzt, datum in tage:
+            for tag_termine in (alt.get(arzt, {}).get(datum, {}), termine.get(arzt, {}).get(datum, {})):
+                for termin in tag_termine.values():
+                    self._patient_geaendert(termin["patient"])
+            self._melden(arzt, datum)
+
+    def stand(self):
+        """Aktuelle Version, nachdem Änderungen anderer Stationen übernommen wurden"""
+        self.aktualisieren()
+        return self.version
+
+    def patient_stand(self, patient):
+        """Stand der Termine eines Patienten (ändert sich nur, wenn sich seine Termine ändern)"""
+        self.aktualisieren()
+        return self._generation, self._patient_versionen.get(patient, 0)
+
+    def _patient_geaendert(self, patient):
+        self._patient_versionen[patient] = self._patient_versionen.get(patient, 0) + 1
+
+    def _indexiere(self):
+        self._nach_patient = {}
+        self._minuten = {}
+        for arzt, arzt_termine in self._termine.items():
+            for datum, tag_termine in arzt_termine.items():
+                for zeit, termin in tag_termine.items():
+                    self._nach_patient.setdefault(termin["patient"], []).append((datum, zeit, arzt))
+                    self._minuten_addieren(arzt, datum, termin["dauer"])
+        for eintraege in self._nach_patient.values():
+            eintraege.sort()
+
+    def _minuten_addieren(self, arzt, datum, dauer):
+        arzt_minuten = self._minuten.setdefault(arzt, {})
+        summe = arzt_minuten.get(datum, 0) + dauer
+        if summe:
+            arzt_minuten[datum] = summe
+        else:
+            arzt_minuten.pop(datum, None)
+
+    def _index_hinzufuegen(self, patient, arzt, datum, zeit):
+        insort(self._nach_patient.setdefault(patient, []), (datum, zeit, arzt))
+        self._patient_geaendert(patient)
+
+    def _index_entfernen(self, patient, arzt, datum, zeit):
+        self._patient_geaendert(patient)
+        eintraege = self._nach_patient.get(patient, [])
+        i = bisect_left(eintraege, (datum, zeit, arzt))
+        if i < len(eintraege) and eintraege[i] == (datum, zeit, arzt):
+            del eintraege[i]
+        if not eintraege:
+            self._nach_patient.pop(patient, None)
+
+    def _anwenden(self, eintrag):
+        """Führt eine Änderung im Speicher aus und hält den Patienten-Index aktuell"""
+        op = eintrag["op"]
+        if op == "arzt_umbenennen":
+            # Nur die Patienten dieses Arztes im Index nachziehen
+            alt, neu = eintrag["alt"], eintrag["neu"]
+            betroffen = [
+                (termin["patient"], datum, zeit)
+                for datum, tag_termine in self._termine.get(alt, {}).items()
+                for zeit, termin in tag_termine.items()
+            ]
+            with self._lock:
+                wende_termin_an(self._termine, eintrag)
+            for patient, datum, zeit in betroffen:
+                self._index_entfernen(patient, alt, datum, zeit)
+                self._index_hinzufuegen(patient, neu, datum, zeit)
+            for datum, minuten in self._minuten.pop(alt, {}).items():
+                self._minuten_addieren(neu, datum, minuten)
+            return None
+        arzt, datum, zeit = eintrag["arzt"], eintrag["datum"], eintrag["zeit"]
+        with self._lock:
+            termin = wende_termin_an(self._termine, eintrag)
+        if termin is not None:
+            self._index_entfernen(termin["patient"], arzt, datum, zeit)
+            self._minuten_addieren(arzt, datum, -termin["dauer"])
+        if op == "buchen":
+            self._index_hinzufuegen(eintrag["termin"]["patient"], arzt, datum, zeit)
+            self._minuten_addieren(arzt, datum, eintrag["termin"]["dauer"])
+        return termin
+
+    def schreibe(self, eintrag, pruefen=None):
+        """Führt eine Terminänderung nur in der Datenhaltung aus; darf in einem Worker-Thread laufen.
+
+        Unter der Sperre wird der aktuelle Stand des betroffenen Tages
+        gelesen (aus dem Speicher oder, falls der veraltet ist, aus der
+        Datenhaltung). pruefen(tag_termine) kann die Änderung dann noch
+        ablehnen, eine Stornierung entfällt, wenn der Termin fehlt, ein
+        Umbenennen, wenn der neue Name schon Termine zu denselben Zeiten hat. Gibt eine
+        Quittung für uebernimm_aenderung zurück; "termin" ist der Termin,
+        der vorher an dieser Stelle stand.
+        """
+        with self.sperre:
+            vorher = self.speicher.signatur("termine")
+            if eintrag["op"] == "arzt_umbenennen":
+                tag_termine = {}
+            elif vorher == self._signatur:
+                with self._lock:
+                    tag_termine = dict(self._termine.get(eintrag["arzt"], {}).get(eintrag["datum"], {}))
+            else:
+                tag_termine = self.speicher.lade("termine").get(eintrag["arzt"], {}).get(eintrag["datum"], {})
+            if eintrag["op"] == "arzt_umbenennen":
+                ok = not self._doppelt_belegt(eintrag["alt"], eintrag["neu"], vorher)
+            elif eintrag["op"] == "stornieren":
+                ok = eintrag["zeit"] in tag_termine
+            else:
+                ok = pruefen is None or pruefen(tag_termine)
+            if ok:
+                self.speicher.aendere_termine(eintrag)
+            nachher = self.speicher.signatur("termine")
+        return {"eintrag": eintrag, "ok": ok, "termin": tag_termine.get(eintrag.get("zeit")),
+                "vorher": vorher, "nachher": nachher}
+
+    def _doppelt_belegt(self, alt, neu, signatur):
+        # True, wenn neu schon Termine zu Zeiten von alt hat (Umbenennen würde sie überschreiben)
+        if signatur == self._signatur:
+            with self._lock:
+                return _ueberschneiden(self._termine.get(alt, {}), self._termine.get(neu, {}))
+        termine = self.speicher.lade("termine")
+        return _ueberschneiden(termine.get(alt, {}), termine.get(neu, {}))
+
+    def uebernimm_aenderung(self, quittung):
+        """Übernimmt eine Quittung von schreibe in den Speicher (nur im GUI-Thread) und gibt sie zurück"""
+        if not quittung["ok"]:
+            return quittung
+        eintrag = quittung["eintrag"]
+        self._anwenden(eintrag)
+        # War der Speicher vorher aktuell, ist er es jetzt auch; sonst holt der nächste Abgleich den Rest
+        if self._signatur == quittung["vorher"]:
+            self._signatur = quittung["nachher"]
+        self.version += 1
+        if eintrag["op"] == "arzt_umbenennen":
+            self._melden(None, None)
+        else:
+            self._melden(eintrag["arzt"], eintrag["datum"])
+        return quittung
+
+    # Lesezugriffe (Rückgabewerte nicht verändern!)
+    def arzt_termine(self, arzt):
+        self.aktualisieren()
+        return self._termine.get(arzt, {})
+
+    def tag_termine(self, arzt, datum):
+        self.aktualisieren()
+        return self._termine.get(arzt, {}).get(datum, {})
+
+    def gebuchte_minuten(self, arzt):
+        """datum -> Summe der gebuchten Minuten eines Arztes (nur Tage mit Terminen)"""
+        self.aktualisieren()
+        return self._minuten.get(arzt, {})
+
+    def patient_termine(self, patient):
+        """Alle Termine eines Patienten als Liste von Dicts, nach Datum und Zeit sortiert"""
+        self.aktualisieren()
+        ergebnis = []
+        for datum, zeit, arzt in self._nach_patient.get(patient, []):
+            termin = self._termine[arzt][datum][zeit]
+            ergebnis.append(dict(termin, arzt=arzt, datum=datum, zeit=zeit))
+        return ergebnis
+
+    # Schreibzugriffe
+    def buche(self, arzt, datum, zeit, termin, pruefen=None):
+        """Bucht einen Termin.
+
+        pruefen(tag_termine) wird unter der Sperre mit dem aktuellen Stand des
+        Tages aufgerufen; liefert es False, ist der Slot inzwischen vergeben und
+        buche gibt False zurück.
+        """
+        eintrag = {"op": "buchen", "arzt": arzt, "datum": datum, "zeit": zeit, "termin": termin}
+        return self.uebernimm_aenderung(self.schreibe(eintrag, pruefen))["ok"]
+
+    def storniere(self, arzt, datum, zeit):
+        """Löscht einen Termin und gibt ihn zurück (None falls nicht vorhanden)"""
+        quittung = self.uebernimm_aenderung(self.schreibe({"op": "stornieren", "arzt": arzt, "datum": datum, "zeit": zeit}))
+        return quittung["termin"] if quittung["ok"] else None
+
+    def benenne_arzt_um(self, alter_name, neuer_name):
+        """Benennt einen Zahnarzt in allen Terminen um; False, wenn sich Termine überschneiden würden"""
+        return self.uebernimm_aenderung(self.schreibe({"op": "arzt_umbenennen", "alt": alter_name, "neu": neuer_name}))["ok"]
+
+    def repariere_umbenennungen(self, zahnaerzte):
+        """Holt Termine nach, die bei einer abgebrochenen Umbenennung unter dem alten Namen geblieben sind.
+
+        Beim Umbenennen wird zuerst der Zahnarzt mit "frueherer_name"
+        gespeichert, danach werden die Termine umbenannt. Stürzt eine Station
+        dazwischen ab, stehen Termine unter einem Namen, den kein Zahnarzt
+        mehr hat; sie werden hier (beim Programmstart) dem Zahnarzt
+        zugeordnet. Gibt die reparierten (alt, neu)-Paare zurück.
+        """
+        bekannt = {arzt["name"] for arzt in zahnaerzte}
+        repariert = []
+        for arzt in zahnaerzte:
+            alt = arzt.get("frueherer_name")
+            if alt and alt not in bekannt and self.arzt_termine(alt) and self.benenne_arzt_um(alt, arzt["name"]):
+                repariert.append((alt, arzt["name"]))
+        return repariert
+
+
+# Gemeinsame Instanz für die ganze App
+termin_store = TerminStore(speicher)
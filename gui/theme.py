@@ -0,0 +1,335 @@
+"""Gemeinsames Stylesheet der App, wird einmal beim Start gesetzt.
+
+Widgets bekommen keine eigenen Stylesheets mehr, sondern einen objectName
+(einzelne Widgets) oder die Eigenschaft "stil" (wiederkehrende Rollen).
+Container, deren Aussehen früher über "QFrame { ... }" an alle
+QFrame-Kinder (auch QLabel) weitergegeben wurde, haben dafür eine
+zusätzliche Regel "[stil=...] QFrame". Die Regeln stehen von außen nach
+innen, damit bei gleicher Spezifität wie früher der nächste Container gilt.
+"""
+from gui.data_manager import STYLE
+
+THEME = STYLE + """
+/* ---- Container (von außen nach innen) ---- */
+
+QFrame[stil="kopf"], [stil="kopf"] QFrame {
+    background-color: white;
+    border-radius: 10px;
+    padding: 12px;
+}
+
+QFrame[stil="karte"], [stil="karte"] QFrame {
+    background-color: white;
+    border-radius: 10px;
+    padding: 20px;
+}
+
+QFrame[stil="transparent"], [stil="transparent"] QFrame {
+    background-color: transparent;
+    border: none;
+}
+
+QFrame[stil="analyse"], [stil="analyse"] QFrame {
+    background-color: #e8f4f8;
+    border-radius: 8px;
+    padding: 15px;
+}
+
+QFrame[stil="behandlung"], [stil="behandlung"] QFrame {
+    background-color: white;
+    border-radius: 5px;
+    padding: 10px;
+    margin: 5px 0px;
+}
+
+QFrame[stil="zusammenfassung"], [stil="zusammenfassung"] QFrame {
+    background-color: #e8f4f8;
+    border-radius: 8px;
+    padding: 6px;
+    margin-top: 6px;
+    margin-left: 20px;
+    max-width: 1220px;
+}
+
+QFrame[stil="gruppe"], [stil="gruppe"] QFrame {
+    background-color: #f8f9fa;
+    border-radius: 8px;
+    padding: 15px;
+    margin-bottom: 15px;
+}
+
+QFrame[stil="letzte_gruppe"], [stil="letzte_gruppe"] QFrame {
+    background-color: #f8f9fa;
+    border-radius: 8px;
+    padding: 15px;
+}
+
+QFrame[stil="kalender"], [stil="kalender"] QFrame {
+    background-color: #f8f9fa;
+    border-radius: 8px;
+    padding: 4px 0 4px 0;
+}
+
+QFrame[stil="zeitwahl"], [stil="zeitwahl"] QFrame {
+    background-color: #f8f9fa;
+    border-radius: 5px;
+    padding: 10px;
+    margin-top: 10px;
+}
+
+/* ---- Einzelne Widgets ---- */
+
+QStackedWidget#seiten {
+    padding: 0px;
+}
+
+QListView#arzt_karten {
+    border: none;
+    background: transparent;
+    padding: 0px;
+}
+
+QAbstractScrollArea#wochen_agenda {
+    border: none;
+    background: white;
+    padding: 0px;
+}
+
+QScrollArea[stil="liste"], QListView#termin_liste {
+    border: 5px solid #E8F4F8;
+}
+
+QScrollArea#analyse_liste {
+    margin-left: 0px;
+}
+
+QLabel#begruessung {
+    font-size: 22px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin: 0px;
+    padding: 0px;
+}
+
+QLabel#profilbild {
+    background-color: #3498db;
+    border-radius: 50px;
+    color: white;
+    font-size: 36px;
+    font-weight: bold;
+}
+
+QLabel#willkommen {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+}
+
+QLabel#passwort_titel {
+    font-size: 18px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+}
+
+QLabel[stil="titel"] {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 20px;
+}
+
+QLabel[stil="formular_titel"] {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+}
+
+QLabel[stil="abschnitt"] {
+    font-weight: bold;
+    font-size: 16px;
+    color: #2c3e50;
+}
+
+QLabel[stil="kalender_titel"] {
+    font-size: 16px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 4px;
+}
+
+QLabel[stil="liste_titel"] {
+    font-size: 15px;
+    font-weight: bold;
+    color: #2c3e50;
+    margin: 10px 0 6px 0;
+}
+
+QLabel[stil="spalte"] {
+    font-weight: bold;
+    font-size: 15px;
+    color: #2c3e50;
+    border-bottom: 1px solid #d0d0d0;
+    background: #f8f9fa;
+    padding: 8px 2px;
+}
+
+QLabel[stil="grau"] {
+    color: #7f8c8d;
+}
+
+QLabel#registrieren_hinweis {
+    margin-top: 10px;
+}
+
+QLabel[stil="info"] {
+    font-size: 16px;
+    color: #7f8c8d;
+    margin-bottom: 10px;
+}
+
+QLabel[stil="leer"] {
+    color: #7f8c8d;
+    font-size: 15px;
+    padding: 16px;
+}
+
+QLabel[stil="link"] {
+    color: #3498db;
+}
+
+QLabel[stil="fett"], QCheckBox[stil="fett"] {
+    color: #2c3e50;
+    font-weight: bold;
+}
+
+QCheckBox[stil="eingerueckt"] {
+    color: #2c3e50;
+    margin-left: 10px;
+}
+
+QLabel[stil="summe"] {
+    font-size: 22px;
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+QLabel[stil="betrag"] {
+    color: #2c3e50;
+    font-size: 18px;
+}
+
+QLabel[stil="betrag"][art="erstattung"] {
+    color: #27ae60;
+}
+
+QLabel[stil="betrag"][art="eigenanteil"] {
+    color: #e74c3c;
+}
+
+QLabel#kosten {
+    background-color: #f8f9fa;
+    padding: 10px;
+    border-radius: 5px;
+    margin-top: 10px;
+}
+
+QToolButton#passwort_umschalter {
+    border: none;
+    padding: 0 8px;
+}
+
+QComboBox#uhrzeit {
+    padding: 5px;
+    border: 1px solid #e0e0e0;
+    border-radius: 3px;
+    min-width: 100px;
+}
+
+QMessageBox#buchung QLabel {
+    text-align: left;
+}
+
+/* ---- Buttons ---- */
+
+QPushButton[stil="menue"] {
+    background-color: transparent;
+    color: #2c3e50;
+    text-align: left;
+    padding: 12px;
+    border-radius: 5px;
+    font-weight: normal;
+}
+
+QPushButton[stil="menue"]:hover {
+    background-color: #f0f0f0;
+}
+
+QPushButton#abmelden {
+    background-color: #e74c3c;
+    color: white;
+    text-align: center;
+    padding: 12px;
+    border-radius: 5px;
+    font-weight: bold;
+    margin-top: 10px;
+}
+
+QPushButton#abmelden:hover {
+    background-color: #c0392b;
+}
+
+QPushButton[stil="gruen"] {
+    background-color: #2ecc71;
+}
+
+QPushButton[stil="gruen"]:hover {
+    background-color: #27ae60;
+}
+
+QPushButton[stil="entfernen"] {
+    background-color: #e74c3c;
+    color: white;
+    border-radius: 10px;
+    padding: 2px 6px;
+    font-weight: bold;
+}
+
+QPushButton[stil="entfernen"]:hover {
+    background-color: #c0392b;
+}
+
+QPushButton[stil="umrandet"] {
+    background-color: transparent;
+    color: #3498db;
+    border: 1px solid #3498db;
+    padding: 5px;
+}
+
+QPushButton[stil="umrandet"]:hover {
+    background-color: #f0f9ff;
+}
+
+QPushButton#bestaetigen {
+    background-color: #2ecc71;
+    color: white;
+    border: none;
+    padding: 8px 15px;
+    border-radius: 3px;
+}
+
+QPushButton#bestaetigen:disabled {
+    background-color: #bdc3c7;
+}
+
+QPushButton#bestaetigen:hover:!disabled {
+    background-color: #27ae60;
+}
+"""
+
+
+def wende_theme_an(app):
+    """Setzt das Stylesheet für die ganze Anwendung (einmal, vor dem ersten Fenster)"""
+    app.setStyleSheet(THEME)
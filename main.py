@@ -3,10 +3,17 @@ from PyQt5.QtWidgets import QApplication, QSplashScreen
 from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtCore import Qt, QTimer
 from gui.login import LoginFenster
+from gui.theme import wende_theme_an
+from gui.data_manager import zahnaerzte
+from gui.termin_store import termin_store
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon('tooth_logo.png'))
+    # Ein Stylesheet für alle Fenster, statt eines je Widget
+    wende_theme_an(app)
+    # Termine einer durch einen Absturz abgebrochenen Zahnarzt-Umbenennung nachholen
+    termin_store.repariere_umbenennungen(zahnaerzte)
 
     # Splash Screen erstellen
     pixmap = QPixmap("start.png")
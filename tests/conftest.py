@@ -0,0 +1,23 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+# Die Module unter gui/ laden die Daten schon beim Import: vorher auf eine Kopie von data/ umstellen
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATEN = tempfile.mkdtemp(prefix="praxis-test-")
+shutil.copytree(os.path.join(PROJEKT, "data"), DATEN, dirs_exist_ok=True,
+                ignore=shutil.ignore_patterns("*.journal", "*.lock", "*.tmp", "*.db*"))
+os.environ["PRAXIS_DATEN"] = DATEN
+os.environ["PRAXIS_SPEICHER"] = "json"
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, PROJEKT)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Eine QApplication für alle Tests mit Fenstern (muss bis zum Ende leben)"""
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,78 @@
+import pytest
+
+from gui import data_manager
+from gui.data_manager import (
+    bekannte_signatur, eintrag_stand, finde_eintrag, patienten, schreibe_eintrag, speicher, synchronisiere,
+    uebernimm_aenderungen, uebernimm_eintrag,
+)
+
+
+def patient(name):
+    return {"name": name, "passwort": "x", "krankenkasse": "gesetzlich", "probleme": [], "passwort_geaendert": True}
+
+
+@pytest.fixture
+def vorhanden():
+    """Patienten "Ida" und "Ole" wie von einer anderen Station angelegt; danach der alte Stand"""
+    vorher = data_manager.lade_daten("patienten")
+    speicher.ersetze("patienten", vorher + [patient("Ida"), patient("Ole")])
+    synchronisiere("patienten", patienten)
+    yield
+    speicher.ersetze("patienten", vorher)
+    synchronisiere("patienten", patienten)
+
+
+def namen():
+    return [p["name"] for p in patienten]
+
+
+def test_geloescht_beim_neu_laden(vorhanden):
+    ida = finde_eintrag("patienten", patienten, "Ida")
+    stand = eintrag_stand("patienten", patienten, "Ida")
+    # Andere Station schreibt die Sammlung ohne Ida neu (kein einzelner Protokolleintrag)
+    speicher.ersetze("patienten", [p for p in data_manager.lade_daten("patienten") if p["name"] != "Ida"])
+    synchronisiere("patienten", patienten)
+    assert "Ida" not in namen() and "Ole" in namen()
+    assert all(p is not ida for p in patienten)
+    assert finde_eintrag("patienten", patienten, "Ida") is None
+    assert eintrag_stand("patienten", patienten, "Ida") != stand
+
+
+def test_geloescht_im_protokoll(vorhanden):
+    vorher = bekannte_signatur("patienten")
+    speicher.loesche("patienten", "Ida")
+    signatur, eintraege = speicher.aenderungen("patienten", vorher)
+    assert eintraege == [{"op": "loeschen", "name": "Ida"}]
+    assert uebernimm_aenderungen("patienten", signatur, eintraege, vorher) == ["Ida"]
+    assert "Ida" not in namen() and "Ole" in namen()
+    assert finde_eintrag("patienten", patienten, "Ida") is None
+    # Die Datenhaltung selbst (Snapshot + Journal) kennt Ida auch nicht mehr
+    assert "Ida" not in [p["name"] for p in speicher.lade("patienten")]
+
+
+def test_schreiben_nach_umbenennung_anderswo(vorhanden):
+    umbenannt = dict(patient("Ida"), name="Ida Neu")
+    speicher.setze("patienten", umbenannt, "Ida")
+    quittung = schreibe_eintrag("patienten", "Ida", lambda p: p["probleme"].append({"art": "Karies"}))
+    assert not quittung["ok"]
+    assert uebernimm_eintrag(quittung) is None
+    # Nichts geschrieben, auch kein neuer Datensatz "Ida"
+    gespeichert = {p["name"]: p for p in speicher.lade("patienten")}
+    assert "Ida" not in gespeichert and gespeichert["Ida Neu"]["probleme"] == []
+    synchronisiere("patienten", patienten)
+    assert "Ida" not in namen() and "Ida Neu" in namen()
+
+
+def test_schreiben_nach_loeschung_anderswo(vorhanden):
+    speicher.loesche("patienten", "Ole")
+    quittung = schreibe_eintrag("patienten", "Ole", lambda p: p.update(krankenkasse="privat"))
+    assert not quittung["ok"]
+    assert "Ole" not in [p["name"] for p in speicher.lade("patienten")]
+
+
+def test_schreiben_aktueller_stand(vorhanden):
+    quittung = schreibe_eintrag("patienten", "Ole", lambda p: p.update(krankenkasse="privat"))
+    assert quittung["ok"]
+    uebernimm_eintrag(quittung)
+    assert finde_eintrag("patienten", patienten, "Ole")["krankenkasse"] == "privat"
+    assert not schreibe_eintrag("patienten", "Niemand", lambda p: None)["ok"]
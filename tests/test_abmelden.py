@@ -0,0 +1,54 @@
+import gc
+import weakref
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QMessageBox
+
+from gui.daten_dienst import daten_dienst
+from gui.daten_waechter import daten_waechter
+
+
+def aufraeumen(qapp):
+    # deleteLater (WA_DeleteOnClose) und die danach freigegebenen Signal-Verbindungen abarbeiten
+    for _ in range(2):
+        qapp.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def offenes(fensterklasse):
+    # Geschlossene Fenster stehen bis zum deleteLater noch in der Liste
+    from components import main_window
+    return next(f for f in main_window._offene_fenster if isinstance(f, fensterklasse) and f.isVisible())
+
+
+def verbindungen():
+    waechter, dienst = daten_waechter(), daten_dienst()
+    return (waechter.receivers(waechter.geaendert), waechter.receivers(waechter.fehler),
+            dienst.receivers(dienst.fehler))
+
+
+def test_abmelden_gibt_fenster_frei(qapp, monkeypatch):
+    from components import main_window
+    from gui.login import LoginFenster
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: None))
+    aufraeumen(qapp)
+    vorher = verbindungen()
+    login = LoginFenster()
+    alte = []
+    for _ in range(3):
+        login.benutzername.setText("Frau Meyer")
+        login.passwort.setText("P111")
+        login.pruefe_login()
+        fenster = offenes(main_window.MainFenster)
+        assert verbindungen() == tuple(n + 1 for n in vorher)
+        alte.append(weakref.ref(fenster))
+        fenster.logout()
+        login = offenes(LoginFenster)
+        del fenster
+        aufraeumen(qapp)
+        assert verbindungen() == vorher
+    login.close()
+    aufraeumen(qapp)
+    assert [fenster() for fenster in alte] == [None, None, None]
+    assert not main_window._offene_fenster
@@ -0,0 +1,135 @@
+import pytest
+
+from gui.speicher import wende_termin_an
+from gui.speicher_json import JsonSpeicher
+from gui.speicher_sqlite import SqliteSpeicher
+from gui.termin_store import TerminStore
+
+
+def termin(patient):
+    return {"patient": patient, "behandlung": "Krone", "dauer": 30}
+
+
+def buchen(arzt, datum, zeit, patient):
+    return {"op": "buchen", "arzt": arzt, "datum": datum, "zeit": zeit, "termin": termin(patient)}
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def speicher(request, tmp_path):
+    if request.param == "json":
+        return JsonSpeicher(str(tmp_path))
+    return SqliteSpeicher(str(tmp_path / "praxis.db"))
+
+
+def test_umbenennen_behaelt_vorhandene_termine(speicher):
+    speicher.aendere_termine(buchen("Dr. Alt", "2031-01-06", "08:00", "A"))
+    speicher.aendere_termine(buchen("Dr. Neu", "2031-01-06", "09:00", "B"))
+    speicher.aendere_termine({"op": "arzt_umbenennen", "alt": "Dr. Alt", "neu": "Dr. Neu"})
+    termine = speicher.lade("termine")
+    assert "Dr. Alt" not in termine
+    assert termine["Dr. Neu"]["2031-01-06"] == {"08:00": termin("A"), "09:00": termin("B")}
+
+
+def test_sqlite_ueberschreibt_beim_umbenennen_nichts(tmp_path):
+    speicher = SqliteSpeicher(str(tmp_path / "praxis.db"))
+    speicher.aendere_termine(buchen("Dr. Alt", "2031-01-06", "08:00", "A"))
+    speicher.aendere_termine(buchen("Dr. Neu", "2031-01-06", "08:00", "B"))
+    stand = speicher.signatur("termine")
+    with pytest.raises(ValueError):
+        speicher.aendere_termine({"op": "arzt_umbenennen", "alt": "Dr. Alt", "neu": "Dr. Neu"})
+    termine = speicher.lade("termine")
+    assert termine["Dr. Alt"]["2031-01-06"]["08:00"] == termin("A")
+    assert termine["Dr. Neu"]["2031-01-06"]["08:00"] == termin("B")
+    assert speicher.signatur("termine") == stand
+
+
+def test_store_lehnt_umbenennen_bei_ueberschneidung_ab(speicher):
+    store = TerminStore(speicher)
+    assert store.buche("Dr. Alt", "2031-01-06", "08:00", termin("A"))
+    assert store.buche("Dr. Neu", "2031-01-06", "08:00", termin("B"))
+    assert not store.benenne_arzt_um("Dr. Alt", "Dr. Neu")
+    assert store.tag_termine("Dr. Alt", "2031-01-06") == {"08:00": termin("A")}
+    assert store.tag_termine("Dr. Neu", "2031-01-06") == {"08:00": termin("B")}
+
+
+def test_store_fuehrt_termine_beim_umbenennen_zusammen(speicher):
+    store = TerminStore(speicher)
+    store.buche("Dr. Alt", "2031-01-06", "08:00", termin("A"))
+    store.buche("Dr. Neu", "2031-01-06", "09:00", termin("B"))
+    assert store.benenne_arzt_um("Dr. Alt", "Dr. Neu")
+    assert set(store.tag_termine("Dr. Neu", "2031-01-06")) == {"08:00", "09:00"}
+    assert store.gebuchte_minuten("Dr. Neu") == {"2031-01-06": 60}
+    assert [t["arzt"] for t in store.patient_termine("A")] == ["Dr. Neu"]
+
+
+def test_umbenennen_ist_wiederholbar():
+    termine = {"Dr. Alt": {"2031-01-06": {"08:00": termin("A")}}, "Dr. Neu": {"2031-01-06": {"09:00": termin("B")}}}
+    eintrag = {"op": "arzt_umbenennen", "alt": "Dr. Alt", "neu": "Dr. Neu"}
+    wende_termin_an(termine, eintrag)
+    wende_termin_an(termine, eintrag)
+    assert termine == {"Dr. Neu": {"2031-01-06": {"08:00": termin("A"), "09:00": termin("B")}}}
+
+
+def test_store_repariert_abgebrochene_umbenennung(speicher):
+    store = TerminStore(speicher)
+    store.buche("Dr. Alt", "2031-01-06", "08:00", termin("A"))
+    store.buche("Dr. Wieder", "2031-01-06", "08:00", termin("B"))
+    # Absturz nach dem Speichern des Zahnarzts, vor dem Umbenennen der Termine
+    zahnaerzte = [{"name": "Dr. Neu", "frueherer_name": "Dr. Alt"},
+                  {"name": "Dr. Anders", "frueherer_name": "Dr. Wieder"}, {"name": "Dr. Wieder"}]
+    assert store.repariere_umbenennungen(zahnaerzte) == [("Dr. Alt", "Dr. Neu")]
+    assert store.arzt_termine("Dr. Alt") == {}
+    assert store.tag_termine("Dr. Neu", "2031-01-06") == {"08:00": termin("A")}
+    # Den alten Namen trägt wieder ein Zahnarzt: seine Termine bleiben
+    assert store.tag_termine("Dr. Wieder", "2031-01-06") == {"08:00": termin("B")}
+    assert store.repariere_umbenennungen(zahnaerzte) == []
+
+
+@pytest.fixture
+def zahnarzt_fenster(qapp, monkeypatch):
+    """Fenster eines eigens angelegten Zahnarzts "Dr. Test Alt"; meldet Warnungen in die Liste warnungen"""
+    from PyQt5.QtWidgets import QMessageBox
+    from components.main_window import MainFenster
+    from gui import data_manager
+    from gui.daten_dienst import daten_dienst
+    warnungen = []
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: None))
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *a: warnungen.append(a[2])))
+    vorlage = dict(data_manager.zahnaerzte[0], name="Dr. Test Alt", passwort_geaendert=True)
+    assert data_manager.fuege_eintrag_hinzu("zahnaerzte", data_manager.zahnaerzte, vorlage)
+    fenster = MainFenster("Dr. Test Alt", "Zahnarzt")
+
+    def umbenennen(neuer_name):
+        fenster.show_einstellungen()
+        fenster.neuer_name.setText(neuer_name)
+        fenster.settings_manager.update_zahnarzt_name()
+        while daten_dienst()._auftraege:
+            qapp.processEvents()
+        qapp.processEvents()
+    yield umbenennen, warnungen
+    fenster.close()
+    data_manager.speicher.loesche("zahnaerzte", fenster.zahnarzt_data["name"])
+    data_manager.synchronisiere("zahnaerzte", data_manager.zahnaerzte)
+
+
+def test_umbenennen_speichert_zuerst_den_zahnarzt(zahnarzt_fenster):
+    from gui import data_manager
+    from gui.termin_store import termin_store
+    umbenennen, warnungen = zahnarzt_fenster
+    assert termin_store.buche("Dr. Test Alt", "2097-01-05", "08:00", termin("A"))
+    assert termin_store.buche("Dr. Test Belegt", "2097-01-05", "08:00", termin("B"))
+    gespeichert = lambda: {a["name"]: a for a in data_manager.lade_daten("zahnaerzte") if "Dr. Test" in a["name"]}
+
+    # Überschneidung: der schon gespeicherte Zahnarzt wird zurückgenommen
+    umbenennen("Dr. Test Belegt")
+    assert len(warnungen) == 1
+    assert list(gespeichert()) == ["Dr. Test Alt"] and "frueherer_name" not in gespeichert()["Dr. Test Alt"]
+    assert termin_store.tag_termine("Dr. Test Alt", "2097-01-05") == {"08:00": termin("A")}
+
+    umbenennen("Dr. Test Neu")
+    assert len(warnungen) == 1
+    assert gespeichert()["Dr. Test Neu"]["frueherer_name"] == "Dr. Test Alt"
+    assert termin_store.arzt_termine("Dr. Test Alt") == {}
+    assert termin_store.tag_termine("Dr. Test Neu", "2097-01-05") == {"08:00": termin("A")}
+    termin_store.storniere("Dr. Test Neu", "2097-01-05", "08:00")
+    termin_store.storniere("Dr. Test Belegt", "2097-01-05", "08:00")
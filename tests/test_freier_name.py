@@ -0,0 +1,80 @@
+import pytest
+
+from gui import data_manager
+from gui.data_manager import freier_name, fuege_eintrag_hinzu, patienten, speicher, synchronisiere
+
+
+def patient(name):
+    return {"name": name, "passwort": "x", "krankenkasse": "gesetzlich", "probleme": [], "passwort_geaendert": True}
+
+
+@pytest.fixture
+def vorhanden():
+    """Legt Patienten mit den übergebenen Namen in einem Schritt an (wie eine andere Station)"""
+    vorher = data_manager.lade_daten("patienten")
+
+    def anlegen(namen):
+        speicher.ersetze("patienten", vorher + [patient(name) for name in namen])
+        synchronisiere("patienten", patienten)
+    yield anlegen
+    speicher.ersetze("patienten", vorher)
+    synchronisiere("patienten", patienten)
+
+
+def registrieren(basis):
+    """Wie RegistrierungsFenster: bei vergebenem Namen den nächsten freien nehmen"""
+    name = freier_name("patienten", patienten, basis)
+    assert fuege_eintrag_hinzu("patienten", patienten, patient(name))
+    return name
+
+
+def test_erster_zusatz():
+    assert freier_name("patienten", patienten, "Neu Name") == "Neu Name_1"
+
+
+def test_tausende_gleiche_basisnamen(vorhanden):
+    vorhanden(["Max Muster"] + [f"Max Muster_{i}" for i in range(1, 5001)])
+    assert freier_name("patienten", patienten, "Max Muster") == "Max Muster_5001"
+    neu = [registrieren("Max Muster") for _ in range(20)]
+    assert neu == [f"Max Muster_{i}" for i in range(5001, 5021)]
+    namen = [p["name"] for p in patienten]
+    assert len(namen) == len(set(namen))
+
+
+def test_luecken_werden_nicht_aufgefuellt(vorhanden):
+    vorhanden(["Tom", "Tom_1", "Tom_5"])
+    assert freier_name("patienten", patienten, "Tom") == "Tom_6"
+
+
+def test_basis_endet_schon_auf_nummer(vorhanden):
+    vorhanden(["Anna_7", "Anna_7_1", "Anna_7_2"])
+    assert freier_name("patienten", patienten, "Anna_7") == "Anna_7_3"
+    # "Anna_7" zählt für die Basis "Anna" als Nummer 7
+    assert freier_name("patienten", patienten, "Anna") == "Anna_8"
+    assert registrieren("Anna_7") == "Anna_7_3"
+    assert freier_name("patienten", patienten, "Anna_7") == "Anna_7_4"
+
+
+def test_unterstriche_im_namen(vorhanden):
+    vorhanden(["Max_Muster", "Max_Muster_2", "Eva_x1", "Eva_", "Jo__3"])
+    assert freier_name("patienten", patienten, "Max_Muster") == "Max_Muster_3"
+    # "Muster" und "x1" sind keine Nummern
+    assert freier_name("patienten", patienten, "Max") == "Max_1"
+    assert freier_name("patienten", patienten, "Eva") == "Eva_1"
+    assert freier_name("patienten", patienten, "Eva_") == "Eva__1"
+    assert freier_name("patienten", patienten, "Jo_") == "Jo__4"
+
+
+def test_fuehrende_nullen(vorhanden):
+    vorhanden(["Lea", "Lea_007"])
+    name = freier_name("patienten", patienten, "Lea")
+    assert name == "Lea_8"
+    assert data_manager.finde_eintrag("patienten", patienten, name) is None
+
+
+def test_nummer_von_anderer_station(vorhanden):
+    vorhanden(["Ben"])
+    assert registrieren("Ben") == "Ben_1"
+    # Eine andere Station hat inzwischen Ben_2 bis Ben_40 vergeben
+    vorhanden(["Ben", "Ben_1"] + [f"Ben_{i}" for i in range(2, 41)])
+    assert freier_name("patienten", patienten, "Ben") == "Ben_41"
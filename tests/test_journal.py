@@ -0,0 +1,100 @@
+import json
+
+from gui.journal import KOMPAKTIERUNG_AB
+from gui.speicher_json import JsonSpeicher
+
+
+def patient(name, nummer):
+    return {"name": name, "passwort": "x", "krankenkasse": "gesetzlich", "probleme": [], "nummer": nummer}
+
+
+def journal_zeilen(speicher):
+    with open(speicher.journal("patienten").pfad, encoding="utf-8") as f:
+        return sum(1 for zeile in f if zeile.strip())
+
+
+def test_kompaktierung_zaehlt_eintraege_aller_stationen(tmp_path):
+    erste, zweite = JsonSpeicher(str(tmp_path)), JsonSpeicher(str(tmp_path))
+    for i in range(KOMPAKTIERUNG_AB - 1):
+        (erste if i % 2 else zweite).setze("patienten", patient(f"P{i % 5}", i))
+    assert journal_zeilen(erste) == KOMPAKTIERUNG_AB - 1
+    # Keine Station hat allein KOMPAKTIERUNG_AB Einträge geschrieben, zusammen schon
+    erste.setze("patienten", patient("P0", KOMPAKTIERUNG_AB))
+    assert journal_zeilen(erste) == 0
+    daten = {p["name"]: p["nummer"] for p in zweite.lade("patienten")}
+    assert daten == {"P0": KOMPAKTIERUNG_AB, "P1": 196, "P2": 197, "P3": 198, "P4": 194}
+
+
+def test_journal_waechst_nicht_ueber_die_grenze(tmp_path):
+    stationen = [JsonSpeicher(str(tmp_path)) for _ in range(4)]
+    for i in range(3 * KOMPAKTIERUNG_AB):
+        stationen[i % 4].setze("patienten", patient("P", i))
+        assert journal_zeilen(stationen[0]) < KOMPAKTIERUNG_AB
+    assert stationen[2].lade("patienten") == [patient("P", 3 * KOMPAKTIERUNG_AB - 1)]
+
+
+class Mitgelesen:
+    """Lesende Datei, die sich merkt, wie viele Bytes gelesen wurden"""
+
+    def __init__(self, datei, gelesen):
+        self.datei = datei
+        self.gelesen = gelesen
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.datei.close()
+
+    def seek(self, *args):
+        return self.datei.seek(*args)
+
+    def tell(self):
+        return self.datei.tell()
+
+    def read(self, n=-1):
+        daten = self.datei.read(n)
+        self.gelesen.append(len(daten))
+        return daten
+
+    def __iter__(self):
+        for zeile in self.datei:
+            self.gelesen.append(len(zeile))
+            yield zeile
+
+
+def test_zaehlen_liest_nur_zeilen_anderer_stationen(tmp_path, monkeypatch):
+    from gui import journal as journal_modul
+    erste, zweite = JsonSpeicher(str(tmp_path)), JsonSpeicher(str(tmp_path))
+    for i in range(100):
+        erste.setze("patienten", patient("P", i))
+    gelesen = []
+
+    def oeffnen(pfad, modus="r", *args, **kwargs):
+        datei = open(pfad, modus, *args, **kwargs)
+        return Mitgelesen(datei, gelesen) if modus == "rb" else datei
+    monkeypatch.setattr(journal_modul, "open", oeffnen, raising=False)
+
+    # Eigene Einträge: nichts nachzulesen
+    erste.setze("patienten", patient("P", 100))
+    assert gelesen == [] and erste.journal("patienten").anzahl == 101
+    # Eine andere Station hängt zwei Zeilen an: gelesen werden nur diese und die eigene dahinter
+    zweite.setze("patienten", patient("Q", 1))
+    zweite.setze("patienten", patient("Q", 2))
+    gelesen.clear()
+    erste.setze("patienten", patient("P", 101))
+    zeile = len(json.dumps({"op": "setzen", "name": "P", "eintrag": patient("P", 101)}).encode()) + 1
+    assert sum(gelesen) <= 3 * zeile
+    assert erste.journal("patienten").anzahl == journal_zeilen(erste) == 104
+
+
+def test_zaehlen_nach_kompaktierung_anderswo(tmp_path):
+    erste, zweite = JsonSpeicher(str(tmp_path)), JsonSpeicher(str(tmp_path))
+    for i in range(KOMPAKTIERUNG_AB // 2):
+        erste.setze("patienten", patient("P", i))
+    # Die zweite Station kompaktiert und schreibt danach mehr, als das Journal vorher lang war
+    zweite.ersetze("patienten", zweite.lade("patienten"))
+    for i in range(KOMPAKTIERUNG_AB // 2 + 10):
+        zweite.setze("patienten", patient("Langer Name " * 3, i))
+    erste.setze("patienten", patient("P", -1))
+    assert erste.journal("patienten").anzahl == journal_zeilen(erste) == KOMPAKTIERUNG_AB // 2 + 11
@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import QDate
+from PyQt5.QtWidgets import QWidget
+
+from components.verfuegbarkeit import WOCHENTAGE_KURZ
+from gui import data_manager
+from gui.daten_dienst import daten_dienst
+from gui.daten_waechter import daten_waechter
+from gui.speicher_langsam import LangsamerSpeicher
+from gui.termin_store import termin_store
+
+VERZOEGERUNG = 0.2
+
+
+def warten(qapp, bis=lambda: not daten_dienst()._auftraege):
+    ende = time.time() + 10
+    while not bis() and time.time() < ende:
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+
+
+@pytest.fixture
+def langsam(qapp, monkeypatch):
+    """Jeder Zugriff auf die Datenhaltung dauert VERZOEGERUNG Sekunden (wie PRAXIS_LANGSAM_MS)"""
+    speicher = LangsamerSpeicher(data_manager.speicher, VERZOEGERUNG)
+    monkeypatch.setattr(data_manager, "speicher", speicher)
+    monkeypatch.setattr(termin_store, "speicher", speicher)
+    monkeypatch.setattr(daten_waechter(), "speicher", speicher)
+    yield speicher
+    warten(qapp)
+
+
+def test_starte_blockiert_nicht(qapp, langsam):
+    ergebnisse = []
+    beginn = time.perf_counter()
+    daten_dienst().starte(lambda: langsam.lade("patienten"), ergebnisse.append)
+    assert time.perf_counter() - beginn < VERZOEGERUNG / 2
+    assert ergebnisse == []
+    warten(qapp)
+    assert [p["name"] for p in ergebnisse[0]] == [p["name"] for p in data_manager.patienten]
+
+
+def test_platzhalter_bis_zur_rueckmeldung(qapp, langsam):
+    from components.main_window import MainFenster
+    fenster = MainFenster("Frau Meyer", "Patient")
+    fenster.show_termin_buchen()
+    fenster.show_arzt_selection()
+    fenster.booking_manager.select_arzt_card(0)
+    fenster.show_kalender()
+    warten(qapp)
+    arzt = fenster.selected_zahnarzt
+    datum = QDate.currentDate().addDays(1)
+    while WOCHENTAGE_KURZ[datum.dayOfWeek() - 1] not in arzt["zeiten"]:
+        datum = datum.addDays(1)
+    # Fremde Änderung, damit der Abgleich wirklich (langsam) laden muss
+    langsam.aendere_termine({"op": "stornieren", "arzt": arzt["name"], "datum": "2099-01-01", "zeit": "08:00"})
+
+    beginn = time.perf_counter()
+    fenster.booking_manager.show_time_slots(datum)
+    assert time.perf_counter() - beginn < VERZOEGERUNG / 2
+    time_box = fenster.time_box
+    assert [time_box.itemText(i) for i in range(time_box.count())] == ["Lädt …"]
+    assert not time_box.isEnabled()
+    # Signatur und Änderungen lesen dauert mindestens 2 * VERZOEGERUNG; so lange bleibt der Platzhalter
+    warten(qapp, bis=lambda: time.perf_counter() - beginn > VERZOEGERUNG)
+    assert daten_dienst()._auftraege
+    assert time_box.itemText(0) == "Lädt …" and not time_box.isEnabled()
+    warten(qapp)
+    assert time_box.isEnabled()
+    assert "Lädt …" not in [time_box.itemText(i) for i in range(time_box.count())]
+    fenster.close()
+
+
+def test_besitzer_geloescht_vor_dem_start(qapp, langsam):
+    gelaufen = []
+    besitzer = QWidget()
+    # Ein langsamer Auftrag davor hält den Worker beschäftigt
+    daten_dienst().starte(lambda: langsam.signatur("patienten"))
+    daten_dienst().starte(lambda: gelaufen.append("arbeit"), lambda _: gelaufen.append("fertig"),
+                          uebernehmen=lambda _: gelaufen.append("uebernehmen"), besitzer=besitzer)
+    sip.delete(besitzer)
+    warten(qapp)
+    assert gelaufen == []
+
+
+def test_besitzer_geloescht_waehrend_der_arbeit(qapp, langsam):
+    name = "Test Langsam"
+    assert data_manager.fuege_eintrag_hinzu("patienten", data_manager.patienten,
+                                            {"name": name, "passwort": "x", "krankenkasse": "gesetzlich",
+                                             "probleme": [], "passwort_geaendert": True})
+    gelaufen = []
+    gestartet = threading.Event()
+    besitzer = QWidget()
+
+    def arbeit():
+        gestartet.set()
+        return data_manager.schreibe_eintrag("patienten", name, lambda p: p.update(krankenkasse="privat"))
+
+    daten_dienst().starte(arbeit, lambda _: gelaufen.append("fertig"),
+                          uebernehmen=lambda _: gelaufen.append("uebernehmen"), besitzer=besitzer)
+    assert gestartet.wait(5)
+    sip.delete(besitzer)
+    warten(qapp)
+    assert gelaufen == []
+    # Gespeichert ist die Änderung trotzdem; der nächste Abgleich holt sie
+    data_manager.synchronisiere("patienten", data_manager.patienten)
+    eintrag = data_manager.finde_eintrag("patienten", data_manager.patienten, name)
+    assert eintrag["krankenkasse"] == "privat"
+    langsam.loesche("patienten", name)
+    data_manager.synchronisiere("patienten", data_manager.patienten)
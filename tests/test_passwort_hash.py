@@ -0,0 +1,118 @@
+import pytest
+from PyQt5.QtWidgets import QMessageBox
+
+from gui import data_manager, passwort_hash
+from gui.passwort_hash import braucht_neuen_hash, hash_passwort, ist_gehasht, pruefe_passwort
+
+
+@pytest.fixture(autouse=True)
+def wenige_iterationen(monkeypatch):
+    # Schnelle Tests; der Arbeitsfaktor selbst wird in benchmarks/login.py gemessen
+    monkeypatch.setattr(passwort_hash, "ITERATIONEN", 1000)
+
+
+def test_hash_rundreise():
+    gespeichert = hash_passwort("geheim")
+    verfahren, iterationen, salz, wert = gespeichert.split("$")
+    assert (verfahren, iterationen) == ("pbkdf2_sha256", "1000")
+    assert len(bytes.fromhex(salz)) == 16
+    assert pruefe_passwort("geheim", gespeichert)
+    assert not pruefe_passwort("Geheim", gespeichert)
+    assert not pruefe_passwort("", gespeichert)
+
+
+def test_gleiches_passwort_anderes_salz():
+    assert hash_passwort("geheim") != hash_passwort("geheim")
+
+
+def test_klartext_wird_noch_akzeptiert():
+    assert not ist_gehasht("P111")
+    assert pruefe_passwort("P111", "P111")
+    assert not pruefe_passwort("P112", "P111")
+    assert braucht_neuen_hash("P111")
+
+
+def test_neuer_hash_bei_anderem_arbeitsfaktor(monkeypatch):
+    gespeichert = hash_passwort("geheim")
+    assert not braucht_neuen_hash(gespeichert)
+    monkeypatch.setattr(passwort_hash, "ITERATIONEN", 2000)
+    assert braucht_neuen_hash(gespeichert)
+    # Alte Hashes bleiben gültig, bis sie erneuert sind
+    assert pruefe_passwort("geheim", gespeichert)
+
+
+@pytest.fixture
+def login(qapp, monkeypatch):
+    """pruefe_login ohne Fenster: meldet 'ok' oder die Warnung"""
+    import components.main_window
+    from gui.login import LoginFenster
+    ergebnisse = []
+    monkeypatch.setattr(components.main_window, "MainFenster",
+                        lambda name, rolle: type("Fenster", (), {"show": lambda self: ergebnisse.append("ok")})())
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *a: ergebnisse.append(a[2])))
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: None))
+
+    def anmelden(name, passwort):
+        # Ein erfolgreicher Login schließt das Fenster, deshalb jedes Mal neu
+        fenster = LoginFenster()
+        ergebnisse.clear()
+        fenster.benutzername.setText(name)
+        fenster.passwort.setText(passwort)
+        fenster.pruefe_login()
+        return ergebnisse[0]
+    return anmelden
+
+
+def gespeichertes_passwort(name):
+    return next(p for p in data_manager.lade_daten("patienten") if p["name"] == name)["passwort"]
+
+
+def neues_konto(name, passwort):
+    assert data_manager.fuege_eintrag_hinzu("patienten", data_manager.patienten, {
+        "name": name, "passwort": passwort, "krankenkasse": "gesetzlich", "probleme": [],
+        "passwort_geaendert": True})
+
+
+def test_login_erneuert_klartext(login):
+    neues_konto("Test Klartext", "P999")
+    assert login("Test Klartext", "falsch") != "ok"
+    assert gespeichertes_passwort("Test Klartext") == "P999"
+    assert login("Test Klartext", "P999") == "ok"
+    gespeichert = gespeichertes_passwort("Test Klartext")
+    assert ist_gehasht(gespeichert) and pruefe_passwort("P999", gespeichert)
+    # Danach weiter mit dem Hash anmelden
+    assert login("Test Klartext", "P999") == "ok"
+
+
+def test_login_erneuert_hash_bei_neuem_arbeitsfaktor(login, monkeypatch):
+    neues_konto("Test Faktor", hash_passwort("geheim"))
+    monkeypatch.setattr(passwort_hash, "ITERATIONEN", 2000)
+    assert login("Test Faktor", "geheim") == "ok"
+    gespeichert = gespeichertes_passwort("Test Faktor")
+    assert gespeichert.split("$")[1] == "2000" and pruefe_passwort("geheim", gespeichert)
+
+
+def test_passwort_aendern_hasht_ausserhalb_der_sperre(qapp, monkeypatch):
+    import components.settings_manager
+    from components.main_window import MainFenster
+    from gui.daten_dienst import daten_dienst
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: None))
+    neues_konto("Test Sperre", hash_passwort("alt"))
+    gesperrt = []
+
+    def hash_merken(passwort):
+        # Andere Stationen sollen während PBKDF2 weiter schreiben können
+        gesperrt.append(data_manager.speicher.sperre("patienten")._tiefe > 0)
+        return hash_passwort(passwort)
+    monkeypatch.setattr(components.settings_manager, "hash_passwort", hash_merken)
+
+    fenster = MainFenster("Test Sperre", "Patient")
+    fenster.show_einstellungen()
+    fenster.neues_passwort.setText("neu")
+    fenster.settings_manager.update_passwort()
+    while daten_dienst()._auftraege:
+        qapp.processEvents()
+    qapp.processEvents()
+    fenster.close()
+    assert gesperrt == [False]
+    assert pruefe_passwort("neu", gespeichertes_passwort("Test Sperre"))
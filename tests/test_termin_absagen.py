@@ -0,0 +1,59 @@
+import time
+
+import pytest
+from PyQt5.QtWidgets import QMessageBox
+
+from gui.daten_dienst import daten_dienst
+from gui.data_manager import speicher
+from gui.termin_store import termin_store
+
+TERMIN = {"patient": "Frau Meyer", "behandlung": "Krone", "material": "normal", "dauer": 30, "anzahl": 1}
+
+
+def warten(qapp):
+    ende = time.time() + 10
+    while daten_dienst()._auftraege and time.time() < ende:
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+
+
+@pytest.fixture
+def meldungen(monkeypatch):
+    gesehen = []
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: gesehen.append(a[1])))
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *a: gesehen.append(a[1])))
+    # Rückfrage "Wirklich absagen?" mit Ja beantworten
+    monkeypatch.setattr(QMessageBox, "exec_", lambda self: 0)
+    monkeypatch.setattr(QMessageBox, "clickedButton", lambda self: self.buttons()[0])
+    return gesehen
+
+
+@pytest.fixture
+def fenster(qapp, meldungen):
+    from components.main_window import MainFenster
+    fenster = MainFenster("Frau Meyer", "Patient")
+    warten(qapp)
+    fenster.show_meine_termine()
+    yield fenster
+    fenster.close()
+
+
+def test_absagen(qapp, fenster, meldungen):
+    assert termin_store.buche("Dr. Kraft", "2098-03-02", "09:00", dict(TERMIN))
+    fenster.cancel_termin("Dr. Kraft", "2098-03-02", "09:00")
+    warten(qapp)
+    assert meldungen == ["Termin abgesagt"]
+    assert "09:00" not in termin_store.tag_termine("Dr. Kraft", "2098-03-02")
+
+
+def test_schon_an_anderer_station_abgesagt(qapp, fenster, meldungen):
+    assert termin_store.buche("Dr. Kraft", "2098-03-03", "09:00", dict(TERMIN))
+    probleme = [dict(p) for p in fenster.patient_data["probleme"]]
+    # Eine andere Station sagt direkt in der Datenhaltung ab
+    speicher.aendere_termine({"op": "stornieren", "arzt": "Dr. Kraft", "datum": "2098-03-03", "zeit": "09:00"})
+    fenster.cancel_termin("Dr. Kraft", "2098-03-03", "09:00")
+    warten(qapp)
+    assert meldungen == ["Termin nicht gefunden"]
+    # Die Behandlung wird nicht ein zweites Mal gutgeschrieben
+    assert fenster.patient_data["probleme"] == probleme
@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+from tests.conftest import PROJEKT
+
+ARZT = "Dr. Stress"
+DATUM = "2031-03-03"
+ZEITFENSTER = ["08:00-16:00"]
+PROZESSE = 8
+
+# Eine Station: bucht alle Slots des Tages in eigener Reihenfolge, Prüfung wie in select_time
+STATION = """
+import json, os, random, sys, time
+from components.verfuegbarkeit import freie_startzeiten
+from gui.termin_store import termin_store
+nummer, dauer, start = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+zeiten = freie_startzeiten(%(fenster)r, {}, dauer)
+random.Random(nummer).shuffle(zeiten)
+while not os.path.exists(start):
+    time.sleep(0.001)
+ergebnis = {}
+for zeit in zeiten:
+    termin = {"patient": f"P{nummer}", "behandlung": "Krone", "dauer": dauer}
+    ergebnis[zeit] = termin_store.buche(
+        %(arzt)r, %(datum)r, zeit, termin,
+        lambda tag, zeit=zeit: zeit in freie_startzeiten(%(fenster)r, tag, dauer))
+print(json.dumps(ergebnis))
+""" % {"arzt": ARZT, "datum": DATUM, "fenster": ZEITFENSTER}
+
+
+def stationen(ordner, dauer):
+    """Startet PROZESSE Stationen auf ordner gleichzeitig; Ergebnisse je Station {zeit: gebucht}"""
+    start = os.path.join(ordner, "start")
+    umgebung = dict(os.environ, PRAXIS_DATEN=str(ordner), PRAXIS_SPEICHER="json", PYTHONPATH=PROJEKT)
+    prozesse = [subprocess.Popen([sys.executable, "-c", STATION, str(i), str(dauer), start],
+                                 cwd=PROJEKT, env=umgebung, stdout=subprocess.PIPE, text=True)
+                for i in range(PROZESSE)]
+    # Erst loslegen, wenn alle Prozesse geladen sind (ungefähr)
+    time.sleep(1.0)
+    open(start, "w").close()
+    ergebnisse = []
+    for prozess in prozesse:
+        ausgabe, _ = prozess.communicate(timeout=120)
+        assert prozess.returncode == 0
+        ergebnisse.append(json.loads(ausgabe))
+    return ergebnisse
+
+
+def leerer_ordner(tmp_path):
+    for datei, inhalt in (("patienten.json", []), ("zahnaerzte.json", []), ("termine.json", {}),
+                          ("kosten_behandlungen.json", []), ("zahnaerzte_bilder.json", {})):
+        (tmp_path / datei).write_text(json.dumps(inhalt), encoding="utf-8")
+    return tmp_path
+
+
+def minuten(zeit):
+    return int(zeit[:2]) * 60 + int(zeit[3:])
+
+
+def pruefe_ergebnis(ordner, ergebnisse):
+    from gui.speicher_json import JsonSpeicher
+    tag = JsonSpeicher(str(ordner)).lade("termine").get(ARZT, {}).get(DATUM, {})
+
+    # Jede gemeldete Buchung steht mit dem richtigen Patienten in den Daten, keine mehr
+    gebucht = {(zeit, f"P{i}") for i, ergebnis in enumerate(ergebnisse) for zeit, ok in ergebnis.items() if ok}
+    assert gebucht == {(zeit, termin["patient"]) for zeit, termin in tag.items()}
+
+    # Keine Überschneidungen
+    belegt = sorted((minuten(zeit), minuten(zeit) + termin["dauer"]) for zeit, termin in tag.items())
+    for (_, ende), (start, _) in zip(belegt, belegt[1:]):
+        assert ende <= start
+
+    # Abgelehnt ("vergeben") wurde nur, wo sich der Slot mit einer Buchung überschneidet
+    dauer = next(iter(tag.values()))["dauer"]
+    for ergebnis in ergebnisse:
+        for zeit, ok in ergebnis.items():
+            if not ok:
+                start = minuten(zeit)
+                assert any(minuten(z) < start + dauer and start < minuten(z) + termin["dauer"] for z, termin in tag.items())
+
+    # Keine verlorenen Journalzeilen (bei so wenigen Buchungen wird nicht kompaktiert)
+    with open(os.path.join(ordner, "termine.json.journal"), encoding="utf-8") as f:
+        zeilen = [json.loads(zeile) for zeile in f if zeile.strip()]
+    assert len(zeilen) == len(tag)
+    return tag
+
+
+def test_gleichzeitige_buchungen_derselben_slots(tmp_path):
+    ordner = leerer_ordner(tmp_path)
+    ergebnisse = stationen(ordner, 30)
+    tag = pruefe_ergebnis(ordner, ergebnisse)
+    # Jeder Slot genau einmal vergeben, alle anderen Stationen haben verloren
+    assert len(tag) == 16
+    for zeit in tag:
+        assert sum(ergebnis[zeit] for ergebnis in ergebnisse) == 1
+
+
+def test_gleichzeitige_ueberlappende_buchungen(tmp_path):
+    # 60 Minuten im 30-Minuten-Raster: benachbarte Startzeiten schließen sich gegenseitig aus
+    ordner = leerer_ordner(tmp_path)
+    ergebnisse = stationen(ordner, 60)
+    tag = pruefe_ergebnis(ordner, ergebnisse)
+    assert tag
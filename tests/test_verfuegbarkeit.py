@@ -0,0 +1,59 @@
+from components.verfuegbarkeit import freie_startzeiten
+
+
+def termin(dauer):
+    return {"patient": "Test", "behandlung": "Krone", "dauer": dauer}
+
+
+def test_ohne_termine_raster_ab_fensterbeginn():
+    assert freie_startzeiten(["08:00-10:00"], {}, 30) == ["08:00", "08:30", "09:00", "09:30"]
+
+
+def test_termin_ausserhalb_des_rasters_blockiert_minutengenau():
+    # 08:45-09:15 belegt: 08:30 und 09:00 überschneiden sich, 08:00 und 09:30 nicht
+    frei = freie_startzeiten(["08:00-11:00"], {"08:45": termin(30)}, 30)
+    assert frei == ["08:00", "09:30", "10:00", "10:30"]
+
+
+def test_kurzer_termin_zwischen_rasterpunkten():
+    # 09:10-09:20 blockiert nur den Slot 09:00
+    frei = freie_startzeiten(["09:00-10:00"], {"09:10": termin(10)}, 30)
+    assert frei == ["09:30"]
+
+
+def test_termine_an_den_fenstergrenzen():
+    tag = {"07:30": termin(30), "09:30": termin(30), "10:00": termin(60)}
+    # Endet genau zu Fensterbeginn bzw. beginnt genau am Fensterende: kein Einfluss
+    assert freie_startzeiten(["08:00-10:00"], tag, 30) == ["08:00", "08:30", "09:00"]
+    assert freie_startzeiten(["08:00-10:00"], {"07:30": termin(30)}, 120) == ["08:00"]
+
+
+def test_termin_ueber_den_fensterbeginn():
+    assert freie_startzeiten(["08:00-10:00"], {"07:45": termin(30)}, 30) == ["08:30", "09:00", "09:30"]
+
+
+def test_dauer_laenger_als_fenster():
+    assert freie_startzeiten(["08:00-09:00"], {}, 90) == []
+    assert freie_startzeiten(["08:00-09:00", "10:00-12:00"], {}, 90) == ["10:00", "10:30"]
+
+
+def test_dauer_gleich_fenster():
+    assert freie_startzeiten(["08:00-09:00"], {}, 60) == ["08:00"]
+
+
+def test_mehrere_fenster_je_tag():
+    fenster = ["08:00-10:00", "14:00-16:00"]
+    assert freie_startzeiten(fenster, {}, 60) == ["08:00", "08:30", "09:00", "14:00", "14:30", "15:00"]
+    # Ein Termin darf nicht über die Mittagspause reichen
+    assert "09:30" not in freie_startzeiten(fenster, {}, 60)
+    assert freie_startzeiten(fenster, {"14:30": termin(30)}, 30) == [
+        "08:00", "08:30", "09:00", "09:30", "14:00", "15:00", "15:30"]
+
+
+def test_fenster_ausserhalb_des_rasters():
+    # Startzeiten laufen im Raster ab Beginn des Fensters
+    assert freie_startzeiten(["08:15-09:30"], {}, 30) == ["08:15", "08:45"]
+
+
+def test_voll_belegt():
+    assert freie_startzeiten(["08:00-09:00"], {"08:00": termin(60)}, 30) == []
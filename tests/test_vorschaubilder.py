@@ -0,0 +1,70 @@
+import os
+import time
+
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtGui import QColor, QImage
+
+from components.vorschaubilder import VorschauCache
+
+
+def warten(qapp, cache, quelle):
+    ende = time.time() + 10
+    while quelle in cache._laufend and time.time() < ende:
+        QThreadPool.globalInstance().waitForDone(10)
+        qapp.processEvents()
+    assert quelle not in cache._laufend
+
+
+def gueltiges_bild(pfad):
+    bild = QImage(80, 60, QImage.Format_RGB32)
+    bild.fill(QColor("red"))
+    assert bild.save(str(pfad), "PNG")
+
+
+def test_bild_wird_geladen_und_gehalten(qapp, tmp_path):
+    quelle = str(tmp_path / "arzt.png")
+    gueltiges_bild(quelle)
+    cache = VorschauCache(32, ordner=str(tmp_path / "cache"))
+    assert cache.pixmap(quelle) is None
+    warten(qapp, cache, quelle)
+    pixmap = cache.pixmap(quelle)
+    assert pixmap is not None and (pixmap.width(), pixmap.height()) == (32, 32)
+    assert not cache.fehlgeschlagen(quelle)
+
+
+def test_fehler_wird_je_dateistand_gemerkt(qapp, tmp_path):
+    quelle = tmp_path / "kaputt.png"
+    quelle.write_bytes(b"kein Bild")
+    cache = VorschauCache(32, ordner=str(tmp_path / "cache"))
+    gemeldet = []
+    cache.fertig.connect(lambda q, pixmap: gemeldet.append(pixmap.isNull()))
+
+    assert cache.pixmap(str(quelle)) is None
+    warten(qapp, cache, str(quelle))
+    assert cache.fehlgeschlagen(str(quelle))
+    # Die Karte wird einmal benachrichtigt (zeigt dann den Anfangsbuchstaben)
+    assert gemeldet == [True]
+
+    # Weitere Zeichenvorgänge starten keinen neuen Ladeversuch
+    for _ in range(5):
+        assert cache.pixmap(str(quelle)) is None
+    assert str(quelle) not in cache._laufend
+    assert cache.fehlgeschlagen(str(quelle))
+
+    # Erst eine geänderte Datei wird neu geladen
+    gueltiges_bild(quelle)
+    st = os.stat(quelle)
+    os.utime(quelle, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.pixmap(str(quelle)) is None
+    assert not cache.fehlgeschlagen(str(quelle))
+    warten(qapp, cache, str(quelle))
+    assert cache.pixmap(str(quelle)) is not None
+
+
+def test_fehlende_datei(qapp, tmp_path):
+    quelle = str(tmp_path / "fehlt.png")
+    cache = VorschauCache(32, ordner=str(tmp_path / "cache"))
+    cache.pixmap(quelle)
+    warten(qapp, cache, quelle)
+    assert cache.fehlgeschlagen(quelle)
+    assert cache.pixmap(quelle) is None and quelle not in cache._laufend
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+from PyQt5.QtCore import QDate, QLocale
+from PyQt5.QtWidgets import QMessageBox
+
+from gui.daten_dienst import daten_dienst
+
+
+def warten(qapp):
+    ende = time.time() + 10
+    while daten_dienst()._auftraege and time.time() < ende:
+        qapp.processEvents()
+        time.sleep(0.005)
+    qapp.processEvents()
+
+
+@pytest.fixture
+def fenster(qapp, monkeypatch):
+    from components.main_window import MainFenster
+    monkeypatch.setattr(QMessageBox, "information", staticmethod(lambda *a: None))
+    monkeypatch.setattr(QMessageBox, "warning", staticmethod(lambda *a: None))
+    fenster = MainFenster("Frau Meyer", "Patient")
+    warten(qapp)
+    fenster.show_termin_buchen()
+    fenster.show_arzt_selection()
+    warten(qapp)
+    fenster.booking_manager.select_arzt_card(0)
+    fenster.show_kalender()
+    warten(qapp)
+    yield fenster
+    fenster.close()
+
+
+@pytest.mark.parametrize("sprache", [QLocale.c(), QLocale(QLocale.English), QLocale(QLocale.German)])
+def test_zeitslots_unabhaengig_von_der_sprache(qapp, fenster, sprache):
+    vorher = QLocale()
+    QLocale.setDefault(sprache)
+    try:
+        datum = QDate.currentDate().addDays(1)
+        kurz = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+        while kurz[datum.dayOfWeek() - 1] not in fenster.selected_zahnarzt["zeiten"]:
+            datum = datum.addDays(1)
+        fenster.show_time_slots(datum)
+        warten(qapp)
+        slots = [fenster.time_box.itemText(i) for i in range(fenster.time_box.count())]
+        assert slots and all(len(slot) == 5 and slot[2] == ":" for slot in slots)
+        assert fenster.confirm_btn.isEnabled()
+    finally:
+        QLocale.setDefault(vorher)